@@ -18,8 +18,9 @@
 # Metadata is inherited from Nautobot. If not including Nautobot
 # in the environment, this should be added
 from importlib import metadata
+from typing import Any
 
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
 from nautobot.apps import NautobotAppConfig
 
 dist = metadata.distribution(__name__)
@@ -41,14 +42,41 @@ class NautobotConsumablesConfig(NautobotAppConfig):
     min_version: str = "2.0.0"
     max_version: str = "2.9999"
     caching_config: dict[str, str | dict[str, str]] = {}
+    default_settings: dict[str, Any] = {
+        "schema_engine": "jsonschema",
+        "sync_lag_seconds": 60,
+        "tab_badge_counts": True,
+        "tab_count_cache_timeout": 3600,
+        "tombstone_retention_days": 30,
+    }
 
     def ready(self) -> None:
         """Register custom signals at startup."""
         # pylint:disable=import-outside-toplevel
-        from nautobot_consumables import signals
+        from nautobot_consumables import models, signals
 
         post_migrate.connect(signals.post_migrate_create_defaults, sender=self)
 
+        checked_out = models.CheckedOutConsumable
+        post_save.connect(signals.checked_out_consumable_post_save, sender=checked_out)
+        post_delete.connect(signals.checked_out_consumable_post_delete, sender=checked_out)
+
+        consumable_type = models.ConsumableType
+        post_save.connect(signals.consumable_type_post_save, sender=consumable_type)
+        post_delete.connect(signals.consumable_type_post_delete, sender=consumable_type)
+
+        pool = models.ConsumablePool
+        post_save.connect(signals.consumable_pool_post_save, sender=pool)
+        post_delete.connect(signals.consumable_pool_post_delete, sender=pool)
+
+        # The Location summaries roll up the pools of the descendants, so follow re-parenting
+        location = models.Location
+        pre_save.connect(signals.location_pre_save, sender=location)
+        post_save.connect(signals.location_post_save, sender=location)
+
+        for model in (checked_out, models.Consumable, pool, consumable_type):
+            post_delete.connect(signals.record_tombstone, sender=model)
+
         super().ready()
 
 
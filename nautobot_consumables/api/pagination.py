@@ -0,0 +1,166 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Keyset pagination for the Nautobot Consumables API."""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import json
+from typing import Any
+
+from django.db import models
+from django.db.models import Q
+from nautobot.core.api.filter_backends import NautobotFilterBackend
+from nautobot.core.api.pagination import OptionalLimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.serializers import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_fields(model: type[models.Model]) -> list[str]:
+    """
+    Get the columns a model is paginated on, from its default ordering.
+
+    Foreign keys are ordered by their ID columns, which an index can cover, rather than by the
+    ordering of the related model. The primary key breaks ties, unless the ordering is unique.
+    """
+    fields = [model._meta.get_field(name).attname for name in model._meta.ordering]
+    unique_together = [set(fields) for fields in model._meta.unique_together]
+    if set(model._meta.ordering) not in unique_together:
+        fields.append("id")
+
+    return fields
+
+
+def _after(fields: list[str], values: list[Any]) -> Q:
+    """
+    Build the filter for the rows after a position, i.e. `(fields) > (values)`.
+
+    The first column is also bounded on its own, so the database reads from that point in the
+    index instead of checking the whole disjunction on every row.
+    """
+    after = Q(**{f"{fields[-1]}__gt": values[-1]})
+    for field, value in zip(reversed(fields[:-1]), reversed(values[:-1]), strict=True):
+        after = Q(**{f"{field}__gt": value}) | (Q(**{field: value}) & after)
+
+    return Q(**{f"{fields[0]}__gte": values[0]}) & after
+
+
+class KeysetPagination(OptionalLimitOffsetPagination):
+    """
+    Paginate by limit and offset, or by cursor when the `cursor` parameter is given.
+
+    Each cursor page is read from where the previous one stopped, using an index on the model's
+    ordering, so the pages take the same time at any depth and rows aren't skipped or repeated
+    while other requests write to the table. The first page is requested with an empty `cursor`.
+    """
+
+    cursor_query_param = "cursor"
+
+    def __init__(self):
+        """Start out in limit/offset mode."""
+        super().__init__()
+        self.cursor_mode = False
+        self.next_cursor = None
+        self.request = None
+        self.limit = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Get a page of the queryset, by cursor if one was requested."""
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_mode = True
+        self.request = request
+        self.limit = self.get_limit(request)
+        fields = keyset_fields(queryset.model)
+
+        queryset = queryset.order_by(*fields)
+        if cursor := request.query_params[self.cursor_query_param]:
+            queryset = queryset.filter(_after(fields, self.decode_cursor(cursor, fields)))
+
+        page = list(queryset[: self.limit + 1]) if self.limit else list(queryset)
+        if self.limit and len(page) > self.limit:
+            page = page[: self.limit]
+            self.next_cursor = self.encode_cursor([getattr(page[-1], field) for field in fields])
+
+        return page
+
+    @staticmethod
+    def encode_cursor(values: list[Any]) -> str:
+        """Encode the position of the last row of a page as an opaque cursor."""
+        return urlsafe_b64encode(json.dumps([str(value) for value in values]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str, fields: list[str]) -> list[str]:
+        """Decode a cursor from a previous page."""
+        try:
+            values = json.loads(urlsafe_b64decode(cursor))
+        except ValueError as error:
+            raise ValidationError({"cursor": "Invalid cursor."}) from error
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+        return values
+
+    def get_paginated_response(self, data):
+        """Return a page, without the `count` in cursor mode as it would need a full scan."""
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {"next": self.get_next_link(), "previous": None, "results": data},
+        )
+
+    def get_next_link(self):
+        """Get the link to the next page."""
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if self.next_cursor is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        """Get the link to the previous page, which cursor pages don't have."""
+        if self.cursor_mode:
+            return None
+
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        """Add the `cursor` parameter to the API schema."""
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Paginate by cursor, starting with an empty value.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class KeysetFilterBackend(NautobotFilterBackend):
+    """Filter backend that doesn't treat the `cursor` pagination parameter as a filter."""
+
+    def get_filterset_kwargs(self, request, queryset, view):
+        """Remove the `cursor` parameter from the filter data."""
+        kwargs = super().get_filterset_kwargs(request, queryset, view)
+        kwargs["data"].pop(KeysetPagination.cursor_query_param, None)
+
+        return kwargs
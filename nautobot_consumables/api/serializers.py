@@ -17,7 +17,16 @@
 """Serializers for Nautobot Consumables API endpoints."""
 
 from nautobot.apps.api import NautobotModelSerializer, TaggedModelSerializerMixin
-from rest_framework.serializers import HyperlinkedIdentityField
+from rest_framework.serializers import (
+    CharField,
+    DateTimeField,
+    FloatField,
+    HyperlinkedIdentityField,
+    IntegerField,
+    Serializer,
+    UUIDField,
+    ValidationError,
+)
 
 from nautobot_consumables import models
 
@@ -36,6 +45,14 @@ class CheckedOutConsumableSerializer(NautobotModelSerializer, TaggedModelSeriali
         fields = "__all__"
 
 
+class CheckedOutConsumableAllocationSerializer(Serializer):  # pylint: disable=abstract-method
+    """API serializer for a single row of a bulk CheckedOutConsumable allocation."""
+
+    consumable_pool = UUIDField()
+    device = UUIDField()
+    quantity = IntegerField(min_value=1)
+
+
 class ConsumableSerializer(NautobotModelSerializer, TaggedModelSerializerMixin):
     """API serializer for the Consumable model."""
 
@@ -57,6 +74,8 @@ class ConsumablePoolSerializer(NautobotModelSerializer, TaggedModelSerializerMix
         view_name="plugins-api:nautobot_consumables-api:consumablepool-detail",
     )
 
+    available_quantity = IntegerField(read_only=True)
+
     class Meta:
         """ConsumablePoolSerializer model options."""
 
@@ -64,6 +83,41 @@ class ConsumablePoolSerializer(NautobotModelSerializer, TaggedModelSerializerMix
         fields = "__all__"
 
 
+class ConsumablePoolForecastSerializer(Serializer):  # pylint: disable=abstract-method
+    """API serializer for the consumption forecast of a ConsumablePool."""
+
+    id = UUIDField(read_only=True)
+    url = HyperlinkedIdentityField(
+        view_name="plugins-api:nautobot_consumables-api:consumablepool-detail",
+    )
+    name = CharField(read_only=True)
+    available_quantity = IntegerField(read_only=True)
+    burn_rate = FloatField(source="forecast.burn_rate", read_only=True, allow_null=True)
+    days_until_empty = FloatField(
+        source="forecast.days_until_empty", read_only=True, allow_null=True
+    )
+    forecasted = DateTimeField(source="forecast.forecasted", read_only=True, allow_null=True)
+
+
+class ConsumablePoolTransferSerializer(Serializer):  # pylint: disable=abstract-method
+    """API serializer for a single row of a bulk ConsumablePool transfer."""
+
+    source = UUIDField()
+    quantity = IntegerField(min_value=1)
+    target = UUIDField(required=False)
+    location = UUIDField(required=False)
+    name = CharField(required=False, max_length=100)
+
+    def validate(self, attrs):
+        """Transfer to either an existing pool, or a pool at a Location."""
+        if ("target" in attrs) == ("location" in attrs):
+            raise ValidationError("Transfer to either a target pool or a target location.")
+        if "name" in attrs and "location" not in attrs:
+            raise ValidationError({"name": "Only pools created at a location can be named."})
+
+        return attrs
+
+
 class ConsumableTypeSerializer(NautobotModelSerializer, TaggedModelSerializerMixin):
     """API serializer for the ConsumableType model."""
 
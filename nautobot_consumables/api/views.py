@@ -16,39 +16,396 @@
 
 """API endpoint views for Nautobot Consumables."""
 
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+import json
+from typing import NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from nautobot.apps.api import NautobotModelViewSet
+from nautobot.core.api.filter_backends import NautobotOrderingFilter
+from nautobot.dcim.models import Device, Location
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied
+from rest_framework.response import Response
+from rest_framework.serializers import ValidationError, as_serializer_error
 
 from nautobot_consumables import filters, models
 from nautobot_consumables.api import serializers
+from nautobot_consumables.api.pagination import KeysetFilterBackend, KeysetPagination
+from nautobot_consumables.utils import natural_key_related_lookups
+
+
+class KeysetPaginationMixin:  # pylint: disable=too-few-public-methods
+    """Allow paginating by cursor, for crawls of large tables."""
+
+    pagination_class = KeysetPagination
+    filter_backends = [KeysetFilterBackend, NautobotOrderingFilter]
+
+
+class NaturalKeyRelatedMixin:  # pylint: disable=too-few-public-methods
+    """Join the related objects used to build the natural key of each object in the queryset."""
+
+    def get_queryset(self):
+        """Add the natural key lookups to the queryset, they depend on the current Location tree."""
+        queryset = super().get_queryset()
+        return queryset.select_related(*natural_key_related_lookups(queryset.model))
+
+
+SYNC_PAGE_SIZE = 1000
+
+
+class SyncPosition(NamedTuple):
+    """How far a delta sync has read, by (timestamp, pk) of the last changed and deleted objects."""
+
+    changed_at: datetime | None
+    changed_pk: UUID | None
+    deleted_at: datetime
+    deleted_pk: UUID | None
+
+    def encode(self) -> str:
+        """Encode the position as an opaque cursor."""
+        position = [
+            self.changed_at.isoformat() if self.changed_at else None,
+            str(self.changed_pk) if self.changed_pk else None,
+            self.deleted_at.isoformat(),
+            str(self.deleted_pk) if self.deleted_pk else None,
+        ]
+        return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "SyncPosition":
+        """Decode a cursor returned by a previous sync."""
+        try:
+            changed_at, changed_pk, deleted_at, deleted_pk = json.loads(urlsafe_b64decode(cursor))
+            return cls(
+                datetime.fromisoformat(changed_at) if changed_at else None,
+                UUID(changed_pk) if changed_pk else None,
+                datetime.fromisoformat(deleted_at),
+                UUID(deleted_pk) if deleted_pk else None,
+            )
+        except (TypeError, ValueError) as error:
+            raise ValidationError({"cursor": "Invalid cursor."}) from error
+
+
+class SyncExpired(APIException):
+    """The deletions since the requested position are no longer kept."""
+
+    status_code = status.HTTP_410_GONE
+    default_code = "sync_expired"
+
+
+def _after(queryset: QuerySet, field: str, timestamp: datetime | None, pk: UUID | None) -> QuerySet:
+    """Filter a queryset to the rows after a (timestamp, pk) position, in that order."""
+    if timestamp is not None:
+        after = Q(**{f"{field}__gt": timestamp})
+        if pk is not None:
+            after |= Q(**{field: timestamp, "pk__gt": pk})
+        queryset = queryset.filter(after)
+
+    return queryset.order_by(field, "pk")
+
+
+class DeltaSyncMixin:  # pylint: disable=too-few-public-methods
+    """Add a `changes/` endpoint listing the objects changed and deleted since the last sync."""
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("cursor", OpenApiTypes.STR, description="From a previous sync."),
+            OpenApiParameter("changed_since", OpenApiTypes.DATETIME),
+            OpenApiParameter("limit", OpenApiTypes.INT),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        List the objects changed, and the IDs of the objects deleted, since the last sync.
 
-class CheckedOutConsumableAPIViewSet(NautobotModelViewSet):
+        Without a `cursor` or `changed_since`, every object is listed, i.e. a full sync. Each
+        response has a `next_cursor` to pass to the next request, and `has_more` is true until
+        the changes have been read. The changes are read in `(last_updated, id)` order from an
+        index, so each request costs time in proportion to the changes it returns.
+
+        The timestamps are set before the changes commit, so a change could commit after a sync
+        has read past its timestamp. Only the changes older than the `sync_lag_seconds` setting
+        are returned, so those committed within that time are read by a later sync rather than
+        skipped.
+        """
+        config = settings.PLUGINS_CONFIG.get("nautobot_consumables", {})
+        horizon = timezone.now() - timedelta(seconds=config.get("sync_lag_seconds", 60))
+        position = self._sync_position(request, horizon)
+        try:
+            limit = max(
+                1, min(int(request.query_params.get("limit", SYNC_PAGE_SIZE)), SYNC_PAGE_SIZE)
+            )
+        except ValueError as error:
+            raise ValidationError({"limit": "A valid integer is required."}) from error
+
+        changed = list(
+            _after(
+                self.get_queryset().filter(last_updated__lte=horizon),
+                "last_updated",
+                *position[:2],
+            )[: limit + 1]
+        )
+        deleted = list(
+            _after(
+                models.Tombstone.objects.filter(
+                    content_type=ContentType.objects.get_for_model(self.queryset.model),
+                    deleted__lte=horizon,
+                ),
+                "deleted",
+                *position[2:],
+            ).values_list("deleted", "pk", "object_id")[: limit + 1]
+        )
+
+        changed, deleted, has_more = changed[:limit], deleted[:limit], len(changed) > limit
+        has_more |= len(deleted) > limit
+        if changed:
+            position = position._replace(
+                changed_at=changed[-1].last_updated, changed_pk=changed[-1].pk
+            )
+        if deleted:
+            position = position._replace(deleted_at=deleted[-1][0], deleted_pk=deleted[-1][1])
+
+        return Response(
+            {
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": [
+                    {"id": object_id, "deleted": deleted_at} for deleted_at, _, object_id in deleted
+                ],
+                "next_cursor": position.encode(),
+                "has_more": has_more,
+            }
+        )
+
+    @staticmethod
+    def _sync_position(request, horizon: datetime) -> SyncPosition:
+        """Get the position to sync from, checking that its deletions are still kept."""
+        now = timezone.now()
+        if cursor := request.query_params.get("cursor"):
+            position = SyncPosition.decode(cursor)
+        elif changed_since := request.query_params.get("changed_since"):
+            try:
+                since = parse_datetime(changed_since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({"changed_since": "A valid ISO 8601 timestamp is required."})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            position = SyncPosition(since, None, since, None)
+        else:
+            # A full sync lists every object, so only the deletions from the objects it may
+            # still list are needed
+            return SyncPosition(None, None, horizon, None)
+
+        config = settings.PLUGINS_CONFIG.get("nautobot_consumables", {})
+        retention = timedelta(days=config.get("tombstone_retention_days", 30))
+        if position.deleted_at < now - retention:
+            raise SyncExpired(
+                f"Deletions are only kept for {retention.days} days, start a full sync without a "
+                f"cursor or changed_since."
+            )
+
+        return position
+
+
+class CheckedOutConsumableAPIViewSet(
+    KeysetPaginationMixin, NaturalKeyRelatedMixin, DeltaSyncMixin, NautobotModelViewSet
+):
     """API view set for CheckedOutConsumable instances."""
 
-    queryset = models.CheckedOutConsumable.objects.all()
+    queryset = models.CheckedOutConsumable.objects.select_related(
+        "consumable_pool__consumable__consumable_type",
+        "consumable_pool__consumable__manufacturer",
+        "consumable_pool__location",
+        "device__location",
+        "device__tenant",
+    ).prefetch_related("tags")
     serializer_class = serializers.CheckedOutConsumableSerializer
     filterset_class = filters.CheckedOutConsumableFilterSet
 
+    def perform_create(self, serializer):
+        """Report pool capacity errors found while the pool is locked as validation errors."""
+        try:
+            super().perform_create(serializer)
+        except DjangoValidationError as error:
+            raise ValidationError(as_serializer_error(error)) from error
+
+    def perform_update(self, serializer):
+        """Report pool capacity errors found while the pool is locked as validation errors."""
+        try:
+            super().perform_update(serializer)
+        except DjangoValidationError as error:
+            raise ValidationError(as_serializer_error(error)) from error
+
+    @extend_schema(
+        request=serializers.CheckedOutConsumableAllocationSerializer(many=True),
+        responses={201: serializers.CheckedOutConsumableSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-allocate")
+    def bulk_allocate(self, request):
+        """
+        Check out Consumables to many Devices in a single transaction.
 
-class ConsumableAPIViewSet(NautobotModelViewSet):
+        Takes a list of `consumable_pool`, `device` and `quantity` rows. The response lists the
+        created CheckedOutConsumables in the same order, or the errors for each row if any of them
+        could not be allocated, in which case nothing is created.
+        """
+        rows = serializers.CheckedOutConsumableAllocationSerializer(data=request.data, many=True)
+        rows.is_valid(raise_exception=True)
+
+        try:
+            with transaction.atomic():
+                instances = models.CheckedOutConsumable.bulk_allocate(
+                    [
+                        (row["consumable_pool"], row["device"], row["quantity"])
+                        for row in rows.validated_data
+                    ],
+                    pools=models.ConsumablePool.objects.restrict(request.user, "view"),
+                    devices=Device.objects.restrict(request.user, "view"),
+                )
+                self._validate_objects(instances)
+        except ObjectDoesNotExist as error:
+            raise PermissionDenied() from error
+        except DjangoValidationError as error:
+            row_errors = error.message_dict
+            raise ValidationError(
+                [
+                    {"non_field_errors": row_errors[str(index)]} if str(index) in row_errors else {}
+                    for index in range(len(rows.validated_data))
+                ]
+            ) from error
+
+        serializer = self.get_serializer(instances, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ConsumableAPIViewSet(
+    KeysetPaginationMixin, NaturalKeyRelatedMixin, DeltaSyncMixin, NautobotModelViewSet
+):
     """API view set for Consumable instances."""
 
-    queryset = models.Consumable.objects.all()
+    queryset = models.Consumable.objects.select_related(
+        "consumable_type",
+        "manufacturer",
+    ).prefetch_related("tags")
     serializer_class = serializers.ConsumableSerializer
     filterset_class = filters.ConsumableFilterSet
 
 
-class ConsumablePoolAPIViewSet(NautobotModelViewSet):
+class ConsumablePoolAPIViewSet(
+    KeysetPaginationMixin, NaturalKeyRelatedMixin, DeltaSyncMixin, NautobotModelViewSet
+):
     """API view set for ConsumablePool instances."""
 
-    queryset = models.ConsumablePool.objects.all()
+    queryset = (
+        models.ConsumablePool.objects.with_usage()
+        .select_related("consumable__consumable_type", "consumable__manufacturer", "location")
+        .prefetch_related("tags")
+    )
     serializer_class = serializers.ConsumablePoolSerializer
     filterset_class = filters.ConsumablePoolFilterSet
 
+    @extend_schema(responses={200: serializers.ConsumablePoolForecastSerializer(many=True)})
+    @action(detail=False, methods=["get"], url_path="forecasts")
+    def forecasts(self, request):
+        """
+        List the consumption forecasts of the pools, those that run out soonest first.
+
+        The pool filters apply, and the forecasts are those of the last run of the Forecast
+        Consumption Job. Pools that aren't being consumed, or haven't been forecast, are last.
+        """
+        queryset = self.filter_queryset(
+            self.get_queryset()
+            .select_related("forecast")
+            .order_by(F("forecast__days_until_empty").asc(nulls_last=True), "pk")
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = serializers.ConsumablePoolForecastSerializer(
+            queryset if page is None else page, many=True, context=self.get_serializer_context()
+        )
+        if page is None:
+            return Response(serializer.data)
+
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        request=serializers.ConsumablePoolTransferSerializer(many=True),
+        responses={200: serializers.ConsumablePoolSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"], url_path="transfer")
+    def transfer(self, request):
+        """
+        Move available Consumables between pools in a single transaction.
+
+        Takes a list of `source`, `quantity` and either `target` or `location` rows, where a
+        `location` transfer goes into the pool of the same Consumable at the Location called `name`,
+        by default the name of the source pool, which is created if needed. The response lists the
+        target pool of each row in the same order, or the errors for each row if any of them could
+        not be made, in which case nothing is changed.
+        """
+        rows = serializers.ConsumablePoolTransferSerializer(data=request.data, many=True)
+        rows.is_valid(raise_exception=True)
+
+        transfers = [models.PoolTransfer(**row) for row in rows.validated_data]
+        try:
+            with transaction.atomic():
+                existing = set(
+                    models.ConsumablePool.objects.filter(
+                        Q(pk__in={transfer.target for transfer in transfers if transfer.target})
+                        | Q(location__in={transfer.location for transfer in transfers})
+                    ).values_list("pk", flat=True)
+                )
+                targets = models.ConsumablePool.bulk_transfer(
+                    transfers,
+                    pools=models.ConsumablePool.objects.restrict(request.user, "change"),
+                    locations=Location.objects.restrict(request.user, "view"),
+                )
+                # The existing pools were fetched with the change permission, the new pools have
+                # to be allowed by the add permission
+                new_pools = {target.pk: target for target in targets if target.pk not in existing}
+                self._validate_objects(list(new_pools.values()))
+        except ObjectDoesNotExist as error:
+            raise PermissionDenied() from error
+        except DjangoValidationError as error:
+            row_errors = error.message_dict
+            raise ValidationError(
+                [
+                    {"non_field_errors": row_errors[str(index)]} if str(index) in row_errors else {}
+                    for index in range(len(rows.validated_data))
+                ]
+            ) from error
+
+        pools = (
+            models.ConsumablePool.objects.restrict(request.user, "view")
+            .with_usage()
+            .select_related("consumable", "location")
+            .prefetch_related("tags")
+            .in_bulk({target.pk for target in targets})
+        )
+        serializer = self.get_serializer(
+            [pools.get(target.pk, target) for target in targets], many=True
+        )
+        return Response(serializer.data)
+
 
-class ConsumableTypeAPIViewSet(NautobotModelViewSet):
+class ConsumableTypeAPIViewSet(DeltaSyncMixin, NautobotModelViewSet):
     """API view set for ConsumableType instances."""
 
-    queryset = models.ConsumableType.objects.all()
+    queryset = models.ConsumableType.objects.prefetch_related("tags")
     serializer_class = serializers.ConsumableTypeSerializer
     filterset_class = filters.ConsumableTypeFilterSet
@@ -0,0 +1,47 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Choice sets for Nautobot Consumables."""
+
+from nautobot.apps.choices import ChoiceSet
+
+
+class ReorderThresholdUnitChoices(ChoiceSet):
+    """How a reorder threshold is measured."""
+
+    UNIT_ABSOLUTE = "absolute"
+    UNIT_PERCENT = "percent"
+
+    CHOICES = (
+        (UNIT_ABSOLUTE, "Quantity"),
+        (UNIT_PERCENT, "Percent of pool quantity"),
+    )
+
+
+class ConsumableTransactionKindChoices(ChoiceSet):
+    """What changed the available quantity of a pool."""
+
+    KIND_CHECKOUT = "checkout"
+    KIND_RETURN = "return"
+    KIND_ADJUST = "adjust"
+    KIND_TRANSFER = "transfer"
+
+    CHOICES = (
+        (KIND_CHECKOUT, "Checkout"),
+        (KIND_RETURN, "Return"),
+        (KIND_ADJUST, "Adjustment"),
+        (KIND_TRANSFER, "Transfer"),
+    )
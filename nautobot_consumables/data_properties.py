@@ -0,0 +1,266 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Index and filter Consumable data by the properties defined in the ConsumableType schemas."""
+
+from collections.abc import Iterable
+from copy import deepcopy
+import hashlib
+import re
+from typing import Any
+from uuid import uuid4
+
+from django import forms
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.transaction import TransactionManagementError
+import django_filters
+from nautobot.apps.filters import (
+    MultiValueCharFilter,
+    MultiValueFloatFilter,
+    MultiValueNumberFilter,
+)
+from nautobot.apps.forms import StaticSelect2, StaticSelect2Multiple
+from nautobot.core.forms.constants import BOOLEAN_WITH_BLANK_CHOICES
+
+from nautobot_consumables.models import Consumable, ConsumableType
+
+DATA_INDEX_PREFIX = "nautobot_consumables_data_"
+INDEXABLE_TYPES = ("boolean", "integer", "number", "string")
+
+# Property names are used in filter names, so only simple identifiers are supported
+PROPERTY_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9]*(_[A-Za-z0-9]+)*$")
+
+# The lookups added for each property type, as filter name suffix: (ORM lookup, label suffix)
+NEGATED_LOOKUPS = {"n": ("exact", "not")}
+RANGE_LOOKUPS = {"gte": ("gte", "min"), "lte": ("lte", "max")}
+TEXT_LOOKUPS = {"ic": ("icontains", "contains"), "nic": ("icontains", "does not contain")}
+
+_VERSION_CACHE_KEY = "nautobot_consumables.data_properties.version"
+_loaded: dict[str, Any] = {"version": None, "properties": {}, "filters": {}, "form_fields": {}}
+
+
+def data_properties() -> dict[str, dict[str, Any]]:
+    """
+    Get the properties defined by the ConsumableType schemas, keyed by name.
+
+    When several schemas define a property, it is `indexed` if any of them sets
+    `"indexed": true`. Its `type` is only set if they all agree on it, and its `choices` are only
+    set if they all limit it to an `enum`. The schemas are parsed, and the filters for their
+    properties built, once per process, and again only after `data_properties_changed()` has been
+    called by any process.
+    """
+    version = cache.get(_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(_VERSION_CACHE_KEY, uuid4().hex, None)
+        version = cache.get(_VERSION_CACHE_KEY)
+
+    if _loaded["version"] != version or version is None:
+        properties = parse_schema_properties(
+            ConsumableType.objects.order_by("_name").values_list("schema", flat=True)
+        )
+        _loaded.update(
+            properties=properties,
+            filters=_build_filters(properties),
+            form_fields=_build_form_fields(properties),
+            version=version,
+        )
+
+    return _loaded["properties"]
+
+
+def data_properties_changed() -> None:
+    """Make every process parse the ConsumableType schemas again, after one has changed."""
+    cache.set(_VERSION_CACHE_KEY, uuid4().hex, None)
+
+
+def parse_schema_properties(schemas: Iterable[Any]) -> dict[str, dict[str, Any]]:
+    """Merge the properties defined by several ConsumableType schemas, see `data_properties()`."""
+    properties: dict[str, dict[str, Any]] = {}
+    for schema in schemas:
+        if not isinstance(schema, dict):
+            continue
+
+        for key, prop in schema.get("properties", {}).items():
+            if not isinstance(prop, dict) or not PROPERTY_NAME_RE.match(key):
+                continue
+
+            merged = properties.setdefault(
+                key,
+                {"title": prop.get("title") or key, "type": prop.get("type"), "choices": {}},
+            )
+            if merged["type"] != prop.get("type"):
+                merged["type"] = None
+            merged["indexed"] = merged.get("indexed", False) or prop.get("indexed") is True
+
+            if merged["choices"] is not None and prop.get("enum"):
+                titles = prop.get("options", {}).get("enum_titles") or prop["enum"]
+                for value, title in zip(prop["enum"], titles, strict=False):
+                    if isinstance(value, (str, int, float, bool)):
+                        merged["choices"].setdefault(value, str(title))
+            else:
+                merged["choices"] = None
+
+    for prop in properties.values():
+        prop["indexed"] &= prop["type"] in INDEXABLE_TYPES
+
+    return properties
+
+
+def data_index_name(key: str) -> str:
+    """Get the name of the database index for a Consumable data property."""
+    return f"{DATA_INDEX_PREFIX}{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+
+
+def sync_data_indexes(using: str = DEFAULT_DB_ALIAS) -> tuple[list[str], list[str]]:
+    """
+    Create and drop indexes so that each indexed data property has one.
+
+    Each index is on the `data -> 'key'` expression, which is what the ORM compares for lookups
+    such as `data__form_factor="QSFP28 (100GE)"`, so the generated filters can use it for exact
+    and range lookups. Only PostgreSQL is supported: on MySQL the ORM compares `JSON_EXTRACT()`
+    results, which an index on a generated column can't serve, so the filters scan the table.
+
+    The indexes are built and dropped `CONCURRENTLY`, so writes to the Consumables aren't blocked,
+    which PostgreSQL only allows outside of a transaction. An index left invalid by an interrupted
+    build is dropped and built again. Returns the names of the created and dropped indexes.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return [], []
+
+    if connection.in_atomic_block:
+        raise TransactionManagementError(
+            "The data property indexes are built concurrently, which can't be done in a "
+            "transaction."
+        )
+
+    table = Consumable._meta.db_table
+    wanted = {
+        data_index_name(key): key for key, prop in data_properties().items() if prop["indexed"]
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT idx.relname, pg_index.indisvalid FROM pg_index "
+            "JOIN pg_class idx ON idx.oid = pg_index.indexrelid "
+            "JOIN pg_class tbl ON tbl.oid = pg_index.indrelid "
+            "WHERE tbl.relname = %s AND tbl.relnamespace = current_schema()::regnamespace",
+            [table],
+        )
+        existing = {
+            name: valid for name, valid in cursor.fetchall() if name.startswith(DATA_INDEX_PREFIX)
+        }
+
+    dropped = sorted(name for name, valid in existing.items() if not valid or name not in wanted)
+    created = sorted(name for name in wanted if not existing.get(name))
+    with connection.schema_editor(atomic=False) as editor:
+        for name in dropped:
+            editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {editor.quote_name(name)}")
+
+        for name in created:
+            key = editor.quote_value(wanted[name])
+            editor.execute(
+                f"CREATE INDEX CONCURRENTLY {editor.quote_name(name)} ON "
+                f"{editor.quote_name(table)} (({editor.quote_name('data')} -> {key}))"
+            )
+
+    return created, [name for name in dropped if name not in wanted]
+
+
+def data_property_filters() -> dict[str, django_filters.Filter]:
+    """Get new instances of the filters for the ConsumableType schema properties."""
+    data_properties()
+    return deepcopy(_loaded["filters"])
+
+
+def data_property_form_fields() -> dict[str, forms.Field]:
+    """Get new instances of the filter form fields for the ConsumableType schema properties."""
+    data_properties()
+    return deepcopy(_loaded["form_fields"])
+
+
+def _build_filters(properties: dict[str, dict[str, Any]]) -> dict[str, django_filters.Filter]:
+    """
+    Build the filters for the data properties, named after the ORM lookups they use.
+
+    Enum properties are filtered by their choices, e.g. `data__form_factor`, integers and
+    numbers by value or range, e.g. `data__length__gte`, and strings by value or a partial match,
+    e.g. `data__notes__ic`. Negated lookups, e.g. `data__form_factor__n`, are built as well.
+    """
+    filters: dict[str, django_filters.Filter] = {}
+    for key, prop in properties.items():
+        name = f"data__{key}"
+        lookups: dict[str, tuple[str, str]] = dict(NEGATED_LOOKUPS)
+        if prop["choices"]:
+            values = {str(value): value for value in prop["choices"]}
+            filter_class: type[django_filters.Filter] = django_filters.TypedMultipleChoiceFilter
+            extra: dict[str, Any] = {
+                "choices": [(str(value), title) for value, title in prop["choices"].items()],
+                "coerce": values.__getitem__,
+            }
+        elif prop["type"] == "boolean":
+            filter_class, extra, lookups = django_filters.BooleanFilter, {}, {}
+        elif prop["type"] in ("integer", "number"):
+            filter_class = (
+                MultiValueNumberFilter if prop["type"] == "integer" else MultiValueFloatFilter
+            )
+            extra = {}
+            lookups.update(RANGE_LOOKUPS)
+        else:
+            filter_class, extra = MultiValueCharFilter, {}
+            lookups.update(TEXT_LOOKUPS)
+
+        filters[name] = filter_class(field_name=name, label=prop["title"], **extra)
+        for lookup_name, (lookup_expr, label) in lookups.items():
+            filters[f"{name}__{lookup_name}"] = filter_class(
+                field_name=name,
+                lookup_expr=lookup_expr,
+                label=f"{prop['title']} ({label})",
+                exclude=lookup_name.startswith("n"),
+                **extra,
+            )
+
+    return filters
+
+
+def _build_form_fields(properties: dict[str, dict[str, Any]]) -> dict[str, forms.Field]:
+    """Build the filter form fields for the most useful filter of each data property."""
+    fields: dict[str, forms.Field] = {}
+    for key, prop in properties.items():
+        name = f"data__{key}"
+        if prop["choices"]:
+            fields[name] = forms.MultipleChoiceField(
+                choices=[(str(value), title) for value, title in prop["choices"].items()],
+                required=False,
+                label=prop["title"],
+                widget=StaticSelect2Multiple(),
+            )
+        elif prop["type"] == "boolean":
+            fields[name] = forms.NullBooleanField(
+                required=False,
+                label=prop["title"],
+                widget=StaticSelect2(choices=BOOLEAN_WITH_BLANK_CHOICES),
+            )
+        elif prop["type"] in ("integer", "number"):
+            field_class = forms.IntegerField if prop["type"] == "integer" else forms.FloatField
+            fields[f"{name}__gte"] = field_class(required=False, label=f"{prop['title']} (min)")
+            fields[f"{name}__lte"] = field_class(required=False, label=f"{prop['title']} (max)")
+        else:
+            fields[f"{name}__ic"] = forms.CharField(
+                required=False, label=f"{prop['title']} (contains)"
+            )
+
+    return fields
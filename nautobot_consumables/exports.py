@@ -0,0 +1,157 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Stream exports of the Nautobot Consumables inventory as CSV or JSON Lines."""
+
+from collections.abc import Iterator
+import csv
+import json
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.http import StreamingHttpResponse
+
+from nautobot_consumables.data_properties import parse_schema_properties
+from nautobot_consumables.models import (
+    CheckedOutConsumable,
+    Consumable,
+    ConsumablePool,
+    ConsumableType,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {"csv": "text/csv", "jsonl": "application/jsonl"}
+
+# Query string parameters of the list views that aren't filters, so exports ignore them
+NON_FILTER_PARAMS = ("export", "page", "per_page", "sort")
+
+# The columns exported for each model, as header: field lookup
+EXPORT_COLUMNS: dict[type[models.Model], dict[str, str]] = {
+    CheckedOutConsumable: {
+        "id": "id",
+        "consumable_pool": "consumable_pool__name",
+        "consumable": "consumable_pool__consumable__name",
+        "consumable_type": "consumable_pool__consumable__consumable_type__name",
+        "location": "consumable_pool__location__name",
+        "device": "device__name",
+        "quantity": "quantity",
+    },
+    Consumable: {
+        "id": "id",
+        "name": "name",
+        "consumable_type": "consumable_type__name",
+        "manufacturer": "manufacturer__name",
+        "product_id": "product_id",
+    },
+    ConsumablePool: {
+        "id": "id",
+        "name": "name",
+        "consumable": "consumable__name",
+        "consumable_type": "consumable__consumable_type__name",
+        "location": "location__name",
+        "quantity": "quantity",
+        "used_quantity": "used_quantity",
+    },
+}
+
+# The lookup from each model to the Consumable whose data is exported with it
+EXPORT_CONSUMABLE_PATHS: dict[type[models.Model], str] = {
+    CheckedOutConsumable: "consumable_pool__consumable__",
+    Consumable: "",
+    ConsumablePool: "consumable__",
+}
+
+
+class _Echo:
+    """A file-like object that returns what is written to it, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        """Return the value instead of storing it."""
+        return value
+
+
+def data_columns(queryset: models.QuerySet) -> dict[str, str]:
+    """
+    Get the data columns for an export, as header: property name.
+
+    The columns are the properties defined by the schemas of the ConsumableTypes of the exported
+    objects, so an export filtered to a single type only has the columns of that type.
+    """
+    path = EXPORT_CONSUMABLE_PATHS[queryset.model]
+    schemas = (
+        ConsumableType.objects.filter(pk__in=queryset.values(f"{path}consumable_type"))
+        .order_by("_name")
+        .values_list("schema", flat=True)
+    )
+
+    return {f"data.{key}": key for key in parse_schema_properties(schemas)}
+
+
+def export_rows(queryset: models.QuerySet, data_keys: dict[str, str]) -> Iterator[dict[str, Any]]:
+    """
+    Yield the rows of an export, with the Consumable data flattened into one column per property.
+
+    The rows are read with a server-side cursor, in chunks, and without building model instances,
+    so memory use doesn't grow with the size of the export.
+    """
+    columns = EXPORT_COLUMNS[queryset.model]
+    lookups = [*columns.values(), f"{EXPORT_CONSUMABLE_PATHS[queryset.model]}data"]
+    values = queryset.order_by("pk").values_list(*lookups)
+
+    for row in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        data = row[-1] if isinstance(row[-1], dict) else {}
+        yield {
+            **dict(zip(columns, row, strict=False)),
+            **{header: data.get(key) for header, key in data_keys.items()},
+        }
+
+
+def stream_csv(headers: list[str], rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    """Yield a CSV export line by line, encoding list and object values as JSON."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(
+            [
+                json.dumps(value) if isinstance(value, (dict, list)) else value
+                for value in row.values()
+            ]
+        )
+
+
+def stream_jsonl(rows: Iterator[dict[str, Any]]) -> Iterator[str]:
+    """Yield a JSON Lines export, one object per line."""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def streaming_export_response(
+    queryset: models.QuerySet, export_format: str
+) -> StreamingHttpResponse:
+    """Build a response that streams the export of a queryset in the requested format."""
+    data_keys = data_columns(queryset)
+    rows = export_rows(queryset, data_keys)
+    if export_format == "csv":
+        content = stream_csv([*EXPORT_COLUMNS[queryset.model], *data_keys], rows)
+    else:
+        content = stream_jsonl(rows)
+
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    filename = f"nautobot_{queryset.model._meta.verbose_name_plural.replace(' ', '_')}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+
+    return response
@@ -16,8 +16,11 @@
 
 """Filters for Nautobot Consumables models."""
 
+from django.db.models import F, Q
+from django_filters import BooleanFilter
 from nautobot.apps.filters import NautobotFilterSet, SearchFilter
 
+from nautobot_consumables.data_properties import data_property_filters
 from nautobot_consumables.models import (
     CheckedOutConsumable,
     Consumable,
@@ -59,7 +62,25 @@ class ConsumableFilterSet(NautobotFilterSet):
         """ConsumableFilterSet model options."""
 
         model = Consumable
-        fields = ["name", "consumable_type", "manufacturer", "product_id", "data", "tags"]
+        fields = [
+            "name",
+            "consumable_type",
+            "manufacturer",
+            "product_id",
+            "data",
+            "reorder_threshold",
+            "reorder_threshold_unit",
+            "tags",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        """Add the filters for the properties of the ConsumableType schemas."""
+        super().__init__(*args, **kwargs)
+
+        for name, data_filter in data_property_filters().items():
+            data_filter.model = self._meta.model
+            data_filter.parent = self
+            self.filters.setdefault(name, data_filter)
 
 
 class ConsumablePoolFilterSet(NautobotFilterSet):
@@ -73,11 +94,36 @@ class ConsumablePoolFilterSet(NautobotFilterSet):
         }
     )
 
+    low_stock = BooleanFilter(method="filter_low_stock", label="Below reorder threshold")
+
     class Meta:
         """ConsumablePoolFilterSet model options."""
 
         model = ConsumablePool
-        fields = ["name", "consumable", "location", "quantity", "tags"]
+        fields = [
+            "name",
+            "consumable",
+            "location",
+            "quantity",
+            "reorder_threshold",
+            "reorder_threshold_unit",
+            "tags",
+        ]
+
+    def filter_low_stock(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Filter on whether the available quantity is below the reorder threshold."""
+        if value is None:
+            return queryset
+        if value:
+            return queryset.low_stock()
+
+        return (
+            queryset.with_usage()
+            .with_reorder_threshold()
+            .filter(
+                Q(reorder_quantity__isnull=True) | Q(available_quantity__gte=F("reorder_quantity"))
+            )
+        )
 
 
 class ConsumableTypeFilterSet(NautobotFilterSet):
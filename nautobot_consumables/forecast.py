@@ -0,0 +1,164 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Forecast the consumption of the ConsumablePools from the daily totals of their ledgers."""
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from nautobot_consumables.choices import ConsumableTransactionKindChoices
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+FORECAST_BATCH_SIZE = 2000
+FORECAST_WINDOW_DAYS = 28
+FORECAST_HALF_LIFE_DAYS = 7
+
+# The transactions that consume from a pool, the other kinds restock it or move its stock
+CONSUMPTION_KINDS = (
+    ConsumableTransactionKindChoices.KIND_CHECKOUT,
+    ConsumableTransactionKindChoices.KIND_RETURN,
+)
+
+
+def daily_consumption(
+    transaction_model: type[models.Model],
+    pool_index: dict[Any, int],
+    start: date,
+    days: int,
+    using: str = DEFAULT_DB_ALIAS,
+) -> "np.ndarray":
+    """
+    Get the net quantity checked out from each pool on each day, as a pools x days array.
+
+    The ledger is summed by pool and day in the database, so one row is read for each day a pool
+    had checkouts or returns, and the rows are placed in the array with a single assignment.
+    """
+    since = timezone.make_aware(datetime.combine(start, time.min))
+    rows = (
+        transaction_model.objects.using(using)
+        .filter(
+            kind__in=CONSUMPTION_KINDS,
+            timestamp__gte=since,
+            timestamp__lt=since + timedelta(days=days),
+        )
+        .annotate(day=TruncDate("timestamp"))
+        .order_by()
+        .values_list("consumable_pool", "day")
+        .annotate(total=Sum("quantity"))
+    )
+
+    pools, offsets, totals = [], [], []
+    for pool_pk, day, total in rows.iterator(chunk_size=FORECAST_BATCH_SIZE):
+        if (index := pool_index.get(pool_pk)) is not None:
+            pools.append(index)
+            offsets.append((day - start).days)
+            totals.append(-total)
+
+    consumption = np.zeros((len(pool_index), days))
+    consumption[np.array(pools, dtype=np.intp), np.array(offsets, dtype=np.intp)] = totals
+
+    return consumption
+
+
+def burn_rates(consumption: "np.ndarray", half_life_days: float) -> "np.ndarray":
+    """
+    Get the consumption per day of each pool, as a weighted mean of its daily consumption.
+
+    The weights halve every `half_life_days` going back from the last day, so the rates follow
+    recent changes in demand. Pools with more returned than checked out have a rate of zero.
+    """
+    ages = np.arange(consumption.shape[1] - 1, -1, -1)
+    weights = 0.5 ** (ages / half_life_days)
+    rates = consumption @ (weights / weights.sum())
+
+    return np.clip(rates, 0, None)
+
+
+def days_until_empty(available: "np.ndarray", rates: "np.ndarray") -> "np.ndarray":
+    """Get how many days the available quantity of each pool lasts, NaN if it isn't consumed."""
+    return np.divide(available, rates, out=np.full(available.shape, np.nan), where=rates > 0)
+
+
+def forecast_pools(
+    forecast_model: type[models.Model],
+    window_days: int = FORECAST_WINDOW_DAYS,
+    half_life_days: float = FORECAST_HALF_LIFE_DAYS,
+    using: str = DEFAULT_DB_ALIAS,
+) -> int:
+    """
+    Replace the forecasts of every pool, from the consumption in the last `window_days` full days.
+
+    The burn rates and days until empty of all the pools are calculated together, as arrays, and
+    the forecasts are written in batches. Returns the number of pools forecast.
+    """
+    if np is None:
+        raise ImproperlyConfigured(
+            "Forecasting requires the numpy package, installed with "
+            "`pip install nautobot-consumables[forecast]`."
+        )
+
+    pool_model = forecast_model._meta.get_field("consumable_pool").related_model
+    transaction_model = pool_model._meta.get_field("transactions").related_model
+    pool_pks, available = [], []
+    for pool_pk, pool_available in (
+        pool_model.objects.using(using)
+        .order_by()
+        .values_list("pk", F("quantity") - F("used_quantity"))
+        .iterator(chunk_size=FORECAST_BATCH_SIZE)
+    ):
+        pool_pks.append(pool_pk)
+        available.append(pool_available)
+
+    start = timezone.localdate() - timedelta(days=window_days)
+    consumption = daily_consumption(
+        transaction_model,
+        {pk: index for index, pk in enumerate(pool_pks)},
+        start,
+        window_days,
+        using,
+    )
+    rates = burn_rates(consumption, half_life_days)
+    remaining = days_until_empty(np.array(available, dtype=float), rates)
+
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        forecast_model.objects.using(using).all().delete()
+        forecast_model.objects.using(using).bulk_create(
+            [
+                forecast_model(
+                    consumable_pool_id=pool_pk,
+                    burn_rate=rate,
+                    days_until_empty=None if np.isnan(days) else days,
+                    forecasted=now,
+                )
+                for pool_pk, rate, days in zip(
+                    pool_pks, rates.tolist(), remaining.tolist(), strict=True
+                )
+            ],
+            batch_size=FORECAST_BATCH_SIZE,
+        )
+
+    return len(pool_pks)
@@ -26,11 +26,14 @@ from nautobot.apps.forms import (
     NautobotBulkEditForm,
     NautobotFilterForm,
     NautobotModelForm,
+    StaticSelect2,
     TagsBulkEditFormMixin,
 )
+from nautobot.core.forms.constants import BOOLEAN_WITH_BLANK_CHOICES
 from nautobot.dcim.models import Device, Location, Manufacturer
 
 from nautobot_consumables import models
+from nautobot_consumables.data_properties import data_property_form_fields
 from nautobot_consumables.fields import ConsumablesTypeJSONField
 
 
@@ -183,6 +186,13 @@ class ConsumableFilterForm(NautobotFilterForm, CustomFieldModelFilterFormMixin):
         required=False,
     )
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Add the fields for the properties of the ConsumableType schemas."""
+        super().__init__(*args, **kwargs)
+
+        for name, field in data_property_form_fields().items():
+            self.fields.setdefault(name, field)
+
 
 class ConsumableForm(ConsumablesBaseModelForm, ConsumableJSONFormMixin):
     """Form for creating or editing a Consumable instance."""
@@ -197,7 +207,16 @@ class ConsumableForm(ConsumablesBaseModelForm, ConsumableJSONFormMixin):
         """ConsumableForm model options."""
 
         model = models.Consumable
-        fields = ["name", "consumable_type", "manufacturer", "product_id", "data", "tags"]
+        fields = [
+            "name",
+            "consumable_type",
+            "manufacturer",
+            "product_id",
+            "reorder_threshold",
+            "reorder_threshold_unit",
+            "data",
+            "tags",
+        ]
 
 
 # Consumable Pools
@@ -221,13 +240,18 @@ class ConsumablePoolFilterForm(NautobotFilterForm, CustomFieldModelFilterFormMix
 
     model = models.ConsumablePool
 
-    field_order = ["q", "consumable", "name", "location", "quantity"]
+    field_order = ["q", "consumable", "name", "location", "quantity", "low_stock"]
     q = forms.CharField(required=False, label="Search")
 
     consumable = DynamicModelMultipleChoiceField(
         queryset=models.Consumable.objects.all(), required=False
     )
     location = DynamicModelMultipleChoiceField(queryset=Location.objects.all(), required=False)
+    low_stock = forms.NullBooleanField(
+        required=False,
+        label="Below reorder threshold",
+        widget=StaticSelect2(choices=BOOLEAN_WITH_BLANK_CHOICES),
+    )
 
 
 class ConsumablePoolForm(ConsumablesBaseModelForm, ConsumableJSONFormMixin):
@@ -247,7 +271,15 @@ class ConsumablePoolForm(ConsumablesBaseModelForm, ConsumableJSONFormMixin):
         """ConsumablePoolForm model options."""
 
         model = models.ConsumablePool
-        fields = ["name", "consumable", "location", "quantity", "tags"]
+        fields = [
+            "name",
+            "consumable",
+            "location",
+            "quantity",
+            "reorder_threshold",
+            "reorder_threshold_unit",
+            "tags",
+        ]
 
 
 # Consumable Types
@@ -0,0 +1,778 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Bulk import the Nautobot Consumables inventory from CSV or JSON Lines files."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+import csv
+from itertools import islice
+import json
+from typing import Any, NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from jsonschema.exceptions import SchemaError
+from nautobot.dcim.models import Device, Location, Manufacturer
+from nautobot.extras.choices import ObjectChangeActionChoices
+
+from nautobot_consumables.choices import ConsumableTransactionKindChoices
+from nautobot_consumables.data_properties import (
+    data_properties_changed,
+    parse_schema_properties,
+)
+from nautobot_consumables.models import (
+    CheckedOutConsumable,
+    Consumable,
+    ConsumablePool,
+    ConsumableTransaction,
+    ConsumableType,
+    LocationConsumableSummary,
+    PoolTransfer,
+)
+from nautobot_consumables.summaries import SummaryDeltas
+from nautobot_consumables.utils import (
+    SchemaDataError,
+    bulk_record_object_changes,
+    get_schema_validator,
+    invalidate_tab_counts,
+)
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+class ImportRowError(NamedTuple):
+    """The errors that kept a row of an import file from being imported."""
+
+    row: int
+    errors: list[str]
+
+
+class ImportResult(NamedTuple):
+    """The outcome of an import."""
+
+    created: int
+    updated: int
+    errors: list[ImportRowError]
+
+
+class ReferenceMap:
+    """
+    Resolve references to objects by primary key or by name, using maps loaded with one query.
+
+    Names don't have to be unique, e.g. Locations with different parents, so each object is also
+    mapped by its name qualified with the other fields of `key_fields`. A reference can give any
+    leading part of the key, and fails if that part matches more than one object.
+    """
+
+    _ambiguous = object()
+
+    def __init__(self, label: str, queryset: models.QuerySet, key_fields: tuple[str, ...]):
+        """Load the primary keys and key fields of every object in the queryset."""
+        self.label = label
+        self.pks: dict[str, Any] = {}
+        self.keys: dict[tuple[str, ...], Any] = {}
+        for pk, *key in queryset.order_by().values_list("pk", *key_fields).iterator():
+            self.add(pk, tuple(key))
+
+    def add(self, pk: Any, key: tuple[Any, ...]) -> None:
+        """Map an object by its primary key and by each leading part of its key."""
+        self.pks[str(pk)] = pk
+        if key[0] is None:
+            return
+
+        for length in range(1, len(key) + 1):
+            prefix = tuple(str(part) for part in key[:length])
+            self.keys[prefix] = self._ambiguous if prefix in self.keys else pk
+
+    def resolve(self, *key: Any) -> Any:
+        """Get the primary key of the referenced object, raising ValueError if it isn't found."""
+        if key[0] in (None, ""):
+            raise ValueError(f"{self.label} is required.")
+        if str(key[0]) in self.pks:
+            return self.pks[str(key[0])]
+
+        parts = []
+        for part in key:
+            if part in (None, ""):
+                break
+            parts.append(str(part))
+
+        pk = self.keys.get(tuple(parts))
+        if pk is None:
+            raise ValueError(f"{self.label} {' / '.join(parts)} does not exist.")
+        if pk is self._ambiguous:
+            raise ValueError(f"{self.label} {' / '.join(parts)} matches more than one object.")
+
+        return pk
+
+
+def read_rows(lines: Iterable[str], file_format: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    """
+    Yield the rows of an import file with their line numbers, one at a time.
+
+    Empty CSV values are left out of the rows. The `data` and `schema` CSV columns, and any
+    `data.<property>` columns for Consumables, are decoded by the importers.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield (
+                reader.line_num,
+                {key: value for key, value in row.items() if value not in ("", None)},
+            )
+        return
+
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            row = {"__error__": f"Invalid JSON: {error}"}
+        if not isinstance(row, dict):
+            row = {"__error__": "Each line must be a JSON object."}
+        yield line_num, row
+
+
+def _json_value(row: dict[str, Any], field: str) -> Any:
+    """Get a JSON value from a row, decoding it if it was read from a CSV file."""
+    value = row.get(field)
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError as error:
+            raise ValueError(f"{field}: invalid JSON, {error}") from error
+
+    return value
+
+
+def _quantity(row: dict[str, Any]) -> int:
+    """Get the quantity of a row, which is required."""
+    try:
+        return int(row["quantity"])
+    except KeyError as error:
+        raise ValueError("quantity: this field is required.") from error
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"quantity: {row['quantity']!r} is not an integer.") from error
+
+
+class ModelImporter(ABC):
+    """
+    Import the rows of a file into a model, in batches.
+
+    Each batch fetches the existing objects it updates with one query, checks every row without
+    any further queries, and writes the valid rows with `bulk_create()` and `bulk_update()` in a
+    single transaction, recording their change log entries. Invalid rows are reported and skipped.
+    """
+
+    model: type[models.Model]
+    key_fields: tuple[str, ...]
+    update_fields: tuple[str, ...]
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE):
+        """Set how many rows are imported in each batch, subclasses load their reference maps."""
+        self.batch_size = batch_size
+
+    def import_rows(self, rows: Iterable[tuple[int, dict[str, Any]]]) -> ImportResult:
+        """Import the rows, returning the counts of created and updated objects and the errors."""
+        created = updated = 0
+        errors: list[ImportRowError] = []
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            with transaction.atomic():
+                new, changed, batch_errors = self.import_batch(batch)
+            created += len(new)
+            updated += len(changed)
+            errors.extend(batch_errors)
+
+        return ImportResult(created, updated, errors)
+
+    def import_batch(
+        self, batch: list[tuple[int, dict[str, Any]]]
+    ) -> tuple[list[models.Model], list[models.Model], list[ImportRowError]]:
+        """Check and write a batch of rows."""
+        errors: list[ImportRowError] = []
+        resolved: list[tuple[int, dict[str, Any]]] = []
+        for line_num, row in batch:
+            try:
+                if "__error__" in row:
+                    raise ValueError(row["__error__"])
+                resolved.append((line_num, self.resolve(row)))
+            except (ValueError, ValidationError) as error:
+                errors.append(ImportRowError(line_num, _messages(error)))
+
+        new, changed = self.build_rows(resolved, errors)
+        new, changed, write_errors = self.check(new, changed)
+        errors.extend(write_errors)
+
+        now = timezone.now()
+        for instance in changed:
+            instance.last_updated = now
+        self.model.objects.bulk_create(new)
+        self.model.objects.bulk_update(changed, [*self.update_fields, "last_updated"])
+        bulk_record_object_changes(new)
+        bulk_record_object_changes(changed, ObjectChangeActionChoices.ACTION_UPDATE)
+        self.after_write(new, changed)
+
+        return new, changed, sorted(errors)
+
+    def build_rows(
+        self, resolved: list[tuple[int, dict[str, Any]]], errors: list[ImportRowError]
+    ) -> tuple[list[tuple[int, models.Model]], list[tuple[int, models.Model]]]:
+        """Build the new and changed objects of the resolved rows, adding any errors."""
+        existing = {
+            self.key(instance): instance
+            for instance in self.existing([fields for _, fields in resolved])
+        }
+
+        seen: dict[tuple[Any, ...], int] = {}
+        new: list[tuple[int, models.Model]] = []
+        changed: list[tuple[int, models.Model]] = []
+        for line_num, fields in resolved:
+            key = tuple(fields[field] for field in self.key_fields)
+            if key in seen:
+                errors.append(ImportRowError(line_num, [f"Duplicate of row {seen[key]}."]))
+                continue
+            seen[key] = line_num
+
+            instance = existing.get(key)
+            try:
+                instance = self.build(instance, fields)
+                instance.clean_fields(exclude=self.clean_fields_exclude)
+            except (ValueError, ValidationError) as error:
+                errors.append(ImportRowError(line_num, _messages(error)))
+                continue
+
+            (changed if instance.present_in_database else new).append((line_num, instance))
+
+        return new, changed
+
+    @property
+    def clean_fields_exclude(self) -> list[str]:
+        """Skip the related fields when checking the fields, they are resolved from the maps."""
+        return [field.name for field in self.model._meta.concrete_fields if field.is_relation]
+
+    @abstractmethod
+    def resolve(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Resolve the references of a row, returning the field values for its object."""
+
+    def key(self, instance: models.Model) -> tuple[Any, ...]:
+        """Get the key identifying an object in the import rows."""
+        return tuple(getattr(instance, field) for field in self.key_fields)
+
+    def existing(self, rows: list[dict[str, Any]]) -> Iterable[models.Model]:
+        """Fetch the existing objects that the rows of a batch may update."""
+        if not rows:
+            return []
+
+        lookups = {f"{field}__in": {row[field] for row in rows} for field in self.key_fields}
+        return self.model.objects.filter(**lookups)
+
+    def build(self, instance: models.Model | None, fields: dict[str, Any]) -> models.Model:
+        """Create a new object, or update an existing one, from the fields of a row."""
+        if instance is None:
+            return self.model(**fields)
+
+        for field in self.update_fields:
+            setattr(instance, field, fields[field])
+
+        return instance
+
+    def check(
+        self,
+        new: list[tuple[int, models.Model]],
+        changed: list[tuple[int, models.Model]],
+    ) -> tuple[list[models.Model], list[models.Model], list[ImportRowError]]:
+        """Run the checks that involve several rows of a batch, dropping any invalid rows."""
+        return [instance for _, instance in new], [instance for _, instance in changed], []
+
+    def after_write(self, new: list[models.Model], changed: list[models.Model]) -> None:  # noqa: B027
+        """Update anything that depends on the written objects, an optional hook."""
+
+
+class ConsumableTypeImporter(ModelImporter):
+    """Import ConsumableTypes, identified by name, from rows with a `name` and a `schema`."""
+
+    model = ConsumableType
+    key_fields = ("name",)
+    update_fields = ("schema",)
+
+    def resolve(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Decode and check the schema."""
+        schema = _json_value(row, "schema")
+        if schema:
+            try:
+                get_schema_validator(schema)
+            except SchemaError as error:
+                raise ValueError(f"schema: {error.message}") from error
+
+        return {"name": row.get("name", ""), "schema": schema}
+
+    def after_write(self, new: list[models.Model], changed: list[models.Model]) -> None:
+        """Rebuild the data property filters, the signals aren't sent."""
+        if new or changed:
+            data_properties_changed()
+
+
+class ConsumableImporter(ModelImporter):
+    """
+    Import Consumables, identified by name.
+
+    The rows give the `consumable_type` and `manufacturer` by name or primary key, and the data
+    either as a `data` object or as `data.<property>` columns, like the exports.
+    """
+
+    model = Consumable
+    key_fields = ("name",)
+    update_fields = ("manufacturer_id", "product_id", "data")
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE):
+        """Load the ConsumableTypes and Manufacturers."""
+        super().__init__(batch_size)
+        self.types = ReferenceMap("Consumable type", ConsumableType.objects.all(), ("name",))
+        self.manufacturers = ReferenceMap("Manufacturer", Manufacturer.objects.all(), ("name",))
+        self.schemas = dict(ConsumableType.objects.values_list("pk", "schema"))
+        self.property_types = {
+            pk: {key: prop["type"] for key, prop in parse_schema_properties([schema]).items()}
+            for pk, schema in self.schemas.items()
+        }
+
+    def resolve(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Resolve the references, then build and validate the data."""
+        consumable_type_id = self.types.resolve(row.get("consumable_type"))
+        manufacturer_id = None
+        if row.get("manufacturer"):
+            manufacturer_id = self.manufacturers.resolve(row["manufacturer"])
+
+        data = _json_value(row, "data") or {}
+        if not isinstance(data, dict):
+            raise ValueError("data: must be an object.")
+        property_types = self.property_types[consumable_type_id]
+        for column, value in row.items():
+            if column.startswith("data.") and value is not None:
+                key = column.removeprefix("data.")
+                data[key] = _decode_property(value, property_types.get(key))
+
+        schema = self.schemas[consumable_type_id]
+        if schema and data:
+            try:
+                get_schema_validator(schema).validate(data)
+            except SchemaDataError as error:
+                path = "']['".join(str(part) for part in error.path)
+                raise ValueError(
+                    f"data: {error.message}" + (f" on ['{path}']" if path else "")
+                ) from error
+
+        return {
+            "name": row.get("name", ""),
+            "consumable_type_id": consumable_type_id,
+            "manufacturer_id": manufacturer_id,
+            "product_id": row.get("product_id", ""),
+            "data": data or None,
+        }
+
+    def build(self, instance: models.Model | None, fields: dict[str, Any]) -> models.Model:
+        """New Consumables copy the schema of their type, which can't be changed after creation."""
+        if instance is not None and instance.consumable_type_id != fields["consumable_type_id"]:
+            raise ValueError("consumable_type: cannot be changed after creation.")
+
+        instance = super().build(instance, fields)
+        if not instance.present_in_database:
+            instance.schema = self.schemas[instance.consumable_type_id]
+
+        return instance
+
+    def check(self, new, changed):
+        """Check that the product IDs are unique for each type and manufacturer."""
+        rows = [*new, *changed]
+        taken = {
+            (manufacturer_id, type_id, product_id): name
+            for manufacturer_id, type_id, product_id, name in Consumable.objects.filter(
+                product_id__in={instance.product_id for _, instance in rows}
+            ).values_list("manufacturer_id", "consumable_type_id", "product_id", "name")
+        }
+
+        errors = []
+        valid: set[int] = set()
+        for line_num, instance in rows:
+            key = (instance.manufacturer_id, instance.consumable_type_id, instance.product_id)
+            name = taken.setdefault(key, instance.name)
+            if name != instance.name:
+                errors.append(
+                    ImportRowError(
+                        line_num,
+                        [f"product_id: {instance.product_id} is already used by {name}."],
+                    )
+                )
+            else:
+                valid.add(line_num)
+
+        return (
+            [instance for line_num, instance in new if line_num in valid],
+            [instance for line_num, instance in changed if line_num in valid],
+            errors,
+        )
+
+
+class ConsumablePoolImporter(ModelImporter):
+    """
+    Import ConsumablePools, identified by consumable, location and name.
+
+    The rows give the `consumable` and `location` by name or primary key, and the `quantity`.
+    """
+
+    model = ConsumablePool
+    key_fields = ("consumable_id", "location_id", "name")
+    update_fields = ("quantity",)
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE):
+        """Load the Consumables and Locations."""
+        super().__init__(batch_size)
+        self.consumables = ReferenceMap("Consumable", Consumable.objects.all(), ("name",))
+        self.locations = ReferenceMap("Location", Location.objects.all(), ("name", "parent__name"))
+        self.previous_quantities: dict[tuple[Any, ...], int] = {}
+
+    def resolve(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Resolve the references."""
+        return {
+            "consumable_id": self.consumables.resolve(row.get("consumable")),
+            "location_id": self.locations.resolve(row.get("location"), row.get("location_parent")),
+            "name": row.get("name", ""),
+            "quantity": _quantity(row),
+        }
+
+    def existing(self, rows: list[dict[str, Any]]) -> Iterable[models.Model]:
+        """
+        Lock the existing pools that the rows of a batch may update, in a consistent order.
+
+        Like `ConsumablePool.save()`, the pools are locked before their used quantities are
+        checked and their previous quantities are taken for the summaries and ledger, so
+        concurrent checkouts and pool edits wait for the batch to be written.
+        """
+        if not rows:
+            return []
+
+        return super().existing(rows).select_for_update().order_by("pk")
+
+    def build(self, instance: models.Model | None, fields: dict[str, Any]) -> models.Model:
+        """Pools can't be shrunk below their checked out quantity."""
+        if instance is not None and fields["quantity"] < instance.used_quantity:
+            raise ValueError(
+                f"quantity: {fields['quantity']} is less than the {instance.used_quantity} "
+                f"checked out."
+            )
+
+        previous_quantity = None if instance is None else instance.quantity
+        instance = super().build(instance, fields)
+        self.previous_quantities[self.key(instance)] = previous_quantity
+
+        return instance
+
+    def after_write(self, new: list[models.Model], changed: list[models.Model]) -> None:
+        """Update the Location summaries and ledger, and the tab counts, the signals aren't sent."""
+        deltas: SummaryDeltas = {}
+        for instance in [*new, *changed]:
+            previous_quantity = self.previous_quantities[self.key(instance)]
+            key = (instance.consumable_id, instance.location_id)
+            pools, quantity, used_quantity = deltas.get(key, (0, 0, 0))
+            if previous_quantity is None:
+                deltas[key] = (pools + 1, quantity + instance.quantity, used_quantity)
+            else:
+                deltas[key] = (
+                    pools,
+                    quantity + instance.quantity - previous_quantity,
+                    used_quantity,
+                )
+        LocationConsumableSummary.apply(deltas)
+        ConsumableTransaction.record(
+            (
+                ConsumableTransactionKindChoices.KIND_ADJUST,
+                instance.pk,
+                None,
+                instance.quantity - (self.previous_quantities[self.key(instance)] or 0),
+            )
+            for instance in [*new, *changed]
+        )
+        self.previous_quantities = {}
+
+        invalidate_tab_counts(location_pks={instance.location_id for instance in new})
+
+
+class CheckedOutConsumableImporter(ModelImporter):
+    """
+    Import CheckedOutConsumables, identified by pool and device.
+
+    The rows give the `consumable_pool` and `device` by name or primary key, and the `quantity`.
+    Names can be qualified with the `location` and `consumable` columns of the exports.
+    """
+
+    model = CheckedOutConsumable
+    key_fields = ("consumable_pool_id", "device_id")
+    update_fields = ("quantity",)
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE):
+        """Load the ConsumablePools and Devices, with the Locations they must share."""
+        super().__init__(batch_size)
+        self.pools = ReferenceMap(
+            "Consumable pool",
+            ConsumablePool.objects.all(),
+            ("name", "location__name", "consumable__name"),
+        )
+        self.devices = ReferenceMap("Device", Device.objects.all(), ("name", "location__name"))
+        self.pool_locations = dict(ConsumablePool.objects.values_list("pk", "location_id"))
+        self.device_locations: dict[Any, Any] = {}
+        self.locked_pools: dict[Any, ConsumablePool] = {}
+        self.previous_quantities: dict[tuple[Any, ...], int] = {}
+        self.deltas: dict[Any, int] = {}
+
+    def resolve(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Resolve the references."""
+        return {
+            "consumable_pool_id": self.pools.resolve(
+                row.get("consumable_pool"), row.get("location"), row.get("consumable")
+            ),
+            "device_id": self.devices.resolve(row.get("device"), row.get("location")),
+            "quantity": _quantity(row),
+        }
+
+    def existing(self, rows: list[dict[str, Any]]) -> Iterable[models.Model]:
+        """
+        Lock the pools of the rows, then fetch their checkouts and the Locations of the Devices.
+
+        The checkouts are read after the pool rows are locked, like `CheckedOutConsumable.save()`
+        does, so their previous quantities can't be changed by a concurrent edit before the pool
+        counters are adjusted.
+        """
+        self.previous_quantities = {}
+        self.locked_pools = {
+            pool.pk: pool
+            for pool in ConsumablePool.objects.select_for_update()
+            .filter(pk__in={row["consumable_pool_id"] for row in rows})
+            .order_by("pk")
+        }
+        self.device_locations = dict(
+            Device.objects.filter(pk__in={row["device_id"] for row in rows}).values_list(
+                "pk", "location_id"
+            )
+        )
+        if not rows:
+            return []
+
+        return super().existing(rows).select_for_update()
+
+    def build(self, instance: models.Model | None, fields: dict[str, Any]) -> models.Model:
+        """The Device must be in the same Location as the pool."""
+        if self.device_locations.get(fields["device_id"]) != self.pool_locations.get(
+            fields["consumable_pool_id"]
+        ):
+            raise ValueError("Cannot check out consumables from a pool in a different location.")
+
+        previous_quantity = 0 if instance is None else instance.quantity
+        instance = super().build(instance, fields)
+        self.previous_quantities[self.key(instance)] = previous_quantity
+
+        return instance
+
+    def check(self, new, changed):
+        """Check the capacity of each pool with its row locked, in aggregate for the batch."""
+        rows = [*new, *changed]
+        pools = self.locked_pools
+
+        deltas: dict[Any, int] = {}
+        for _, instance in rows:
+            pool_pk = instance.consumable_pool_id
+            delta = instance.quantity - self.previous_quantities[self.key(instance)]
+            deltas[pool_pk] = deltas.get(pool_pk, 0) + delta
+
+        errors = []
+        full = set()
+        for pool_pk, delta in deltas.items():
+            if delta > pools[pool_pk].available_quantity:
+                full.add(pool_pk)
+                message = (
+                    f"Consumable pool {pools[pool_pk].name} does not have enough available "
+                    f"capacity, requesting {delta}, only {pools[pool_pk].available_quantity} "
+                    f"available."
+                )
+                errors.extend(
+                    ImportRowError(line_num, [message])
+                    for line_num, instance in rows
+                    if instance.consumable_pool_id == pool_pk
+                )
+
+        self.deltas = {pk: delta for pk, delta in deltas.items() if pk not in full}
+        return (
+            [instance for _, instance in new if instance.consumable_pool_id not in full],
+            [instance for _, instance in changed if instance.consumable_pool_id not in full],
+            errors,
+        )
+
+    def after_write(self, new: list[models.Model], changed: list[models.Model]) -> None:
+        """Update the pool counters and ledger, and drop the cached Device tab counts."""
+        ConsumablePool.adjust_used_quantity(self.deltas)
+        kinds = ConsumableTransactionKindChoices
+        entries = []
+        for instance in [*new, *changed]:
+            delta = instance.quantity - self.previous_quantities[self.key(instance)]
+            if delta:
+                kind = kinds.KIND_CHECKOUT if delta > 0 else kinds.KIND_RETURN
+                entries.append((kind, instance.consumable_pool_id, instance.device_id, -delta))
+        ConsumableTransaction.record(entries)
+        self.locked_pools = {}
+        invalidate_tab_counts(device_pks={instance.device_id for instance in new})
+
+
+IMPORTERS: dict[str, type[ModelImporter]] = {
+    "consumabletype": ConsumableTypeImporter,
+    "consumable": ConsumableImporter,
+    "consumablepool": ConsumablePoolImporter,
+    "checkedoutconsumable": CheckedOutConsumableImporter,
+}
+
+
+def import_file(
+    model_name: str,
+    lines: Iterable[str],
+    file_format: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    dry_run: bool = False,
+) -> ImportResult:
+    """
+    Import a CSV or JSON Lines file into a Consumables model.
+
+    Each batch is committed on its own. With `dry_run`, every row is checked and written as usual
+    in a single transaction, which is then rolled back, so the result is the same as for a real
+    import.
+    """
+    with transaction.atomic() if dry_run else nullcontext():
+        result = IMPORTERS[model_name](batch_size).import_rows(read_rows(lines, file_format))
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return result
+
+
+def _decode_property(value: Any, property_type: str | None) -> Any:
+    """Decode a CSV `data.<property>` value according to the property type in the schema."""
+    if not isinstance(value, str) or property_type in (None, "string"):
+        return value
+
+    if property_type == "boolean":
+        value = value.lower()
+
+    try:
+        return json.loads(value)
+    except ValueError:
+        # Leave it for the schema validation to report
+        return value
+
+
+def _messages(error: ValueError | ValidationError) -> list[str]:
+    """Get the messages of an error, prefixed with the field names of a ValidationError."""
+    if isinstance(error, ValidationError) and hasattr(error, "error_dict"):
+        return [
+            f"{field}: {message}"
+            for field, messages in error.message_dict.items()
+            for message in messages
+        ]
+    if isinstance(error, ValidationError):
+        return list(error.messages)
+
+    return [str(error)]
+
+
+class TransferResult(NamedTuple):
+    """The outcome of a transfer file."""
+
+    transferred: int
+    targets: int
+    errors: list[ImportRowError]
+
+
+def _read_transfers(
+    lines: Iterable[str], file_format: str
+) -> tuple[list[int], list[PoolTransfer], list[ImportRowError]]:
+    """Resolve the rows of a transfer file, returning their line numbers, transfers and errors."""
+    pools = ReferenceMap(
+        "Consumable pool",
+        ConsumablePool.objects.all(),
+        ("name", "location__name", "consumable__name"),
+    )
+    locations = ReferenceMap("Location", Location.objects.all(), ("name", "parent__name"))
+
+    line_nums: list[int] = []
+    transfers: list[PoolTransfer] = []
+    errors: list[ImportRowError] = []
+    for line_num, row in read_rows(lines, file_format):
+        try:
+            if "__error__" in row:
+                raise ValueError(row["__error__"])
+            source = pools.resolve(
+                row.get("source"), row.get("source_location"), row.get("consumable")
+            )
+            if row.get("target") not in (None, ""):
+                target = pools.resolve(row["target"], row.get("location"), row.get("consumable"))
+                transfer = PoolTransfer(source, _quantity(row), target=target)
+            else:
+                location = locations.resolve(row.get("location"), row.get("location_parent"))
+                transfer = PoolTransfer(
+                    source, _quantity(row), location=location, name=row.get("name")
+                )
+        except ValueError as error:
+            errors.append(ImportRowError(line_num, _messages(error)))
+            continue
+        line_nums.append(line_num)
+        transfers.append(transfer)
+
+    return line_nums, transfers, errors
+
+
+def transfer_file(lines: Iterable[str], file_format: str, dry_run: bool = False) -> TransferResult:
+    """
+    Move Consumables between pools as listed in a CSV or JSON Lines file, in a single transaction.
+
+    Each row gives the `source` pool, qualified with the `source_location` and `consumable`
+    columns, and the `quantity`. The target is either the `target` pool, qualified with the
+    `location` and `consumable` columns, or the pool called `name`, by default the name of the
+    source pool, at `location` (optionally qualified by `location_parent`), which is created if
+    needed. If any row has errors nothing is moved.
+    """
+    line_nums, transfers, errors = _read_transfers(lines, file_format)
+    if errors:
+        return TransferResult(0, 0, errors)
+
+    # The transfers are written in a single transaction by bulk_transfer(), the outer one is only
+    # there for a dry run to roll back
+    with transaction.atomic() if dry_run else nullcontext():
+        try:
+            targets = ConsumablePool.bulk_transfer(transfers)
+        except ValidationError as error:
+            return TransferResult(
+                0,
+                0,
+                [
+                    ImportRowError(line_nums[int(index)], messages)
+                    for index, messages in error.message_dict.items()
+                ],
+            )
+        if dry_run:
+            transaction.set_rollback(True)
+
+    return TransferResult(len(transfers), len({target.pk for target in targets}), [])
@@ -0,0 +1,341 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Jobs for Nautobot Consumables."""
+
+import codecs
+import csv
+from datetime import timedelta
+import io
+
+from django.utils import timezone
+from nautobot.apps.jobs import (
+    ChoiceVar,
+    DryRunVar,
+    FileVar,
+    IntegerVar,
+    Job,
+    ObjectVar,
+    register_jobs,
+)
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import Webhook
+from nautobot.extras.tasks import process_webhook
+
+from nautobot_consumables.data_properties import sync_data_indexes
+from nautobot_consumables.forecast import FORECAST_HALF_LIFE_DAYS, FORECAST_WINDOW_DAYS
+from nautobot_consumables.imports import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    IMPORTERS,
+    import_file,
+    transfer_file,
+)
+from nautobot_consumables.models import (
+    ConsumableBalanceSnapshot,
+    ConsumablePool,
+    ConsumablePoolForecast,
+)
+
+name = "Consumables"  # pylint: disable=invalid-name
+
+# The low stock pools are all in the report file, only the first few are logged
+LOW_STOCK_LOG_LIMIT = 100
+LOW_STOCK_COLUMNS = {
+    "id": "pk",
+    "name": "name",
+    "consumable": "consumable__name",
+    "location": "location__name",
+    "quantity": "quantity",
+    "available_quantity": "available_quantity",
+    "reorder_threshold": "effective_reorder_threshold",
+    "reorder_threshold_unit": "effective_reorder_threshold_unit",
+    "reorder_quantity": "reorder_quantity",
+}
+
+# Snapshots are taken this far in the past, so they include transactions from writes that were
+# still in progress when the Job started
+SNAPSHOT_DELAY = timedelta(hours=1)
+
+
+def can_create_files(job: Job) -> bool:
+    """
+    Check whether a Job can attach report files to its result.
+
+    `Job.create_file()` was added in Nautobot 2.1, on 2.0 the Jobs log their reports instead.
+    """
+    return hasattr(job, "create_file")
+
+
+class ForecastConsumption(Job):
+    """Forecast the burn rate and days until empty of every ConsumablePool."""
+
+    window_days = IntegerVar(
+        default=FORECAST_WINDOW_DAYS,
+        min_value=1,
+        description="How many days of checkouts and returns to forecast from.",
+    )
+    half_life_days = IntegerVar(
+        default=FORECAST_HALF_LIFE_DAYS,
+        min_value=1,
+        description="How many days it takes for the weight of a day's consumption to halve.",
+    )
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Forecast Consumption"
+        description = (
+            "Calculate the burn rate of each ConsumablePool from its recent checkouts and returns, "
+            "and how many days its available quantity lasts. Requires the numpy package. Schedule "
+            "it to run regularly, e.g. daily."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, window_days, half_life_days):  # pylint: disable=W0221
+        """Replace the forecasts of all the pools."""
+        count = ConsumablePoolForecast.refresh(window_days, half_life_days)
+        self.logger.info("Forecast the consumption of %s consumable pools.", count)
+
+
+class ImportConsumables(Job):
+    """Bulk import Consumables inventory from a CSV or JSON Lines file."""
+
+    model = ChoiceVar(
+        choices=[(model, model) for model in IMPORTERS],
+        description="The model to import.",
+    )
+    inventory_file = FileVar(description="The CSV or JSON Lines file to import.")
+    file_format = ChoiceVar(
+        choices=[(file_format, file_format) for file_format in IMPORT_FORMATS],
+        label="Format",
+    )
+    batch_size = IntegerVar(default=IMPORT_BATCH_SIZE, min_value=1)
+    dry_run = DryRunVar(description="Check every row, then roll back instead of saving anything.")
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Import Consumables"
+        description = (
+            "Create or update ConsumableTypes, Consumables, ConsumablePools or "
+            "CheckedOutConsumables from a file, such as the exports of the Consumables lists."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, model, inventory_file, file_format, batch_size, dry_run):  # pylint: disable=W0221
+        """Import the file, then report the rows that could not be imported."""
+        # The uploaded file is read in binary mode, so decode its lines as they're read
+        lines = codecs.iterdecode(inventory_file, "utf-8-sig")
+        result = import_file(model, lines, file_format, batch_size=batch_size, dry_run=dry_run)
+
+        for error in result.errors:
+            self.logger.warning("Row %s: %s", error.row, "; ".join(error.errors))
+
+        # Every error is logged above, the report is only a copy of them
+        if result.errors and can_create_files(self):
+            report = io.StringIO()
+            writer = csv.writer(report)
+            writer.writerow(["row", "errors"])
+            writer.writerows((error.row, "; ".join(error.errors)) for error in result.errors)
+            self.create_file("import_errors.csv", report.getvalue())
+
+        self.logger.info(
+            "%s %s and updated %s %s objects, %s rows had errors.",
+            "Would have created" if dry_run else "Created",
+            result.created,
+            result.updated,
+            model,
+            len(result.errors),
+        )
+
+
+class TransferConsumables(Job):
+    """Move Consumables between ConsumablePools, as listed in a CSV or JSON Lines file."""
+
+    transfers_file = FileVar(description="The CSV or JSON Lines file listing the transfers.")
+    file_format = ChoiceVar(
+        choices=[(file_format, file_format) for file_format in IMPORT_FORMATS],
+        label="Format",
+    )
+    dry_run = DryRunVar(description="Check every row, then roll back instead of saving anything.")
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Transfer Consumables"
+        description = (
+            "Move available quantity from ConsumablePools into other pools, or into new pools at "
+            "other Locations. Every transfer is made in a single transaction, or none are if any "
+            "row has errors."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, transfers_file, file_format, dry_run):  # pylint: disable=W0221
+        """Make the transfers, or report the rows that kept them from being made."""
+        lines = codecs.iterdecode(transfers_file, "utf-8-sig")
+        result = transfer_file(lines, file_format, dry_run=dry_run)
+
+        for error in result.errors:
+            self.logger.warning("Row %s: %s", error.row, "; ".join(error.errors))
+
+        if result.errors:
+            # Every error is logged above, the report is only a copy of them
+            if can_create_files(self):
+                report = io.StringIO()
+                writer = csv.writer(report)
+                writer.writerow(["row", "errors"])
+                writer.writerows((error.row, "; ".join(error.errors)) for error in result.errors)
+                self.create_file("transfer_errors.csv", report.getvalue())
+            self.logger.error("Nothing was transferred, %s rows had errors.", len(result.errors))
+            return
+
+        self.logger.info(
+            "%s %s transfers into %s consumable pools.",
+            "Would have made" if dry_run else "Made",
+            result.transferred,
+            result.targets,
+        )
+
+
+class CheckLowStock(Job):
+    """Report the ConsumablePools whose available quantity is below their reorder threshold."""
+
+    webhook = ObjectVar(
+        model=Webhook,
+        required=False,
+        description="Also send the low stock pools to this Webhook.",
+    )
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Check Low Stock"
+        description = (
+            "Find the ConsumablePools whose available quantity is below the reorder threshold of "
+            "the pool or its Consumable. Schedule it to check the stock regularly."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, webhook=None):  # pylint: disable=W0221
+        """Find the low stock pools with one query, then log, save, and send them."""
+        pools = (
+            ConsumablePool.objects.low_stock()
+            .order_by("location___name", "consumable___name", "_name")
+            .values_list(*LOW_STOCK_COLUMNS.values())
+        )
+        rows = [dict(zip(LOW_STOCK_COLUMNS, row, strict=True)) for row in pools.iterator()]
+        if not rows:
+            self.logger.info("No consumable pools are below their reorder threshold.")
+            return
+
+        # Without a report file, every pool is logged
+        create_file = can_create_files(self)
+        for row in rows[:LOW_STOCK_LOG_LIMIT] if create_file else rows:
+            self.logger.warning(
+                "%s (%s) at %s: %s available, reorder below %s.",
+                row["name"],
+                row["consumable"],
+                row["location"],
+                row["available_quantity"],
+                row["reorder_quantity"],
+            )
+
+        if create_file:
+            report = io.StringIO()
+            writer = csv.DictWriter(report, fieldnames=list(LOW_STOCK_COLUMNS))
+            writer.writeheader()
+            writer.writerows(rows)
+            self.create_file("low_stock.csv", report.getvalue())
+            self.logger.warning(
+                "%s consumable pools are below their reorder threshold, see low_stock.csv.",
+                len(rows),
+            )
+        else:
+            self.logger.warning("%s consumable pools are below their reorder threshold.", len(rows))
+
+        if webhook is not None:
+            # Sent by the Nautobot webhook task, like the change webhooks of the pools
+            process_webhook.apply_async(
+                args=[
+                    webhook.pk,
+                    [{**row, "id": str(row["id"])} for row in rows],
+                    ConsumablePool._meta.model_name,
+                    ObjectChangeActionChoices.ACTION_UPDATE,
+                    timezone.now().isoformat(),
+                    self.user.username,
+                    str(self.job_result.pk),
+                    None,
+                ]
+            )
+            self.logger.info("Queued the low stock pools to be sent to %s.", webhook.name)
+
+
+class SnapshotConsumableBalances(Job):
+    """Snapshot the ledger balances of the ConsumablePools that changed since their last snapshot."""
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Snapshot Consumable Balances"
+        description = (
+            "Record the available quantity of each ConsumablePool with transactions since its last "
+            "snapshot, so past balances are read without replaying the whole ledger. Schedule it "
+            "to run regularly, e.g. daily."
+        )
+        has_sensitive_variables = False
+
+    def run(self):  # pylint: disable=W0221
+        """Take the snapshots."""
+        at = timezone.now() - SNAPSHOT_DELAY
+        count = ConsumableBalanceSnapshot.take(at)
+        self.logger.info("Took %s balance snapshots as of %s.", count, at.isoformat())
+
+
+class SyncDataIndexes(Job):
+    """Create and drop the indexes of the Consumable data properties."""
+
+    class Meta:
+        """Job metadata."""
+
+        name = "Sync Data Indexes"
+        description = (
+            "Create an index for each ConsumableType schema property marked as indexed, and drop "
+            "the indexes of the properties that aren't anymore. The indexes are built "
+            "concurrently, so Consumables can still be changed. Run it after changing which "
+            "properties are indexed."
+        )
+        has_sensitive_variables = False
+
+    def run(self):  # pylint: disable=W0221
+        """Sync the indexes."""
+        created, dropped = sync_data_indexes()
+        for index_name in created:
+            self.logger.info("Created index %s.", index_name)
+        for index_name in dropped:
+            self.logger.info("Dropped index %s.", index_name)
+        self.logger.info("Created %s and dropped %s data indexes.", len(created), len(dropped))
+
+
+jobs = [
+    CheckLowStock,
+    ForecastConsumption,
+    ImportConsumables,
+    SnapshotConsumableBalances,
+    SyncDataIndexes,
+    TransferConsumables,
+]
+register_jobs(*jobs)
@@ -0,0 +1,54 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Append the changes to the available quantities of the ConsumablePools to the ledger."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, models
+from django.utils import timezone
+
+LEDGER_BATCH_SIZE = 1000
+
+# A change to the available quantity of a pool, as (kind, consumable pool pk, device pk, signed
+# quantity)
+LedgerEntry = tuple[str, Any, Any, int]
+
+
+def record_transactions(
+    transaction_model: type[models.Model],
+    entries: Iterable[LedgerEntry],
+    timestamp: datetime | None = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Append the entries to the ledger with one insert per batch, skipping those that are zero."""
+    timestamp = timestamp or timezone.now()
+    transaction_model.objects.using(using).bulk_create(
+        [
+            transaction_model(
+                kind=kind,
+                consumable_pool_id=pool_pk,
+                device_id=device_pk,
+                quantity=quantity,
+                timestamp=timestamp,
+            )
+            for kind, pool_pk, device_pk, quantity in entries
+            if quantity
+        ],
+        batch_size=LEDGER_BATCH_SIZE,
+    )
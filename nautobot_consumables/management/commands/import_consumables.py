@@ -0,0 +1,94 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Bulk import Consumables inventory from CSV or JSON Lines files."""
+
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot_consumables.imports import IMPORT_BATCH_SIZE, IMPORT_FORMATS, IMPORTERS, import_file
+
+
+class Command(BaseCommand):
+    """Publish the command to bulk import Consumables inventory."""
+
+    help = (
+        "Create or update ConsumableTypes, Consumables, ConsumablePools or CheckedOutConsumables "
+        "from a CSV or JSON Lines file, such as the exports of the Consumables lists."
+    )
+
+    def add_arguments(self, parser):
+        """Command-line arguments for the import_consumables command."""
+        parser.add_argument("model", choices=list(IMPORTERS), help="The model to import.")
+        parser.add_argument("path", type=Path, help="The CSV or JSON Lines file to import.")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="The format of the file. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help=f"How many rows to write at once. Defaults to {IMPORT_BATCH_SIZE}.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Check every row, then roll back instead of saving anything.",
+        )
+        parser.add_argument(
+            "--error-report",
+            type=Path,
+            help="Write the rows that could not be imported, and why, to this CSV file.",
+        )
+
+    def handle(self, *args, **options):
+        """Command handler method."""
+        path = options["path"]
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Unknown file format {file_format!r}, use --format.")
+        if options["batch_size"] < 1:
+            raise CommandError("The batch size must be at least 1.")
+
+        with path.open(newline="", encoding="utf-8-sig") as lines:
+            result = import_file(
+                options["model"],
+                lines,
+                file_format,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+
+        if options["error_report"]:
+            with options["error_report"].open("w", newline="", encoding="utf-8") as report:
+                writer = csv.writer(report)
+                writer.writerow(["row", "errors"])
+                writer.writerows((error.row, "; ".join(error.errors)) for error in result.errors)
+        else:
+            for error in result.errors:
+                self.stderr.write(f"Row {error.row}: {'; '.join(error.errors)}")
+
+        prefix = "Dry run: would have " if options["dry_run"] else ""
+        summary = (
+            f"{prefix}created {result.created} and updated {result.updated} "
+            f"{options['model']} objects, {len(result.errors)} rows had errors."
+        )
+        style = self.style.WARNING if result.errors else self.style.SUCCESS
+        self.stdout.write(style(summary[0].upper() + summary[1:]))
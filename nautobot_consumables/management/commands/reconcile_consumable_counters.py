@@ -0,0 +1,84 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Management command to check the stored ConsumablePool counters for drift."""
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from nautobot_consumables.models import ConsumablePool, LocationConsumableSummary
+
+
+class Command(BaseCommand):
+    """Publish the command to reconcile ConsumablePool counters."""
+
+    help = "Compare each ConsumablePool used_quantity with the sum of its checked out consumables."
+
+    def add_arguments(self, parser):
+        """Optional command-line arguments for the reconcile_consumable_counters command."""
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help=(
+                "Overwrite any drifted counters with the recalculated value, and rebuild the "
+                "Location summaries."
+            ),
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='The database to reconcile. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args, **options):
+        """Command handler method."""
+        database = options["database"]
+
+        with transaction.atomic(using=database):
+            drifted = (
+                ConsumablePool.objects.using(database)
+                .select_for_update()
+                .order_by()
+                .with_checked_out_total()
+                .exclude(used_quantity=F("checked_out_total"))
+            )
+
+            count = 0
+            for pool in drifted:
+                count += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{pool} (PK {pool.pk}): stored used_quantity {pool.used_quantity}, "
+                        f"checked out {pool.checked_out_total}"
+                    )
+                )
+                if options["fix"]:
+                    ConsumablePool.objects.using(database).filter(pk=pool.pk).update(
+                        used_quantity=pool.checked_out_total
+                    )
+
+            if options["fix"]:
+                # The Location summaries add up the counters, so rebuild them from the fixed ones
+                LocationConsumableSummary.rebuild(using=database)
+
+        if not count:
+            self.stdout.write(self.style.SUCCESS("All ConsumablePool counters are consistent."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {count} drifted ConsumablePool counters."))
+        else:
+            self.stdout.write(
+                self.style.ERROR(f"Found {count} drifted ConsumablePool counters, use --fix.")
+            )
@@ -0,0 +1,51 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Management command to sync the indexes of the Consumable data properties."""
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from nautobot_consumables.data_properties import sync_data_indexes
+
+
+class Command(BaseCommand):
+    """Publish the command to sync the Consumable data property indexes."""
+
+    help = (
+        "Create an index for each ConsumableType schema property marked as indexed, and drop the "
+        "indexes of the properties that aren't anymore, without blocking writes to Consumables."
+    )
+
+    def add_arguments(self, parser):
+        """Optional command-line arguments for the sync_consumable_data_indexes command."""
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help='The database to sync. Defaults to the "default" database.',
+        )
+
+    def handle(self, *args, **options):
+        """Command handler method."""
+        created, dropped = sync_data_indexes(using=options["database"])
+
+        for name in created:
+            self.stdout.write(f"Created index {name}")
+        for name in dropped:
+            self.stdout.write(f"Dropped index {name}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {len(created)} and dropped {len(dropped)} data indexes.")
+        )
@@ -0,0 +1,39 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Prometheus metrics for the Nautobot Consumables app."""
+
+from collections.abc import Iterator
+
+from prometheus_client.metrics_core import GaugeMetricFamily
+
+from nautobot_consumables.utils import schema_validator_cache_info
+
+
+def metric_schema_validator_cache() -> Iterator[GaugeMetricFamily]:
+    """Report the statistics of this process's JSON schema validator cache."""
+    gauge = GaugeMetricFamily(
+        "nautobot_consumables_schema_validator_cache",
+        "JSON schema validator cache statistics for this process",
+        labels=["statistic"],
+    )
+    for statistic, value in schema_validator_cache_info().items():
+        gauge.add_metric([statistic], value)
+
+    yield gauge
+
+
+metrics = [metric_schema_validator_cache]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:20
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_used_quantity(apps, schema_editor):
+    """Populate the used_quantity counter from the existing checked out consumables."""
+    CheckedOutConsumable = apps.get_model("nautobot_consumables", "CheckedOutConsumable")
+    ConsumablePool = apps.get_model("nautobot_consumables", "ConsumablePool")
+
+    used = (
+        CheckedOutConsumable.objects.filter(consumable_pool=OuterRef("pk"))
+        .order_by()
+        .values("consumable_pool")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    ConsumablePool.objects.using(schema_editor.connection.alias).update(
+        used_quantity=Coalesce(Subquery(used), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_consumables", "0002_alter_models_for_v2"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="consumablepool",
+            name="used_quantity",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="How many Consumables in the pool have been checked out.",
+            ),
+        ),
+        migrations.RunPython(backfill_used_quantity, migrations.RunPython.noop),
+    ]
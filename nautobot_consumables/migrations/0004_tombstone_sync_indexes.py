@@ -0,0 +1,67 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:08
+
+import uuid
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("nautobot_consumables", "0003_consumablepool_used_quantity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                ("deleted", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="checkedoutconsumable",
+            index=models.Index(fields=["last_updated", "id"], name="checkedoutconsumable_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consumable",
+            index=models.Index(fields=["last_updated", "id"], name="consumable_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consumablepool",
+            index=models.Index(fields=["last_updated", "id"], name="consumablepool_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="consumabletype",
+            index=models.Index(fields=["last_updated", "id"], name="consumabletype_sync_idx"),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="content_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="contenttypes.contenttype",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["content_type", "deleted", "id"], name="tombstone_sync_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["deleted"], name="tombstone_deleted_idx"),
+        ),
+    ]
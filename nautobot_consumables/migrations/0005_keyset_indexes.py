@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_consumables", "0004_tombstone_sync_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="checkedoutconsumable",
+            index=models.Index(
+                fields=["consumable_pool", "device"], name="checkedoutconsumable_key_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consumable",
+            index=models.Index(
+                fields=["consumable_type", "_name", "id"], name="consumable_key_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_consumables", "0005_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="checkedoutconsumable",
+            name="consumable_pool",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="checked_out",
+                to="nautobot_consumables.consumablepool",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="checkedoutconsumable",
+            name="device",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="consumables",
+                to="dcim.device",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="consumable",
+            name="consumable_type",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                to="nautobot_consumables.consumabletype",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="consumablepool",
+            name="consumable",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="pools",
+                to="nautobot_consumables.consumable",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="consumablepool",
+            name="location",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="consumable_pools",
+                to="dcim.location",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consumablepool",
+            index=models.Index(
+                fields=["location", "consumable", "name"], name="consumablepool_location_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:28
+
+import uuid
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def populate_summaries(apps, schema_editor):
+    """Build the Location summaries of the existing pools, counting each in every ancestor."""
+    alias = schema_editor.connection.alias
+    Location = apps.get_model("dcim", "Location")
+    ConsumablePool = apps.get_model("nautobot_consumables", "ConsumablePool")
+    LocationConsumableSummary = apps.get_model("nautobot_consumables", "LocationConsumableSummary")
+
+    parents = dict(Location.objects.using(alias).values_list("pk", "parent"))
+    totals = {}
+    for consumable_pk, location_pk, pool_count, quantity, used_quantity in (
+        ConsumablePool.objects.using(alias)
+        .order_by()
+        .values("consumable", "location")
+        .annotate(pools=Count("pk"), total=Sum("quantity"), used=Sum("used_quantity"))
+        .values_list("consumable", "location", "pools", "total", "used")
+    ):
+        node = location_pk
+        while node is not None:
+            total = totals.get((consumable_pk, node), (0, 0, 0))
+            totals[(consumable_pk, node)] = (
+                total[0] + pool_count,
+                total[1] + quantity,
+                total[2] + used_quantity,
+            )
+            node = parents.get(node)
+
+    LocationConsumableSummary.objects.using(alias).bulk_create(
+        [
+            LocationConsumableSummary(
+                consumable_id=consumable_pk,
+                location_id=location_pk,
+                pool_count=pool_count,
+                quantity=quantity,
+                used_quantity=used_quantity,
+            )
+            for (consumable_pk, location_pk), (
+                pool_count,
+                quantity,
+                used_quantity,
+            ) in totals.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0023_interface_redundancy_group_data_migration"),
+        ("nautobot_consumables", "0006_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LocationConsumableSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("pool_count", models.PositiveIntegerField(default=0)),
+                ("quantity", models.PositiveIntegerField(default=0)),
+                ("used_quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "consumable",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="nautobot_consumables.consumable",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="dcim.location",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["location", "consumable"],
+                "unique_together": {("location", "consumable")},
+            },
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_consumables", "0007_location_consumable_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="consumable",
+            name="reorder_threshold",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Alert when the available quantity of a pool drops below this.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumable",
+            name="reorder_threshold_unit",
+            field=models.CharField(
+                choices=[("absolute", "Quantity"), ("percent", "Percent of pool quantity")],
+                default="absolute",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumablepool",
+            name="reorder_threshold",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Alert when the available quantity of a pool drops below this.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="consumablepool",
+            name="reorder_threshold_unit",
+            field=models.CharField(
+                choices=[("absolute", "Quantity"), ("percent", "Percent of pool quantity")],
+                default="absolute",
+                max_length=16,
+            ),
+        ),
+    ]
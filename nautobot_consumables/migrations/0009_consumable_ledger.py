@@ -0,0 +1,150 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:46
+
+import uuid
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def populate_ledger(apps, schema_editor):
+    """
+    Start the ledger of the existing pools from their quantities and checkouts.
+
+    Each pool gets an adjustment for its quantity and a checkout for each of its checked out
+    consumables, dated when they were created, so the ledger balances match the pools.
+    """
+    alias = schema_editor.connection.alias
+    ConsumableTransaction = apps.get_model("nautobot_consumables", "ConsumableTransaction")
+    ConsumablePool = apps.get_model("nautobot_consumables", "ConsumablePool")
+    CheckedOutConsumable = apps.get_model("nautobot_consumables", "CheckedOutConsumable")
+
+    now = django.utils.timezone.now()
+    pools = ConsumablePool.objects.using(alias).values_list("pk", "quantity", "created")
+    checkouts = CheckedOutConsumable.objects.using(alias).values_list(
+        "consumable_pool", "device", "quantity", "created"
+    )
+    ConsumableTransaction.objects.using(alias).bulk_create(
+        [
+            *(
+                ConsumableTransaction(
+                    kind="adjust",
+                    consumable_pool_id=pool_pk,
+                    quantity=quantity,
+                    timestamp=created or now,
+                )
+                for pool_pk, quantity, created in pools.iterator()
+            ),
+            *(
+                ConsumableTransaction(
+                    kind="checkout",
+                    consumable_pool_id=pool_pk,
+                    device_id=device_pk,
+                    quantity=-quantity,
+                    timestamp=created or now,
+                )
+                for pool_pk, device_pk, quantity, created in checkouts.iterator()
+            ),
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0023_interface_redundancy_group_data_migration"),
+        ("nautobot_consumables", "0008_reorder_thresholds"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsumableTransaction",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("checkout", "Checkout"),
+                            ("return", "Return"),
+                            ("adjust", "Adjustment"),
+                            ("transfer", "Transfer"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("quantity", models.IntegerField()),
+                ("timestamp", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "consumable_pool",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transactions",
+                        to="nautobot_consumables.consumablepool",
+                    ),
+                ),
+                (
+                    "device",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="dcim.device",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["consumable_pool", "timestamp"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ConsumableBalanceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                ("balance", models.IntegerField()),
+                (
+                    "consumable_pool",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_snapshots",
+                        to="nautobot_consumables.consumablepool",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["consumable_pool", "timestamp"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="consumabletransaction",
+            index=models.Index(
+                fields=["consumable_pool", "timestamp"], name="consumabletransaction_pool_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="consumablebalancesnapshot",
+            unique_together={("consumable_pool", "timestamp")},
+        ),
+        migrations.RunPython(populate_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:55
+
+import uuid
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_consumables", "0009_consumable_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConsumablePoolForecast",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "burn_rate",
+                    models.FloatField(help_text="How many Consumables are used per day."),
+                ),
+                (
+                    "days_until_empty",
+                    models.FloatField(
+                        blank=True,
+                        help_text="How many days the available quantity lasts at the burn rate.",
+                        null=True,
+                    ),
+                ),
+                ("forecasted", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["consumable_pool"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="consumabletransaction",
+            index=models.Index(fields=["timestamp"], name="consumabletransaction_time_idx"),
+        ),
+        migrations.AddField(
+            model_name="consumablepoolforecast",
+            name="consumable_pool",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="forecast",
+                to="nautobot_consumables.consumablepool",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="consumablepoolforecast",
+            index=models.Index(fields=["days_until_empty"], name="consumableforecast_days_idx"),
+        ),
+    ]
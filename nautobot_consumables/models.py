@@ -16,42 +16,144 @@
 
 """Models for Nautobot Consumables Tracking."""
 
-from typing import Any
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, NamedTuple
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
-from django.db.models import ForeignKey
-from jsonschema import draft4_format_checker  # pylint: disable=no-name-in-module
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import (
+    Case,
+    Exists,
+    F,
+    ForeignKey,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+    Window,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from jsonschema.exceptions import SchemaError
-from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
-from jsonschema.validators import Draft4Validator
+from nautobot.core.models import BaseModel
 from nautobot.core.models.fields import NaturalOrderingField
 from nautobot.core.models.generics import PrimaryModel
+from nautobot.core.models.managers import BaseManager
+from nautobot.core.models.querysets import RestrictedQuerySet
+from nautobot.dcim.models import Device, Location
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import CustomField, TaggedItem
 from nautobot.extras.utils import extras_features
 
+from nautobot_consumables.choices import (
+    ConsumableTransactionKindChoices,
+    ReorderThresholdUnitChoices,
+)
+from nautobot_consumables.forecast import (
+    FORECAST_HALF_LIFE_DAYS,
+    FORECAST_WINDOW_DAYS,
+    forecast_pools,
+)
+from nautobot_consumables.ledger import LEDGER_BATCH_SIZE, LedgerEntry, record_transactions
+from nautobot_consumables.summaries import (
+    SummaryDeltas,
+    apply_summary_deltas,
+    move_summaries,
+    rebuild_summaries,
+)
+from nautobot_consumables.utils import (
+    SchemaDataError,
+    bulk_record_object_changes,
+    delete_related_objects,
+    get_render_plan,
+    get_schema_validator,
+    invalidate_tab_counts,
+    raw_delete,
+)
+
+# The start of the ledger, for the pools without a balance snapshot
+LEDGER_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+# The largest quantity a pool can hold, the limit of its PositiveSmallIntegerField
+MAX_POOL_QUANTITY = 32767
+
+
+class PoolTransfer(NamedTuple):
+    """
+    A move of available Consumables from one ConsumablePool to another.
+
+    The target is either an existing pool, or the pool of the same Consumable at a Location, named
+    `name` or after the source pool, which is created if it doesn't exist.
+    """
 
-def get_key_detail(key: str, value: Any, schema: Any) -> dict[str, Any]:
-    """Get details for model keys."""
-    properties: dict[str, Any] = {"value": value}
+    source: Any
+    quantity: int
+    target: Any = None
+    location: Any = None
+    name: str | None = None
 
-    if title := schema.get("title"):
-        properties["title"] = title
-        if title.lower() == "color":
-            properties["background_color"] = value
-    else:
-        properties["title"] = key
 
-    if schema.get("type") == "array":
-        properties["array"] = True
+def _pk_case(values: dict[Any, int]) -> Case:
+    """Build an expression selecting the value for each pk, for a set-based `update()`."""
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        default=Value(0),
+        output_field=models.IntegerField(),
+    )
+
 
-    if schema.get("enum") and schema.get("options", {}).get("enum_titles"):
-        properties["value"] = schema["options"]["enum_titles"][schema["enum"].index(value)]
+def _transfer_summary_deltas(
+    new_pools: Iterable["ConsumablePool"],
+    updated: dict[Any, "ConsumablePool"],
+    deltas: dict[Any, int],
+) -> SummaryDeltas:
+    """Get the Location summary changes for the pools created and restocked by transfers."""
+    summary_deltas: SummaryDeltas = {}
+    changes = [
+        *((pool, 1, pool.quantity) for pool in new_pools),
+        *((updated[pk], 0, delta) for pk, delta in deltas.items()),
+    ]
+    for pool, pool_count, quantity in changes:
+        key = (pool.consumable_id, pool.location_id)
+        total_count, total_quantity, used = summary_deltas.get(key, (0, 0, 0))
+        summary_deltas[key] = (total_count + pool_count, total_quantity + quantity, used)
 
-    if property_order := schema.get("propertyOrder"):
-        properties["propertyOrder"] = property_order
+    return summary_deltas
 
-    return properties
+
+class ReorderThresholdMixin(models.Model):
+    """The available quantity below which a pool is low on stock and needs to be restocked."""
+
+    reorder_threshold = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text="Alert when the available quantity of a pool drops below this.",
+    )
+    reorder_threshold_unit = models.CharField(
+        max_length=16,
+        choices=ReorderThresholdUnitChoices,
+        default=ReorderThresholdUnitChoices.UNIT_ABSOLUTE,
+    )
+
+    class Meta:
+        """Metaclass attributes."""
+
+        abstract = True
+
+    @property
+    def reorder_threshold_display(self) -> str | None:
+        """The reorder threshold with its unit, e.g. `5` or `10%`."""
+        if self.reorder_threshold is None:
+            return None
+        if self.reorder_threshold_unit == ReorderThresholdUnitChoices.UNIT_PERCENT:
+            return f"{self.reorder_threshold}%"
+
+        return str(self.reorder_threshold)
 
 
 class JSONModel(PrimaryModel):
@@ -68,26 +170,15 @@ class JSONModel(PrimaryModel):
     @property
     def template_details(self) -> list[tuple[str, Any]]:
         """Merge the details and schema for nice output in templates."""
-        details: dict[str, Any] = {}
-        detail_list: list[tuple[str, Any]] = []
-
-        if isinstance(self.schema, dict) and isinstance(self.data, dict):
-            for key, value in self.schema.get("properties", {}).items():
-                details[key] = get_key_detail(key, self.data.get(key), value)
-
-        # Find any properties named "*_unit" and combine their values with the corresponding
-        # property value, e.g. `length = 1` and `length_unit = "ft"` combine to `1 ft`
-        assert isinstance(self.schema, dict)  # noqa: S101
-        for unit_key in [key for key in self.schema.get("properties", {}) if key.endswith("unit")]:
-            prop = unit_key.strip("_unit")
-            if self.schema.get("properties", {}).get(prop):
-                details[prop]["value"] = f"{self.data.get(prop)}{self.data.get(unit_key)}"
-                details.pop(unit_key, None)
+        if not isinstance(self.schema, dict) or not isinstance(self.data, dict):
+            return []
 
-        if details:
-            detail_list = sorted(details.items(), key=lambda x: x[1].get("propertyOrder", 1000))
+        # Templates may read this several times, so keep the plan until the schema is replaced
+        cached = self.__dict__.get("_render_plan")
+        if cached is None or cached[0] is not self.schema:
+            cached = self.__dict__["_render_plan"] = (self.schema, get_render_plan(self.schema))
 
-        return detail_list
+        return [(item.key, item.render(self.data)) for item in cached[1]]
 
     def clean(self):
         """Validate the data."""
@@ -95,17 +186,15 @@ class JSONModel(PrimaryModel):
 
         if self.schema:
             try:
-                Draft4Validator.check_schema(self.schema)
+                validator = get_schema_validator(self.schema)
             except SchemaError as error:
                 path = "']['".join(error.path)
                 raise ValidationError(f"{error.message} on ['{path}']") from error
 
             if self.data:
                 try:
-                    Draft4Validator(self.schema, format_checker=draft4_format_checker).validate(
-                        self.data
-                    )
-                except JSONSchemaValidationError as error:
+                    validator.validate(self.data)
+                except SchemaDataError as error:
                     message = [f"Data validation against schema schema failed: {error.message}"]
                     if error.path:
                         sep = "']['"
@@ -130,20 +219,28 @@ class ConsumableType(JSONModel):
 
         verbose_name = "Consumable Type"
         verbose_name_plural = "Consumable Types"
+        indexes = [
+            models.Index(fields=["last_updated", "id"], name="consumabletype_sync_idx"),
+        ]
 
     def __str__(self) -> str:
         """Default string representation of the ConsumableType."""
         return str(self.name)
 
 
-class Consumable(JSONModel):
+class Consumable(ReorderThresholdMixin, JSONModel):
     """
     A Consumable is a discrete version of a ConsumableType.
 
     For example, for a ConsumableType of `cable`, a Consumable might be `3ft Cat6 Ethernet, Red`.
     """
 
-    consumable_type: ForeignKey = models.ForeignKey(to=ConsumableType, on_delete=models.PROTECT)
+    # Indexed by consumable_key_idx, which leads with consumable_type
+    consumable_type: ForeignKey = models.ForeignKey(
+        to=ConsumableType,
+        on_delete=models.PROTECT,
+        db_index=False,
+    )
 
     name = models.CharField(
         max_length=100,
@@ -173,6 +270,10 @@ class Consumable(JSONModel):
         ordering = ["consumable_type", "_name"]
         verbose_name = "Consumable"
         verbose_name_plural = "Consumables"
+        indexes = [
+            models.Index(fields=["last_updated", "id"], name="consumable_sync_idx"),
+            models.Index(fields=["consumable_type", "_name", "id"], name="consumable_key_idx"),
+        ]
 
     def __str__(self) -> str:
         """Default string representation of the Consumable."""
@@ -203,14 +304,112 @@ class Consumable(JSONModel):
         super().save(*args, **kwargs)
 
 
+class ConsumablePoolQuerySet(RestrictedQuerySet):
+    """QuerySet for ConsumablePool instances with aggregate quantity helpers."""
+
+    def with_usage(self) -> "ConsumablePoolQuerySet":
+        """Annotate the available quantity so it can be sorted and filtered in the database."""
+        return self.annotate(
+            available_quantity=models.ExpressionWrapper(
+                F("quantity") - F("used_quantity"),
+                output_field=models.IntegerField(),
+            )
+        )
+
+    def with_reorder_threshold(self) -> "ConsumablePoolQuerySet":
+        """
+        Annotate the reorder threshold of each pool, falling back to that of its Consumable.
+
+        `reorder_quantity` is the threshold as a quantity, with percentages of the pool quantity
+        rounded up, so a pool is low on stock when its available quantity is below it.
+        """
+        return self.annotate(
+            effective_reorder_threshold=Coalesce(
+                "reorder_threshold", "consumable__reorder_threshold"
+            ),
+            effective_reorder_threshold_unit=Case(
+                When(reorder_threshold__isnull=False, then=F("reorder_threshold_unit")),
+                default=F("consumable__reorder_threshold_unit"),
+            ),
+        ).annotate(
+            reorder_quantity=Case(
+                When(
+                    effective_reorder_threshold_unit=ReorderThresholdUnitChoices.UNIT_PERCENT,
+                    then=(F("quantity") * F("effective_reorder_threshold") + 99) / 100,
+                ),
+                default=F("effective_reorder_threshold"),
+                output_field=models.IntegerField(),
+            )
+        )
+
+    def low_stock(self) -> "ConsumablePoolQuerySet":
+        """Filter to the pools whose available quantity is below their reorder threshold."""
+        return (
+            self.with_usage()
+            .with_reorder_threshold()
+            .filter(available_quantity__lt=F("reorder_quantity"))
+        )
+
+    def with_checked_out_total(self) -> "ConsumablePoolQuerySet":
+        """Annotate the checked out quantity as summed from the CheckedOutConsumables."""
+        checked_out = (
+            CheckedOutConsumable.objects.filter(consumable_pool=OuterRef("pk"))
+            .order_by()
+            .values("consumable_pool")
+            .annotate(total=Sum("quantity"))
+            .values("total")
+        )
+        return self.annotate(checked_out_total=Coalesce(Subquery(checked_out), 0))
+
+    def used_quantity_total(self) -> int:
+        """Get the total quantity checked out from the pools, summed in a single query."""
+        return self.order_by().aggregate(total=Coalesce(Sum("used_quantity"), 0))["total"]
+
+    def with_ledger_balance(self, at: datetime | None = None) -> "ConsumablePoolQuerySet":
+        """
+        Annotate the available quantity of each pool at a point in time, from its ledger.
+
+        `ledger_balance` starts from the latest ConsumableBalanceSnapshot of the pool at or before
+        the time, and adds the ConsumableTransactions since, so only the transactions after the
+        snapshot are read.
+        """
+        at = at or timezone.now()
+        snapshots = ConsumableBalanceSnapshot.objects.filter(
+            consumable_pool=OuterRef("pk"), timestamp__lte=at
+        ).order_by("-timestamp")
+        transactions = (
+            ConsumableTransaction.objects.filter(
+                consumable_pool=OuterRef("pk"),
+                timestamp__gt=OuterRef("ledger_snapshot"),
+                timestamp__lte=at,
+            )
+            .order_by()
+            .values("consumable_pool")
+            .annotate(total=Sum("quantity"))
+            .values("total")
+        )
+        return self.annotate(
+            ledger_snapshot=Coalesce(
+                Subquery(snapshots.values("timestamp")[:1]),
+                Value(LEDGER_EPOCH),
+                output_field=models.DateTimeField(),
+            ),
+        ).annotate(
+            ledger_balance=Coalesce(Subquery(snapshots.values("balance")[:1]), 0)
+            + Coalesce(Subquery(transactions), 0),
+        )
+
+
 @extras_features("custom_fields", "custom_links", "graphql", "relationships")
-class ConsumablePool(PrimaryModel):
+class ConsumablePool(ReorderThresholdMixin, PrimaryModel):
     """A pool of Consumable items available for use at a Location."""
 
+    # Indexed by the unique_together index, which leads with consumable
     consumable: ForeignKey = models.ForeignKey(
         to="Consumable",
         on_delete=models.PROTECT,
         related_name="pools",
+        db_index=False,
     )
 
     name = models.CharField(
@@ -220,14 +419,27 @@ class ConsumablePool(PrimaryModel):
     )
     _name = NaturalOrderingField(target_field="name", max_length=255, blank=True, db_index=True)
 
+    # Indexed by consumablepool_location_idx, which leads with location
     location: ForeignKey = models.ForeignKey(
         to="dcim.Location",
         on_delete=models.PROTECT,
         related_name="consumable_pools",
+        db_index=False,
     )
 
     quantity = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
 
+    used_quantity = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="How many Consumables in the pool have been checked out.",
+    )
+
+    objects = BaseManager.from_queryset(ConsumablePoolQuerySet)()
+
+    # The consumable, location, quantity and used quantity stored before a save, for post_save
+    _stored_pool: tuple[Any, Any, int, int] | None = None
+
     class Meta:
         """ConsumablePool model options."""
 
@@ -235,25 +447,504 @@ class ConsumablePool(PrimaryModel):
         ordering = ["consumable", "location", "name"]
         verbose_name = "Consumable Pool"
         verbose_name_plural = "Consumable Pools"
+        indexes = [
+            models.Index(fields=["last_updated", "id"], name="consumablepool_sync_idx"),
+            models.Index(
+                fields=["location", "consumable", "name"], name="consumablepool_location_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         """Default string representation of the ConsumablePool."""
         return f"{self.name} ({self.location})"
 
-    @property
-    def used_quantity(self) -> int:
-        """Calculate how many Consumable in the pool have been checked out."""
-        used = 0
-        for checked_out in self.checked_out.all():
-            used += checked_out.quantity
-
-        return used
-
     @property
     def available_quantity(self) -> int:
         """Calculate how many Consumable in the pool are available to be checked out."""
+        if (annotated := self.__dict__.get("_available_quantity")) is not None:
+            return int(annotated)
+
         return self.quantity - self.used_quantity
 
+    @available_quantity.setter
+    def available_quantity(self, value: int) -> None:
+        """Store the value annotated by `ConsumablePoolQuerySet.with_usage()`."""
+        self.__dict__["_available_quantity"] = value
+
+    def allocate(self, device, quantity: int) -> "CheckedOutConsumable":
+        """
+        Check out Consumables from the pool to a Device.
+
+        The pool row is locked while the available capacity is checked and the checkout is
+        written, so concurrent allocations cannot oversubscribe the pool. If the Device already has
+        Consumables checked out from the pool, the quantity is added to the existing checkout.
+        """
+        if quantity < 1:
+            raise ValidationError("Quantity to allocate must be at least 1.")
+
+        with transaction.atomic():
+            pool = self.__class__.objects.select_for_update().get(pk=self.pk)
+            checked_out = CheckedOutConsumable.objects.filter(
+                consumable_pool=pool,
+                device=device,
+            ).first() or CheckedOutConsumable(consumable_pool=pool, device=device, quantity=0)
+            checked_out.consumable_pool = pool
+            checked_out.quantity += quantity
+            checked_out.validated_save()
+
+        self.used_quantity = pool.used_quantity
+        self.__dict__.pop("_available_quantity", None)
+
+        return checked_out
+
+    def refresh_from_db(self, *args, **kwargs):
+        """Reload the instance from the database, discarding any stale annotations."""
+        self.__dict__.pop("_available_quantity", None)
+        super().refresh_from_db(*args, **kwargs)
+
+    @classmethod
+    def adjust_used_quantity(cls, deltas: dict[Any, int]) -> None:
+        """Atomically apply checked out quantity changes, keyed by ConsumablePool pk."""
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        cls.objects.filter(pk__in=deltas).update(
+            used_quantity=F("used_quantity") + _pk_case(deltas),
+            # The pools have changed, so they are reported by the delta sync API
+            last_updated=timezone.now(),
+        )
+
+        summary_deltas: SummaryDeltas = {}
+        for pk, consumable_pk, location_pk in cls.objects.filter(pk__in=deltas).values_list(
+            "pk", "consumable_id", "location_id"
+        ):
+            used = summary_deltas.get((consumable_pk, location_pk), (0, 0, 0))[2]
+            summary_deltas[(consumable_pk, location_pk)] = (0, 0, used + deltas[pk])
+        LocationConsumableSummary.apply(summary_deltas)
+
+    @classmethod
+    def bulk_transfer(
+        cls,
+        transfers: list[PoolTransfer],
+        pools: models.QuerySet | None = None,
+        locations: models.QuerySet | None = None,
+    ) -> list["ConsumablePool"]:
+        """
+        Move available Consumables between pools in a single transaction.
+
+        The referenced pools, including the existing pools at the target Locations, are locked up
+        front and the quantities are checked in aggregate for each pool. The existing pools are
+        then updated with a single `update()` and the new pools inserted with a single
+        `bulk_create()`. If any transfer is invalid nothing is changed, and a ValidationError is
+        raised with the errors keyed by the transfer index.
+
+        Returns the target pool of each transfer. The `pools` and `locations` querysets can be
+        restricted to limit which objects may be used.
+        """
+        if pools is None:
+            pools = cls.objects.all()
+        if locations is None:
+            locations = Location.objects.all()
+
+        with transaction.atomic():
+            pool_map, location_pks, targets = cls._lock_transfer_pools(transfers, pools, locations)
+
+            errors: dict[str, list[str]] = {}
+            outflows: dict[Any, list[int]] = {}
+            inflows: dict[Any, list[int]] = {}
+            for index, transfer in enumerate(transfers):
+                row_errors = cls._transfer_errors(
+                    transfer, pool_map, location_pks, targets.get(index)
+                )
+                if row_errors:
+                    errors[str(index)] = row_errors
+                    continue
+
+                outflows.setdefault(transfer.source, []).append(index)
+                inflows.setdefault(targets[index], []).append(index)
+
+            cls._check_transfer_quantities(transfers, pool_map, outflows, inflows, errors)
+            if errors:
+                raise ValidationError(dict(sorted(errors.items(), key=lambda item: int(item[0]))))
+
+            return cls._apply_transfers(transfers, pool_map, targets, inflows)
+
+    @classmethod
+    def _apply_transfers(
+        cls,
+        transfers: list[PoolTransfer],
+        pool_map: dict[Any, "ConsumablePool"],
+        targets: dict[int, Any],
+        inflows: dict[Any, list[int]],
+    ) -> list["ConsumablePool"]:
+        """Write the checked transfers of `bulk_transfer()`, returning the target pools."""
+        new_pools = {
+            target: cls(
+                consumable_id=target[0],
+                location_id=target[1],
+                name=target[2],
+                quantity=sum(transfers[index].quantity for index in indexes),
+            )
+            for target, indexes in inflows.items()
+            if target not in pool_map
+        }
+        cls.objects.bulk_create(new_pools.values())
+
+        deltas: dict[Any, int] = {}
+        for index, transfer in enumerate(transfers):
+            deltas[transfer.source] = deltas.get(transfer.source, 0) - transfer.quantity
+            if targets[index] in pool_map:
+                deltas[targets[index]] = deltas.get(targets[index], 0) + transfer.quantity
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if deltas:
+            cls.objects.filter(pk__in=deltas).update(
+                quantity=F("quantity") + _pk_case(deltas),
+                last_updated=timezone.now(),
+            )
+        updated = {
+            pool.pk: pool for pool in cls.objects.filter(pk__in=deltas).prefetch_related("tags")
+        }
+        result = {**pool_map, **updated, **new_pools}
+        target_pools = [result[targets[index]] for index in range(len(transfers))]
+
+        LocationConsumableSummary.apply(
+            _transfer_summary_deltas(new_pools.values(), updated, deltas)
+        )
+        ConsumableTransaction.record(
+            entry
+            for transfer, target in zip(transfers, target_pools, strict=True)
+            for entry in (
+                (
+                    ConsumableTransactionKindChoices.KIND_TRANSFER,
+                    transfer.source,
+                    None,
+                    -transfer.quantity,
+                ),
+                (
+                    ConsumableTransactionKindChoices.KIND_TRANSFER,
+                    target.pk,
+                    None,
+                    transfer.quantity,
+                ),
+            )
+        )
+        bulk_record_object_changes(new_pools.values())
+        bulk_record_object_changes(updated.values(), ObjectChangeActionChoices.ACTION_UPDATE)
+        invalidate_tab_counts(location_pks={pool.location_id for pool in new_pools.values()})
+
+        return target_pools
+
+    @classmethod
+    def _lock_transfer_pools(
+        cls,
+        transfers: list[PoolTransfer],
+        pools: models.QuerySet,
+        locations: models.QuerySet,
+    ) -> tuple[dict[Any, "ConsumablePool"], set[Any], dict[int, Any]]:
+        """
+        Lock the pools of a bulk transfer, and resolve the target of each transfer.
+
+        Returns the locked pools by pk, the pks of the target Locations, and the target of each
+        transfer by index, as a pool pk or, for a pool still to be created, a (consumable pk,
+        location pk, name) tuple.
+        """
+        sources = {
+            pk: (consumable_pk, name)
+            for pk, consumable_pk, name in pools.filter(
+                pk__in={transfer.source for transfer in transfers}
+            ).values_list("pk", "consumable_id", "name")
+        }
+        location_pks = set(
+            locations.filter(
+                pk__in={transfer.location for transfer in transfers if transfer.location}
+            ).values_list("pk", flat=True)
+        )
+
+        targets: dict[int, Any] = {}
+        for index, transfer in enumerate(transfers):
+            if transfer.target is not None:
+                targets[index] = transfer.target
+            elif transfer.location in location_pks and (source := sources.get(transfer.source)):
+                targets[index] = (source[0], transfer.location, transfer.name or source[1])
+
+        new_targets = {target for target in targets.values() if isinstance(target, tuple)}
+        existing = {}
+        if new_targets:
+            existing = {
+                (consumable_pk, location_pk, name): pk
+                for pk, consumable_pk, location_pk, name in pools.filter(
+                    consumable__in={target[0] for target in new_targets},
+                    location__in={target[1] for target in new_targets},
+                    name__in={target[2] for target in new_targets},
+                ).values_list("pk", "consumable_id", "location_id", "name")
+            }
+        targets = {index: existing.get(target, target) for index, target in targets.items()}
+
+        # Lock the affected pools in a consistent order to avoid deadlocks
+        pool_pks = {*sources, *(t for t in targets.values() if not isinstance(t, tuple))}
+        pool_map = {
+            pool.pk: pool
+            for pool in pools.select_for_update().filter(pk__in=pool_pks).order_by("pk")
+        }
+
+        return pool_map, location_pks, targets
+
+    @classmethod
+    def _transfer_errors(
+        cls,
+        transfer: PoolTransfer,
+        pool_map: dict[Any, "ConsumablePool"],
+        location_pks: set[Any],
+        target: Any,
+    ) -> list[str]:
+        """Check a single bulk transfer row, returning a list of its errors."""
+        errors = []
+        source = pool_map.get(transfer.source)
+        if source is None:
+            errors.append(f"Consumable pool {transfer.source} does not exist.")
+        if transfer.quantity < 1:
+            errors.append("Quantity to transfer must be at least 1.")
+
+        if (transfer.target is None) == (transfer.location is None):
+            errors.append("Transfer to either a target pool or a target location.")
+        elif transfer.target is not None and transfer.target not in pool_map:
+            errors.append(f"Consumable pool {transfer.target} does not exist.")
+        elif transfer.location is not None and transfer.location not in location_pks:
+            errors.append(f"Location {transfer.location} does not exist.")
+        elif source is not None:
+            if target == source.pk:
+                errors.append(f"Cannot transfer from Pool {source.name} to itself.")
+            elif target in pool_map and pool_map[target].consumable_id != source.consumable_id:
+                errors.append(
+                    f"Cannot transfer from Pool {source.name} to Pool {pool_map[target].name} of "
+                    f"a different consumable."
+                )
+            elif isinstance(target, tuple) and len(target[2]) > (
+                max_length := cls._meta.get_field("name").max_length
+            ):
+                errors.append(
+                    f"Name of the new pool cannot be longer than {max_length} characters."
+                )
+
+        return errors
+
+    @staticmethod
+    def _check_transfer_quantities(
+        transfers: list[PoolTransfer],
+        pool_map: dict[Any, "ConsumablePool"],
+        outflows: dict[Any, list[int]],
+        inflows: dict[Any, list[int]],
+        errors: dict[str, list[str]],
+    ) -> None:
+        """Check the totals moved out of and into each pool, adding the errors to `errors`."""
+        moved_out = {
+            pk: sum(transfers[index].quantity for index in indexes)
+            for pk, indexes in outflows.items()
+        }
+        for pk, indexes in outflows.items():
+            pool = pool_map[pk]
+            # Pools keep at least one item, and the checked out items can't be moved
+            movable = max(min(pool.available_quantity, pool.quantity - 1), 0)
+            if moved_out[pk] > movable:
+                for index in indexes:
+                    errors[str(index)] = [
+                        f"Consumable pool {pool.name} does not have enough available quantity, "
+                        f"transferring {moved_out[pk]}, only {movable} can be moved."
+                    ]
+
+        for target, indexes in inflows.items():
+            current = (
+                pool_map[target].quantity - moved_out.get(target, 0) if target in pool_map else 0
+            )
+            total = current + sum(transfers[index].quantity for index in indexes)
+            if total > MAX_POOL_QUANTITY:
+                for index in indexes:
+                    errors[str(index)] = [
+                        f"Transfers would bring the pool to a quantity of {total}, the most a pool "
+                        f"can hold is {MAX_POOL_QUANTITY}."
+                    ]
+
+    # The options are the fields of the bulk edit form
+    @classmethod
+    def bulk_edit(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        cls,
+        pks: Iterable[Any],
+        *,
+        location: Location | None = None,
+        quantity: int | None = None,
+        custom_fields: dict[str, Any] | None = None,
+        add_tags: Iterable[Any] = (),
+        remove_tags: Iterable[Any] = (),
+    ) -> tuple[list["ConsumablePool"], int]:
+        """
+        Change many pools with set-based queries, as a bulk edit does.
+
+        The pools are locked, the checkouts of the pools moving to another `location` are checked
+        back in, and the location and `quantity` are set with a single `update()`. The
+        `quantity` can't be less than the checked out quantity of the pools staying where they
+        are. The `custom_fields` values, None to clear one, are validated once and saved with
+        `bulk_update()`, and the tags are added and removed through their table. The Location
+        summaries, ledgers, tab counts and change log are then updated in bulk, as the signals
+        would for each pool.
+
+        Returns the changed pools, and the quantity that was checked back in.
+        """
+        with transaction.atomic():
+            pools = list(cls.objects.select_for_update().filter(pk__in=list(pks)).order_by("pk"))
+            pool_pks = [pool.pk for pool in pools]
+            moving = [
+                pool for pool in pools if location is not None and pool.location_id != location.pk
+            ]
+            moving_pks = {pool.pk for pool in moving}
+            cls._check_moves(location, moving)
+            cls._check_quantity(quantity, [pool for pool in pools if pool.pk not in moving_pks])
+            cls._validate_custom_fields(custom_fields or {})
+
+            checked_in = CheckedOutConsumable.bulk_check_in(
+                CheckedOutConsumable.objects.filter(consumable_pool__in=moving_pks)
+            )
+            cls._update_pools(pools, location, quantity, custom_fields or {})
+            cls._update_tags(pool_pks, add_tags, remove_tags)
+            cls._record_edits(pools, moving_pks, location, quantity)
+            if moving:
+                invalidate_tab_counts(
+                    location_pks={location.pk, *(pool.location_id for pool in moving)}
+                )
+
+            updated = list(
+                cls.objects.filter(pk__in=pool_pks)
+                .select_related(
+                    "consumable__consumable_type", "consumable__manufacturer", "location"
+                )
+                .prefetch_related("tags")
+            )
+            bulk_record_object_changes(updated, ObjectChangeActionChoices.ACTION_UPDATE)
+
+        return updated, checked_in
+
+    @staticmethod
+    def _check_quantity(quantity: int | None, pools: list["ConsumablePool"]) -> None:
+        """Make sure a bulk edit `quantity` isn't less than the checked out quantity of the pools."""
+        if quantity is None or not pools:
+            return
+
+        used_quantity = max(pool.used_quantity for pool in pools)
+        if quantity < used_quantity:
+            raise ValidationError(
+                {"quantity": f"{quantity} is less than the {used_quantity} checked out."}
+            )
+
+    @classmethod
+    def _update_pools(
+        cls,
+        pools: list["ConsumablePool"],
+        location: Location | None,
+        quantity: int | None,
+        custom_fields: dict[str, Any],
+    ) -> None:
+        """Set the location, quantity and custom fields of the pools of a bulk edit."""
+        fields: dict[str, Any] = {"last_updated": timezone.now()}
+        if location is not None:
+            fields["location"] = location
+        if quantity is not None:
+            fields["quantity"] = quantity
+        cls.objects.filter(pk__in=[pool.pk for pool in pools]).update(**fields)
+        if custom_fields:
+            for pool in pools:
+                pool.cf.update(custom_fields)
+            cls.objects.bulk_update(pools, ["_custom_field_data"], batch_size=1000)
+
+    @classmethod
+    def _update_tags(
+        cls, pool_pks: list[Any], add_tags: Iterable[Any], remove_tags: Iterable[Any]
+    ) -> None:
+        """Add and remove the tags of the pools of a bulk edit through the tags table."""
+        content_type = ContentType.objects.get_for_model(cls)
+        TaggedItem.objects.bulk_create(
+            [
+                TaggedItem(content_type=content_type, object_id=pk, tag=tag)
+                for pk in pool_pks
+                for tag in add_tags
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+        if remove_tags:
+            raw_delete(
+                TaggedItem.objects.filter(
+                    content_type=content_type, object_id__in=pool_pks, tag__in=remove_tags
+                )
+            )
+
+    @staticmethod
+    def _record_edits(
+        pools: list["ConsumablePool"],
+        moving_pks: set[Any],
+        location: Location | None,
+        quantity: int | None,
+    ) -> None:
+        """Update the Location summaries and ledgers for the pools of a bulk edit."""
+        summary_deltas: SummaryDeltas = {}
+        entries: list[LedgerEntry] = []
+        for pool in pools:
+            # The used quantity of the moving pools was taken off their old Location on check in
+            used = 0 if pool.pk in moving_pks else pool.used_quantity
+            new_location_pk = pool.location_id if location is None else location.pk
+            new_quantity = pool.quantity if quantity is None else quantity
+            for key, delta in (
+                ((pool.consumable_id, pool.location_id), (-1, -pool.quantity, -used)),
+                ((pool.consumable_id, new_location_pk), (1, new_quantity, used)),
+            ):
+                total = summary_deltas.get(key, (0, 0, 0))
+                summary_deltas[key] = tuple(map(sum, zip(total, delta, strict=True)))
+            entries.append(
+                (
+                    ConsumableTransactionKindChoices.KIND_ADJUST,
+                    pool.pk,
+                    None,
+                    new_quantity - pool.quantity,
+                )
+            )
+        LocationConsumableSummary.apply(summary_deltas)
+        ConsumableTransaction.record(entries)
+
+    @classmethod
+    def _check_moves(cls, location: Location | None, pools: list["ConsumablePool"]) -> None:
+        """Make sure the pools moving to a Location don't clash with each other or those there."""
+        if location is None or not pools:
+            return
+
+        keys: dict[tuple[Any, str], ConsumablePool] = {}
+        clashes = []
+        for pool in pools:
+            key = (pool.consumable_id, pool.name)
+            if key in keys:
+                clashes.append(pool)
+            keys[key] = pool
+        existing = cls.objects.filter(
+            location=location,
+            consumable__in={key[0] for key in keys},
+            name__in={key[1] for key in keys},
+        ).values_list("consumable_id", "name")
+        clashes.extend(keys[key] for key in existing if key in keys)
+
+        if clashes:
+            raise ValidationError(
+                f"Cannot move Pools {', '.join(sorted({pool.name for pool in clashes}))} to "
+                f"{location}, which already has a pool of the same consumable and name."
+            )
+
+    @classmethod
+    def _validate_custom_fields(cls, custom_fields: dict[str, Any]) -> None:
+        """Validate the custom field values set by a bulk edit, once for all the pools."""
+        for custom_field in CustomField.objects.get_for_model(cls):
+            if custom_field.key in custom_fields:
+                try:
+                    custom_field.validate(custom_fields[custom_field.key])
+                except ValidationError as error:
+                    raise ValidationError({custom_field.key: error.messages}) from error
+
     def clean(self):
         """Validate a ConsumablePool instance."""
         super().clean()
@@ -263,30 +954,64 @@ class ConsumablePool(PrimaryModel):
             if self.consumable != obj.consumable:
                 raise ValidationError("Consumable cannot be changed after creation.")
 
+    def save(self, *args, **kwargs):
+        """Save the ConsumablePool instance, leaving used_quantity to the checkout signals."""
+        with transaction.atomic():
+            # The stored values are used by the post_save signal to drop the cached tab counts and
+            # update the Location summaries, so the row is locked until they have been applied
+            self._stored_pool = None
+            if self.present_in_database:
+                self._stored_pool = (
+                    self.__class__.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("consumable_id", "location_id", "quantity", "used_quantity")
+                    .first()
+                )
+
+            if self.present_in_database and kwargs.get("update_fields") is None:
+                kwargs["update_fields"] = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name != "used_quantity"
+                ]
+
+            super().save(*args, **kwargs)
+
 
 @extras_features("custom_fields", "custom_links", "graphql", "relationships")
 class CheckedOutConsumable(PrimaryModel):
     """ConsumablePool items that have been checked out for use on a device."""
 
+    # Indexed by checkedoutconsumable_key_idx, which leads with consumable_pool
     consumable_pool: ForeignKey = models.ForeignKey(
         to="ConsumablePool",
         on_delete=models.PROTECT,
         related_name="checked_out",
+        db_index=False,
     )
 
+    # Indexed by the unique_together index, which leads with device
     device: ForeignKey = models.ForeignKey(
         to="dcim.Device",
         on_delete=models.PROTECT,
         related_name="consumables",
+        db_index=False,
     )
 
     quantity = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
 
+    # The pool, quantity and device stored before a save, for the post_save signal
+    _stored_checkout: tuple[Any, int, Any] | None = None
+
     class Meta:
         """CheckedOutConsumable model options."""
 
         verbose_name = "Checked Out Consumable"
         verbose_name_plural = "Checked Out Consumables"
+        indexes = [
+            models.Index(fields=["last_updated", "id"], name="checkedoutconsumable_sync_idx"),
+            models.Index(fields=["consumable_pool", "device"], name="checkedoutconsumable_key_idx"),
+        ]
         unique_together = [["device", "consumable_pool"]]
         ordering = ["consumable_pool", "device"]
 
@@ -314,12 +1039,495 @@ class CheckedOutConsumable(PrimaryModel):
             previous_quantity = 0
             if self.present_in_database:
                 obj = self.__class__.objects.get(pk=self.pk)
-                previous_quantity = obj.quantity
+                if obj.consumable_pool_id == self.consumable_pool_id:
+                    previous_quantity = obj.quantity
 
-            # pylint: disable=no-member
-            maximum_quantity = previous_quantity + self.consumable_pool.available_quantity
-            if self.quantity > maximum_quantity:
-                raise ValidationError(
-                    f"Consumable pool does not have enough available capacity, requesting "
-                    f"{self.quantity}, only {maximum_quantity} available."
+            self._validate_capacity(self.consumable_pool, previous_quantity)
+
+    def save(self, *args, **kwargs):
+        """Save the CheckedOutConsumable, checking pool capacity while the pool row is locked."""
+        with transaction.atomic():
+            pools = self._lock_pools()
+
+            previous_quantity = 0
+            if self._stored_checkout and self._stored_checkout[0] == self.consumable_pool_id:
+                previous_quantity = self._stored_checkout[1]
+
+            self._validate_capacity(pools[self.consumable_pool_id], previous_quantity)
+
+            super().save(*args, **kwargs)
+
+    def _lock_pools(self) -> dict[Any, ConsumablePool]:
+        """
+        Lock the pools the checkout is moved between, then lock and read the stored checkout.
+
+        The pools are locked first, in a consistent order to avoid deadlocks, and the stored
+        checkout is read under its own lock afterwards, so concurrent edits of the checkout cannot
+        read the same previous quantity. The stored values are used by the post_save signal to
+        update the pool counters.
+        """
+        pool_pks = {self.consumable_pool_id}
+        while True:
+            if self.present_in_database:
+                pool_pks.update(
+                    self.__class__.objects.filter(pk=self.pk).values_list(
+                        "consumable_pool_id", flat=True
+                    )
+                )
+
+            pools = {
+                pool.pk: pool
+                for pool in ConsumablePool.objects.select_for_update()
+                .filter(pk__in=pool_pks)
+                .order_by("pk")
+            }
+
+            self._stored_checkout = None
+            if self.present_in_database:
+                self._stored_checkout = (
+                    self.__class__.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("consumable_pool_id", "quantity", "device_id")
+                    .first()
+                )
+
+            # Retry if the checkout was moved to another pool before its row was locked
+            if self._stored_checkout is None or self._stored_checkout[0] in pools:
+                return pools
+
+    @classmethod
+    def bulk_allocate(
+        cls,
+        allocations: list[tuple[Any, Any, int]],
+        pools: models.QuerySet | None = None,
+        devices: models.QuerySet | None = None,
+    ) -> list["CheckedOutConsumable"]:
+        """
+        Check out Consumables to many Devices in a single transaction.
+
+        Each allocation is a (consumable_pool pk, device pk, quantity) tuple. The referenced pools
+        are locked and fetched with the devices up front, capacity is checked in aggregate for each
+        pool, and the checkouts are inserted with a single `bulk_create()`. If any allocation is
+        invalid nothing is created, and a ValidationError is raised with the errors keyed by the
+        allocation index.
+
+        The `pools` and `devices` querysets can be restricted to limit which objects may be used.
+        """
+        if pools is None:
+            pools = ConsumablePool.objects.all()
+        if devices is None:
+            devices = Device.objects.all()
+
+        pool_pks = {pool_pk for pool_pk, _, _ in allocations}
+        device_pks = {device_pk for _, device_pk, _ in allocations}
+
+        with transaction.atomic():
+            # Lock the affected pools in a consistent order to avoid deadlocks
+            pool_map = {
+                pool.pk: pool
+                for pool in pools.select_for_update().filter(pk__in=pool_pks).order_by("pk")
+            }
+            device_map = {device.pk: device for device in devices.filter(pk__in=device_pks)}
+            checked_out = set(
+                cls.objects.filter(
+                    consumable_pool_id__in=list(pool_map),
+                    device_id__in=list(device_map),
+                ).values_list("consumable_pool_id", "device_id")
+            )
+
+            errors: dict[str, list[str]] = {}
+            requested: dict[Any, list[int]] = {}
+            instances: list[CheckedOutConsumable] = []
+            for index, (pool_pk, device_pk, quantity) in enumerate(allocations):
+                pool = pool_map.get(pool_pk)
+                device = device_map.get(device_pk)
+                row_errors = cls._allocation_errors(pool_pk, pool, device_pk, device, quantity)
+
+                if not row_errors:
+                    if (pool.pk, device.pk) in checked_out:
+                        row_errors.append(
+                            f"Device {device.name} already has consumables checked out from Pool "
+                            f"{pool.name}."
+                        )
+                    checked_out.add((pool.pk, device.pk))
+
+                if row_errors:
+                    errors[str(index)] = row_errors
+                    continue
+
+                requested.setdefault(pool.pk, []).append(index)
+                instances.append(cls(consumable_pool=pool, device=device, quantity=quantity))
+
+            deltas = {}
+            for pool_pk, indexes in requested.items():
+                pool = pool_map[pool_pk]
+                deltas[pool_pk] = sum(allocations[index][2] for index in indexes)
+                if deltas[pool_pk] > pool.available_quantity:
+                    for index in indexes:
+                        errors[str(index)] = [
+                            f"Consumable pool {pool.name} does not have enough available capacity, "
+                            f"requesting {deltas[pool_pk]}, only {pool.available_quantity} "
+                            f"available."
+                        ]
+
+            if errors:
+                raise ValidationError(dict(sorted(errors.items(), key=lambda item: int(item[0]))))
+
+            cls.objects.bulk_create(instances)
+            ConsumablePool.adjust_used_quantity(deltas)
+            ConsumableTransaction.record(
+                (
+                    ConsumableTransactionKindChoices.KIND_CHECKOUT,
+                    instance.consumable_pool_id,
+                    instance.device_id,
+                    -instance.quantity,
+                )
+                for instance in instances
+            )
+            bulk_record_object_changes(instances)
+            invalidate_tab_counts(device_pks={instance.device_id for instance in instances})
+
+        for pool_pk, delta in deltas.items():
+            pool_map[pool_pk].used_quantity += delta
+
+        return instances
+
+    @classmethod
+    def bulk_check_in(cls, queryset: models.QuerySet) -> int:
+        """
+        Delete CheckedOutConsumables with set-based queries, returning the quantity checked in.
+
+        The checkouts are change logged, and returned to their pools and ledgers, in bulk as the
+        post_delete signals would for each of them, and then deleted with a single query.
+        """
+        checkouts = list(
+            queryset.select_related("consumable_pool", "device").prefetch_related("tags")
+        )
+        if not checkouts:
+            return 0
+
+        deltas: dict[Any, int] = {}
+        for checkout in checkouts:
+            pool_pk = checkout.consumable_pool_id
+            deltas[pool_pk] = deltas.get(pool_pk, 0) - checkout.quantity
+
+        bulk_record_object_changes(checkouts, ObjectChangeActionChoices.ACTION_DELETE)
+        pks = [checkout.pk for checkout in checkouts]
+        delete_related_objects(cls, pks)
+        raw_delete(cls.objects.filter(pk__in=pks))
+        content_type = ContentType.objects.get_for_model(cls)
+        Tombstone.objects.bulk_create(
+            [Tombstone(content_type=content_type, object_id=pk) for pk in pks]
+        )
+
+        ConsumablePool.adjust_used_quantity(deltas)
+        ConsumableTransaction.record(
+            (
+                ConsumableTransactionKindChoices.KIND_RETURN,
+                checkout.consumable_pool_id,
+                checkout.device_id,
+                checkout.quantity,
+            )
+            for checkout in checkouts
+        )
+        invalidate_tab_counts(device_pks={checkout.device_id for checkout in checkouts})
+
+        return -sum(deltas.values())
+
+    @staticmethod
+    def _allocation_errors(pool_pk, pool, device_pk, device, quantity: int) -> list[str]:
+        """Check a single bulk allocation row, returning a list of its errors."""
+        errors = []
+        if pool is None:
+            errors.append(f"Consumable pool {pool_pk} does not exist.")
+        if device is None:
+            errors.append(f"Device {device_pk} does not exist.")
+        if quantity < 1:
+            errors.append("Quantity to allocate must be at least 1.")
+        if pool is not None and device is not None and device.location_id != pool.location_id:
+            errors.append(
+                f"Cannot check out consumables from Pool {pool.name} to Device {device.name} in a "
+                f"different location."
+            )
+
+        return errors
+
+    def _validate_capacity(self, pool: ConsumablePool, previous_quantity: int) -> None:
+        """Make sure the pool has enough available Consumables for the requested quantity."""
+        maximum_quantity = previous_quantity + pool.available_quantity
+        if self.quantity > maximum_quantity:
+            raise ValidationError(
+                f"Consumable pool does not have enough available capacity, requesting "
+                f"{self.quantity}, only {maximum_quantity} available."
+            )
+
+
+class LocationConsumableSummary(BaseModel):
+    """
+    The totals of the ConsumablePools of a Consumable at a Location and all of its descendants.
+
+    The summaries are updated with the changes to the pools and their used quantities, so the
+    totals for a region or site are read from one row instead of recursing through the Locations.
+    """
+
+    location: ForeignKey = models.ForeignKey(
+        to="dcim.Location",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    consumable: ForeignKey = models.ForeignKey(
+        to="Consumable",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    pool_count = models.PositiveIntegerField(default=0)
+    quantity = models.PositiveIntegerField(default=0)
+    used_quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """LocationConsumableSummary model options."""
+
+        unique_together = [["location", "consumable"]]
+        ordering = ["location", "consumable"]
+
+    def __str__(self) -> str:
+        """Default string representation of the LocationConsumableSummary."""
+        return f"{self.consumable} in {self.location}"
+
+    @property
+    def available_quantity(self) -> int:
+        """The quantity available across the pools."""
+        return self.quantity - self.used_quantity
+
+    @classmethod
+    def apply(cls, deltas: SummaryDeltas) -> None:
+        """Apply changes to pools, keyed by (consumable pk, location pk), to the summaries."""
+        apply_summary_deltas(cls, deltas)
+
+    @classmethod
+    def move(
+        cls,
+        location_pk: Any,
+        old_parent_pk: Any,
+        new_parent_pk: Any,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> None:
+        """Move the totals of a re-parented Location between the summaries of its ancestors."""
+        move_summaries(cls, location_pk, old_parent_pk, new_parent_pk, using)
+
+    @classmethod
+    def rebuild(cls, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Recalculate every summary from the ConsumablePools."""
+        rebuild_summaries(cls, ConsumablePool, using)
+
+
+class ConsumableTransactionQuerySet(RestrictedQuerySet):
+    """QuerySet for ConsumableTransaction instances."""
+
+    def with_balance(self) -> "ConsumableTransactionQuerySet":
+        """
+        Annotate the available quantity of the pool after each transaction, as a running total.
+
+        The balance is summed over the transactions in the queryset, so it should only be filtered
+        by pool, or the balances will be missing the transactions filtered out.
+        """
+        return self.annotate(
+            balance=Window(
+                Sum("quantity"),
+                partition_by=[F("consumable_pool")],
+                order_by=[F("timestamp").asc(), F("id").asc()],
+            )
+        )
+
+
+class ConsumableTransaction(BaseModel):
+    """
+    An append-only record of a change to the available quantity of a ConsumablePool.
+
+    Checkouts and transfers out of a pool have negative quantities, and returns and transfers in
+    have positive ones. Adjustments record changes to the pool quantity, starting with the
+    quantity the pool is created with, so the sum of the transactions of a pool is its available
+    quantity.
+    """
+
+    consumable_pool: ForeignKey = models.ForeignKey(
+        to="ConsumablePool",
+        on_delete=models.CASCADE,
+        related_name="transactions",
+        db_index=False,
+    )
+    device: ForeignKey = models.ForeignKey(
+        to="dcim.Device",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    kind = models.CharField(max_length=16, choices=ConsumableTransactionKindChoices)
+    quantity = models.IntegerField()
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    objects = BaseManager.from_queryset(ConsumableTransactionQuerySet)()
+
+    class Meta:
+        """ConsumableTransaction model options."""
+
+        ordering = ["consumable_pool", "timestamp"]
+        indexes = [
+            models.Index(
+                fields=["consumable_pool", "timestamp"], name="consumabletransaction_pool_idx"
+            ),
+            # Reads the recent transactions of every pool for the forecasts
+            models.Index(fields=["timestamp"], name="consumabletransaction_time_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """Default string representation of the ConsumableTransaction."""
+        return f"{self.get_kind_display()} of {self.quantity} at {self.timestamp.isoformat()}"
+
+    def save(self, *args, **kwargs):
+        """Append the transaction to the ledger, existing transactions can't be changed."""
+        if self.present_in_database:
+            raise ValidationError("Consumable transactions cannot be changed.")
+
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Transactions are only deleted with their pool."""
+        raise ValidationError("Consumable transactions cannot be deleted.")
+
+    @classmethod
+    def record(cls, entries: Iterable[LedgerEntry], timestamp: datetime | None = None) -> None:
+        """Append transactions, as (kind, consumable pool pk, device pk, signed quantity)."""
+        record_transactions(cls, entries, timestamp)
+
+
+class ConsumableBalanceSnapshot(BaseModel):
+    """
+    The available quantity of a ConsumablePool at a point in time, summed from its ledger.
+
+    Snapshots are taken periodically, and only for the pools with transactions since their last
+    one, so the balance at any time is read from a snapshot and the transactions after it.
+    """
+
+    consumable_pool: ForeignKey = models.ForeignKey(
+        to="ConsumablePool",
+        on_delete=models.CASCADE,
+        related_name="balance_snapshots",
+    )
+    timestamp = models.DateTimeField()
+    balance = models.IntegerField()
+
+    class Meta:
+        """ConsumableBalanceSnapshot model options."""
+
+        unique_together = [["consumable_pool", "timestamp"]]
+        ordering = ["consumable_pool", "timestamp"]
+
+    def __str__(self) -> str:
+        """Default string representation of the ConsumableBalanceSnapshot."""
+        return f"{self.consumable_pool} balance at {self.timestamp.isoformat()}"
+
+    @classmethod
+    def take(cls, at: datetime | None = None) -> int:
+        """Snapshot the pools with transactions since their last snapshot, returning how many."""
+        at = at or timezone.now()
+        pools = (
+            ConsumablePool.objects.with_ledger_balance(at)
+            .filter(
+                Exists(
+                    ConsumableTransaction.objects.filter(
+                        consumable_pool=OuterRef("pk"),
+                        timestamp__gt=OuterRef("ledger_snapshot"),
+                        timestamp__lte=at,
+                    )
                 )
+            )
+            .order_by()
+            .values_list("pk", "ledger_balance")
+        )
+        snapshots = cls.objects.bulk_create(
+            [
+                cls(consumable_pool_id=pool_pk, timestamp=at, balance=balance)
+                for pool_pk, balance in pools.iterator()
+            ],
+            batch_size=LEDGER_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+        return len(snapshots)
+
+
+class ConsumablePoolForecast(BaseModel):
+    """
+    The forecast consumption of a ConsumablePool, from its recent checkouts and returns.
+
+    The forecasts of all the pools are replaced together by the Forecast Consumption Job.
+    """
+
+    consumable_pool: ForeignKey = models.OneToOneField(
+        to="ConsumablePool",
+        on_delete=models.CASCADE,
+        related_name="forecast",
+    )
+    burn_rate = models.FloatField(help_text="How many Consumables are used per day.")
+    days_until_empty = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="How many days the available quantity lasts at the burn rate.",
+    )
+    forecasted = models.DateTimeField()
+
+    class Meta:
+        """ConsumablePoolForecast model options."""
+
+        ordering = ["consumable_pool"]
+        indexes = [
+            models.Index(fields=["days_until_empty"], name="consumableforecast_days_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """Default string representation of the ConsumablePoolForecast."""
+        return f"{self.consumable_pool} forecast at {self.forecasted.isoformat()}"
+
+    @classmethod
+    def refresh(
+        cls,
+        window_days: int = FORECAST_WINDOW_DAYS,
+        half_life_days: float = FORECAST_HALF_LIFE_DAYS,
+    ) -> int:
+        """Forecast every pool from its consumption in the window, returning how many."""
+        return forecast_pools(cls, window_days, half_life_days)
+
+
+class Tombstone(BaseModel):
+    """
+    A record of a deleted Consumables object, so that the delta sync API can report the deletion.
+
+    Tombstones are created by the post_delete signals, and kept for `tombstone_retention_days`.
+    """
+
+    content_type: ForeignKey = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    object_id = models.UUIDField()
+    deleted = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        """Tombstone model options."""
+
+        indexes = [
+            models.Index(fields=["content_type", "deleted", "id"], name="tombstone_sync_idx"),
+            models.Index(fields=["deleted"], name="tombstone_deleted_idx"),
+        ]
+
+    @classmethod
+    def prune(cls, retention_days: int) -> None:
+        """Delete the Tombstones older than the retention period."""
+        cls.objects.filter(deleted__lt=timezone.now() - timedelta(days=retention_days)).delete()
+
+    def __str__(self) -> str:
+        """Default string representation of the Tombstone."""
+        return f"{self.content_type.model} {self.object_id} deleted {self.deleted.isoformat()}"
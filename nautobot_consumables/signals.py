@@ -19,6 +19,9 @@
 import logging
 from typing import TypedDict
 
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from nautobot.apps.choices import (
     CableTypeChoices,
     ColorChoices,
@@ -26,7 +29,19 @@ from nautobot.apps.choices import (
     PortTypeChoices,
 )
 
-from nautobot_consumables.models import ConsumableType
+from nautobot_consumables.choices import ConsumableTransactionKindChoices
+from nautobot_consumables.data_properties import data_properties_changed
+from nautobot_consumables.ledger import LedgerEntry
+from nautobot_consumables.models import (
+    CheckedOutConsumable,
+    ConsumablePool,
+    ConsumableTransaction,
+    ConsumableType,
+    LocationConsumableSummary,
+    Tombstone,
+)
+from nautobot_consumables.summaries import SummaryDeltas
+from nautobot_consumables.utils import invalidate_tab_counts
 
 logger = logging.getLogger("rq.worker")
 
@@ -107,3 +122,166 @@ def post_migrate_create_defaults(*args, **kwargs):  # pylint: disable=W0613
         defaults={"schema": transceiver_schema},
     )
     ConsumableType.objects.update_or_create(name="Cable", defaults={"schema": cable_schema})
+
+
+def _refresh_pool_usage(instance: CheckedOutConsumable):
+    """Keep an already loaded ConsumablePool in sync with its stored used_quantity."""
+    if CheckedOutConsumable.consumable_pool.is_cached(instance):
+        instance.consumable_pool.refresh_from_db(fields=["used_quantity", "last_updated"])
+
+
+def _checkout_transactions(instance: CheckedOutConsumable, stored) -> list[LedgerEntry]:
+    """Get the ledger entries for a saved checkout, from its stored (pool, quantity, device)."""
+    kinds = ConsumableTransactionKindChoices
+    if stored and stored[0] == instance.consumable_pool_id and stored[2] == instance.device_id:
+        delta = instance.quantity - stored[1]
+        kind = kinds.KIND_CHECKOUT if delta > 0 else kinds.KIND_RETURN
+        return [(kind, instance.consumable_pool_id, instance.device_id, -delta)]
+
+    entries = []
+    if stored:
+        entries.append((kinds.KIND_RETURN, stored[0], stored[2], stored[1]))
+    entries.append(
+        (kinds.KIND_CHECKOUT, instance.consumable_pool_id, instance.device_id, -instance.quantity)
+    )
+
+    return entries
+
+
+def checked_out_consumable_post_save(sender, instance, raw=False, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_save signal -- update the pool used_quantity counters."""
+    if raw:
+        return
+
+    deltas: dict = {}
+    if stored := getattr(instance, "_stored_checkout", None):
+        deltas[stored[0]] = -stored[1]
+    deltas[instance.consumable_pool_id] = deltas.get(instance.consumable_pool_id, 0) + int(
+        instance.quantity
+    )
+
+    ConsumablePool.adjust_used_quantity(deltas)
+    _refresh_pool_usage(instance)
+    ConsumableTransaction.record(_checkout_transactions(instance, stored))
+
+    device_pks = {instance.device_id}
+    if stored:
+        device_pks.add(stored[2])
+    invalidate_tab_counts(device_pks=device_pks)
+
+
+def checked_out_consumable_post_delete(sender, instance, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_delete signal -- return the quantity to the pool."""
+    ConsumablePool.adjust_used_quantity({instance.consumable_pool_id: -instance.quantity})
+    _refresh_pool_usage(instance)
+    ConsumableTransaction.record(
+        [
+            (
+                ConsumableTransactionKindChoices.KIND_RETURN,
+                instance.consumable_pool_id,
+                instance.device_id,
+                instance.quantity,
+            )
+        ]
+    )
+    invalidate_tab_counts(device_pks=[instance.device_id])
+
+
+def consumable_pool_post_save(sender, instance, raw=False, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_save signal -- update the Location summaries and tab counts."""
+    if raw:
+        return
+
+    deltas: SummaryDeltas = {}
+    used_quantity = instance.used_quantity
+    if stored := getattr(instance, "_stored_pool", None):
+        consumable_pk, location_pk, quantity, used_quantity = stored
+        deltas[(consumable_pk, location_pk)] = (-1, -quantity, -used_quantity)
+    key = (instance.consumable_id, instance.location_id)
+    previous = deltas.get(key, (0, 0, 0))
+    deltas[key] = (previous[0] + 1, previous[1] + instance.quantity, previous[2] + used_quantity)
+    LocationConsumableSummary.apply(deltas)
+
+    # Changes to the pool quantity change its available quantity
+    ConsumableTransaction.record(
+        [
+            (
+                ConsumableTransactionKindChoices.KIND_ADJUST,
+                instance.pk,
+                None,
+                instance.quantity - (stored[2] if stored else 0),
+            )
+        ]
+    )
+
+    invalidate_tab_counts(location_pks={instance.location_id, stored[1] if stored else None})
+
+
+def consumable_pool_post_delete(sender, instance, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_delete signal -- update the Location summaries and tab counts."""
+    LocationConsumableSummary.apply(
+        {
+            (instance.consumable_id, instance.location_id): (
+                -1,
+                -instance.quantity,
+                -instance.used_quantity,
+            )
+        }
+    )
+    invalidate_tab_counts(location_pks=[instance.location_id])
+
+
+def location_pre_save(sender, instance, raw=False, **kwargs):  # pylint: disable=W0613
+    """Callback function for pre_save signal -- store the parent of an existing Location."""
+    if raw or not instance.present_in_database:
+        return
+
+    instance._consumables_stored_parent = (  # pylint: disable=protected-access
+        sender.objects.using(instance._state.db)  # pylint: disable=protected-access
+        .filter(pk=instance.pk)
+        .values_list("parent_id", flat=True)
+        .first()
+    )
+
+
+def location_post_save(sender, instance, raw=False, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_save signal -- move the summaries and counts of a Location."""
+    if raw or not hasattr(instance, "_consumables_stored_parent"):
+        return
+
+    stored_parent = instance.__dict__.pop("_consumables_stored_parent")
+    if stored_parent != instance.parent_id:
+        LocationConsumableSummary.move(
+            instance.pk,
+            stored_parent,
+            instance.parent_id,
+            using=instance._state.db,  # pylint: disable=protected-access
+        )
+        invalidate_tab_counts(location_pks={stored_parent, instance.parent_id})
+
+
+def consumable_type_post_save(sender, instance, raw=False, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_save signal -- rebuild the data property filters."""
+    if raw:
+        return
+
+    # The indexes are built by the Sync Data Indexes Job, outside of this transaction
+    data_properties_changed()
+
+
+def consumable_type_post_delete(sender, instance, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_delete signal -- rebuild the data property filters."""
+    data_properties_changed()
+
+
+def record_tombstone(sender, instance, **kwargs):  # pylint: disable=W0613
+    """Callback function for post_delete signal -- record the deletion for the delta sync API."""
+    Tombstone.objects.using(instance._state.db).create(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    )
+
+    # Drop the expired Tombstones at most once an hour
+    if cache.add("nautobot_consumables.tombstones.pruned", True, 3600):
+        config = settings.PLUGINS_CONFIG.get("nautobot_consumables", {})
+        Tombstone.prune(config.get("tombstone_retention_days", 30))
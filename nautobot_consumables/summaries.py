@@ -0,0 +1,170 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Maintain the per-Location rollups of the ConsumablePool quantities."""
+
+from functools import reduce
+from operator import or_
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+
+SUMMARY_BATCH_SIZE = 500
+
+# Changes to the pools of a Consumable at a Location, as (consumable pk, location pk): (pool count,
+# quantity, used quantity)
+SummaryDeltas = dict[tuple[Any, Any], tuple[int, int, int]]
+
+SUMMARY_FIELDS = ("pool_count", "quantity", "used_quantity")
+
+
+def location_ancestors(
+    location_model: type[models.Model], location_pks: set[Any], using: str = DEFAULT_DB_ALIAS
+) -> dict[Any, list[Any]]:
+    """Map each Location to itself and its ancestors, with one query per level of the tree."""
+    parents: dict[Any, Any] = {}
+    pending = set(location_pks)
+    while pending:
+        rows = list(
+            location_model.objects.using(using).filter(pk__in=pending).values_list("pk", "parent")
+        )
+        parents.update(rows)
+        pending = {parent for _, parent in rows if parent is not None and parent not in parents}
+
+    ancestors = {}
+    for location_pk in location_pks:
+        chain, node = [], location_pk
+        while node is not None:
+            chain.append(node)
+            node = parents.get(node)
+        ancestors[location_pk] = chain
+
+    return ancestors
+
+
+def apply_summary_deltas(
+    summary_model: type[models.Model], deltas: SummaryDeltas, using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """
+    Add changes to the pools at some Locations to the summaries of those Locations and ancestors.
+
+    The changes are added in the database, so concurrent changes to the same summaries don't
+    overwrite each other, and the summaries left without any pools are deleted.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+
+    location_model = summary_model._meta.get_field("location").related_model
+    ancestors = location_ancestors(location_model, {location for _, location in deltas}, using)
+    totals: dict[tuple[Any, Any], tuple[int, ...]] = {}
+    for (consumable_pk, location_pk), delta in deltas.items():
+        for ancestor_pk in ancestors[location_pk]:
+            total = totals.get((consumable_pk, ancestor_pk), (0, 0, 0))
+            totals[(consumable_pk, ancestor_pk)] = tuple(map(sum, zip(total, delta, strict=True)))
+
+    # Update the rows in a consistent order to avoid deadlocks
+    keys = sorted(totals, key=lambda key: (str(key[0]), str(key[1])))
+    manager = summary_model.objects.using(using)
+    with transaction.atomic(using=using):
+        manager.bulk_create(
+            [
+                summary_model(consumable_id=consumable, location_id=location)
+                for consumable, location in keys
+            ],
+            batch_size=SUMMARY_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        for start in range(0, len(keys), SUMMARY_BATCH_SIZE):
+            batch = [
+                (Q(consumable_id=consumable, location_id=location), totals[(consumable, location)])
+                for consumable, location in keys[start : start + SUMMARY_BATCH_SIZE]
+            ]
+            manager.filter(reduce(or_, [match for match, _ in batch])).update(
+                **{
+                    field: F(field)
+                    + Case(
+                        *[When(match, then=Value(total[index])) for match, total in batch],
+                        default=Value(0),
+                        output_field=models.IntegerField(),
+                    )
+                    for index, field in enumerate(SUMMARY_FIELDS)
+                }
+            )
+
+        manager.filter(
+            consumable__in={consumable for consumable, _ in keys},
+            location__in={location for _, location in keys},
+            pool_count__lte=0,
+        ).delete()
+
+
+def move_summaries(
+    summary_model: type[models.Model],
+    location_pk: Any,
+    old_parent_pk: Any,
+    new_parent_pk: Any,
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """
+    Move the totals of a re-parented Location from the summaries of its old ancestors to its new.
+
+    The summaries of the Location itself cover the same pools wherever it is in the tree, so they
+    are locked and subtracted from the old parent and its ancestors, then added to the new ones.
+    """
+    if old_parent_pk == new_parent_pk:
+        return
+
+    with transaction.atomic(using=using):
+        deltas: SummaryDeltas = {}
+        for consumable_pk, *totals in (
+            summary_model.objects.using(using)
+            .select_for_update()
+            .filter(location_id=location_pk)
+            .order_by("consumable")
+            .values_list("consumable", *SUMMARY_FIELDS)
+        ):
+            if old_parent_pk is not None:
+                deltas[(consumable_pk, old_parent_pk)] = (-totals[0], -totals[1], -totals[2])
+            if new_parent_pk is not None:
+                deltas[(consumable_pk, new_parent_pk)] = (totals[0], totals[1], totals[2])
+
+        apply_summary_deltas(summary_model, deltas, using)
+
+
+def rebuild_summaries(
+    summary_model: type[models.Model],
+    pool_model: type[models.Model],
+    using: str = DEFAULT_DB_ALIAS,
+) -> None:
+    """Recalculate every summary from the ConsumablePools."""
+    totals = (
+        pool_model.objects.using(using)
+        .order_by()
+        .values("consumable", "location")
+        .annotate(pools=Count("pk"), total=Sum("quantity"), used=Sum("used_quantity"))
+    )
+    with transaction.atomic(using=using):
+        summary_model.objects.using(using).all().delete()
+        apply_summary_deltas(
+            summary_model,
+            {
+                (row["consumable"], row["location"]): (row["pools"], row["total"], row["used"])
+                for row in totals
+            },
+            using,
+        )
@@ -42,6 +42,7 @@ __all__ = [
     "ConsumablePoolTable",
     "ConsumableTable",
     "ConsumableTypeTable",
+    "LocationConsumableSummaryTable",
 ]
 
 
@@ -246,6 +247,16 @@ class ConsumablePoolTable(BaseTable):
     name = tables.Column(linkify=True)
     consumable = tables.Column(linkify=True)
     location = tables.Column(linkify=True)
+    burn_rate = tables.TemplateColumn(
+        accessor=Accessor("forecast__burn_rate"),
+        template_code="{{ value|floatformat:1|default:'&mdash;' }}",
+        verbose_name="Burn Rate (per day)",
+    )
+    days_until_empty = tables.TemplateColumn(
+        accessor=Accessor("forecast__days_until_empty"),
+        template_code="{{ value|floatformat:0|default:'&mdash;' }}",
+        verbose_name="Days Until Empty",
+    )
 
     actions = tables.TemplateColumn(
         template_name="nautobot_consumables/inc/actions/consumablepool.html",
@@ -266,6 +277,8 @@ class ConsumablePoolTable(BaseTable):
             "quantity",
             "available_quantity",
             "used_quantity",
+            "burn_rate",
+            "days_until_empty",
             "actions",
         ]
 
@@ -282,3 +295,29 @@ class ConsumableTypeTable(BaseTable):
 
         model = models.ConsumableType
         fields = ["pk", "name", "actions"]
+
+
+class LocationConsumableSummaryTable(BaseTable):
+    """Table view for the ConsumablePool totals of a Location and its descendants."""
+
+    consumable = tables.Column(linkify=True)
+    consumable_type = tables.Column(
+        accessor=Accessor("consumable__consumable_type"),
+        linkify=True,
+        order_by=("consumable__consumable_type___name",),
+    )
+    pool_count = tables.Column(verbose_name="Pools")
+    available_quantity = tables.Column(orderable=False)
+
+    class Meta(BaseTable.Meta):
+        """LocationConsumableSummaryTable model options."""
+
+        model = models.LocationConsumableSummary
+        fields = [
+            "consumable",
+            "consumable_type",
+            "pool_count",
+            "quantity",
+            "available_quantity",
+            "used_quantity",
+        ]
@@ -19,10 +19,18 @@
 from typing import Any
 from uuid import UUID
 
+from django.db.models import Sum
 from django.urls import reverse
 from nautobot.apps.ui import TemplateExtension
+from nautobot.apps.utils import get_permission_for_model
 
-from nautobot_consumables.models import CheckedOutConsumable, ConsumablePool
+from nautobot_consumables.exports import NON_FILTER_PARAMS
+from nautobot_consumables.models import (
+    CheckedOutConsumable,
+    ConsumablePool,
+    LocationConsumableSummary,
+)
+from nautobot_consumables.utils import cached_tab_count
 
 # pylint: disable=abstract-method
 
@@ -32,31 +40,38 @@ class DeviceConsumablesCount(TemplateExtension):
 
     model = "dcim.device"
     obj_pk: UUID
-    consumables_count: int
-    pools_count: int
+    location_pk: UUID
 
     def __init__(self, context: Any) -> None:
-        """Calculate the number of checked out consumables."""
+        """Store the Device details, the counts are only looked up when the tab is rendered."""
         super().__init__(context)
 
         self.obj_pk = context["object"].pk
-        self.consumables_count = CheckedOutConsumable.objects.filter(device__pk=self.obj_pk).count()
-        self.pools_count = ConsumablePool.objects.filter(
-            location__pk=context["object"].location.pk
-        ).count()
+        self.location_pk = context["object"].location_id
 
     def detail_tabs(self):
         """Add a tab for Consumables to the details page."""
         tabs = []
 
-        if self.consumables_count > 0 or self.pools_count > 0:
+        consumables = CheckedOutConsumable.objects.filter(device__pk=self.obj_pk)
+        pools = ConsumablePool.objects.filter(location__pk=self.location_pk)
+        if self.context["config"].get("tab_badge_counts", True):
+            consumables_count = cached_tab_count("device", self.obj_pk, consumables.count)
+            show_tab = consumables_count > 0 or (
+                cached_tab_count("location_pools", self.location_pk, pools.count) > 0
+            )
+        else:
+            consumables_count = None
+            show_tab = consumables.exists() or pools.exists()
+
+        if show_tab:
             tabs.append(
                 {
                     "title": self.render(
                         "nautobot_consumables/inc/tab_title.html",
                         extra_context={
                             "title": "Consumables",
-                            "item_count": self.consumables_count,
+                            "item_count": consumables_count,
                         },
                     ),
                     "url": reverse(
@@ -74,25 +89,40 @@ class LocationConsumablesCount(TemplateExtension):
 
     model = "dcim.location"
     obj_pk: UUID
-    pools_count: int
 
     def __init__(self, context: Any) -> None:
-        """Calculate the number of child consumables."""
+        """Store the Location details, the count is only looked up when the tab is rendered."""
         super().__init__(context)
 
         self.obj_pk = context["object"].pk
-        self.pools_count = ConsumablePool.objects.filter(location__pk=self.obj_pk).count()
 
     def detail_tabs(self):
-        """Add a tab for Consumables to the details page."""
+        """
+        Add a tab for Consumables to the details page.
+
+        The tab is shown and counts the pools of the Location and its descendants, as summarized
+        by the LocationConsumableSummaries of the Location.
+        """
         tabs = []
 
-        if self.pools_count > 0:
+        summaries = LocationConsumableSummary.objects.filter(location__pk=self.obj_pk)
+        if self.context["config"].get("tab_badge_counts", True):
+            pools_count = cached_tab_count(
+                "location",
+                self.obj_pk,
+                lambda: summaries.aggregate(total=Sum("pool_count"))["total"] or 0,
+            )
+            show_tab = pools_count > 0
+        else:
+            pools_count = None
+            show_tab = summaries.exists()
+
+        if show_tab:
             tabs.append(
                 {
                     "title": self.render(
                         "nautobot_consumables/inc/tab_title.html",
-                        extra_context={"title": "Consumables", "item_count": self.pools_count},
+                        extra_context={"title": "Consumables", "item_count": pools_count},
                     ),
                     "url": reverse(
                         "plugins:nautobot_consumables:location_consumables_tab",
@@ -104,4 +134,52 @@ class LocationConsumablesCount(TemplateExtension):
         return tabs
 
 
-template_extensions = [DeviceConsumablesCount, LocationConsumablesCount]
+class StreamingExportButton(TemplateExtension):
+    """Add a button to stream an export of the filtered objects to a Consumables list view."""
+
+    def list_buttons(self):
+        """Add the export button, keeping the filters applied to the list."""
+        model = self.context["object"]
+        if not self.context["request"].user.has_perm(get_permission_for_model(model, "view")):
+            return ""
+
+        querystring = self.context["request"].GET.copy()
+        for param in NON_FILTER_PARAMS:
+            querystring.pop(param, None)
+
+        return self.render(
+            "nautobot_consumables/inc/export_button.html",
+            extra_context={
+                "export_url": reverse(
+                    f"plugins:nautobot_consumables:{model._meta.model_name}_export"
+                ),
+                "querystring": querystring.urlencode(),
+            },
+        )
+
+
+class CheckedOutConsumableExportButton(StreamingExportButton):
+    """Extend the CheckedOutConsumable list template."""
+
+    model = "nautobot_consumables.checkedoutconsumable"
+
+
+class ConsumableExportButton(StreamingExportButton):
+    """Extend the Consumable list template."""
+
+    model = "nautobot_consumables.consumable"
+
+
+class ConsumablePoolExportButton(StreamingExportButton):
+    """Extend the ConsumablePool list template."""
+
+    model = "nautobot_consumables.consumablepool"
+
+
+template_extensions = [
+    CheckedOutConsumableExportButton,
+    ConsumableExportButton,
+    ConsumablePoolExportButton,
+    DeviceConsumablesCount,
+    LocationConsumablesCount,
+]
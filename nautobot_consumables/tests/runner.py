@@ -34,15 +34,16 @@ class NautobotConsumablesTestRunner(XMLTestRunner):
         self.flush = kwargs.get("flush")
         self.keepdb = kwargs.get("keepdb")
 
-        # Assert "integration" hasn't been provided w/ --tag
+        # Assert "integration" or "scale" haven't been provided w/ --tag
         incoming_tags = kwargs.get("tags") or []
         # Assert "exclude_tags" hasn't been provided w/ --exclude-tag; else default to our own.
         incoming_exclude_tags = kwargs.get("exclude_tags") or []
 
-        # Only include our excluded tags if "integration" isn't provided w/ --tag
-        if "integration" not in incoming_tags:
-            incoming_exclude_tags.append("integration")
-            kwargs["exclude_tags"] = incoming_exclude_tags
+        # Only include our excluded tags if they aren't provided w/ --tag
+        for excluded_tag in ["integration", "scale"]:
+            if excluded_tag not in incoming_tags:
+                incoming_exclude_tags.append(excluded_tag)
+        kwargs["exclude_tags"] = incoming_exclude_tags
 
         super().__init__(**kwargs)
 
@@ -16,11 +16,26 @@
 
 """Test the Nautobot Consumables API endpoints."""
 
+from datetime import timedelta
+from unittest import skipIf
+
 from django.contrib.auth import get_user_model
-from nautobot.core.testing.api import APIViewTestCases
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from nautobot.core.testing.api import APITestCase, APIViewTestCases
 from nautobot.dcim.models import Device, Location, Manufacturer
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import ObjectChange, Tag
+from nautobot.tenancy.models import Tenant
 
-from nautobot_consumables import models
+from nautobot_consumables import forecast, models
+from nautobot_consumables.api.pagination import keyset_fields
+from nautobot_consumables.choices import ConsumableTransactionKindChoices
 
 User = get_user_model()
 
@@ -58,11 +73,115 @@ class CheckedOutConsumableAPITestCase(APIViewTestCases.APIViewTestCase):
         ]
 
 
+class CheckedOutConsumableBulkAllocateAPITestCase(APITestCase):
+    """Test the CheckedOutConsumable bulk allocation API."""
+
+    url = reverse("plugins-api:nautobot_consumables-api:checkedoutconsumable-bulk-allocate")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up data for the tests."""
+        device = Device.objects.first()
+        cls.devices = [
+            device,
+            Device.objects.create(
+                name="Bulk Device",
+                device_type=device.device_type,
+                role=device.role,
+                location=device.location,
+                status=device.status,
+            ),
+        ]
+        cls.pool = models.ConsumablePool.objects.create(
+            name="Bulk Pool",
+            consumable=models.Consumable.objects.get(name="Generic 1"),
+            location=cls.devices[0].location,
+            quantity=10,
+        )
+
+    def setUp(self):
+        """Grant the permissions used by the bulk allocation API."""
+        super().setUp()
+        self.add_permissions(
+            "nautobot_consumables.add_checkedoutconsumable",
+            "nautobot_consumables.view_consumablepool",
+            "dcim.view_device",
+        )
+
+    def test_bulk_allocate(self):
+        """Test allocating to several devices in one request."""
+        data = [
+            {"consumable_pool": self.pool.pk, "device": device.pk, "quantity": 4}
+            for device in self.devices
+        ]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 201)
+        self.assertEqual(
+            [row["device"]["id"] for row in response.data], [d.pk for d in self.devices]
+        )
+        self.pool.refresh_from_db()
+        self.assertEqual(self.pool.used_quantity, 8)
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_id__in=[row["id"] for row in response.data],
+                action=ObjectChangeActionChoices.ACTION_CREATE,
+            ).count(),
+            2,
+        )
+        self.assertEqual(
+            models.CheckedOutConsumable.objects.filter(consumable_pool=self.pool).count(), 2
+        )
+
+    def test_bulk_allocate_over_capacity(self):
+        """Test that nothing is created if a pool would be oversubscribed."""
+        data = [
+            {"consumable_pool": self.pool.pk, "device": device.pk, "quantity": 6}
+            for device in self.devices
+        ]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
+        self.assertEqual(len(response.data), 2)
+        self.assertIn("enough available capacity", str(response.data[0]["non_field_errors"][0]))
+        self.pool.refresh_from_db()
+        self.assertEqual(self.pool.used_quantity, 0)
+        self.assertFalse(
+            models.CheckedOutConsumable.objects.filter(consumable_pool=self.pool).exists()
+        )
+
+    def test_bulk_allocate_row_errors(self):
+        """Test that errors are reported for the invalid rows only."""
+        other_device = Device.objects.exclude(location=self.pool.location).first()
+        data = [
+            {"consumable_pool": self.pool.pk, "device": self.devices[0].pk, "quantity": 1},
+            {"consumable_pool": self.pool.pk, "device": other_device.pk, "quantity": 1},
+            {"consumable_pool": self.pool.pk, "device": self.devices[0].pk, "quantity": 1},
+        ]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("different location", str(response.data[1]["non_field_errors"][0]))
+        self.assertIn("already has consumables", str(response.data[2]["non_field_errors"][0]))
+
+    def test_bulk_allocate_without_permission(self):
+        """Test that pools the user cannot view are reported as missing."""
+        self.user.object_permissions.all().delete()
+        self.add_permissions("nautobot_consumables.add_checkedoutconsumable", "dcim.view_device")
+        data = [{"consumable_pool": self.pool.pk, "device": self.devices[0].pk, "quantity": 1}]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
+        self.assertIn("does not exist", str(response.data[0]["non_field_errors"][0]))
+
+
 class ConsumableAPITestCase(APIViewTestCases.APIViewTestCase):
     """Test the Consumable API."""
 
     model = models.Consumable
     brief_fields = ["display", "id", "name", "url"]
+    choices_fields = ["reorder_threshold_unit"]
 
     @classmethod
     def setUpTestData(cls):
@@ -136,6 +255,7 @@ class ConsumablePoolAPITestCase(APIViewTestCases.APIViewTestCase):
 
     model = models.ConsumablePool
     brief_fields = ["display", "id", "name", "quantity", "url"]
+    choices_fields = ["reorder_threshold_unit"]
 
     @classmethod
     def setUpTestData(cls):
@@ -184,6 +304,105 @@ class ConsumablePoolAPITestCase(APIViewTestCases.APIViewTestCase):
         ]
 
 
+class ConsumablePoolTransferAPITestCase(APITestCase):
+    """Test the ConsumablePool transfer API."""
+
+    url = reverse("plugins-api:nautobot_consumables-api:consumablepool-transfer")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up data for the tests."""
+        # Top level Locations, whose display names are plain ASCII
+        locations = Location.objects.filter(parent__isnull=True)[:3]
+        consumable = models.Consumable.objects.get(name="Generic 1")
+        cls.source, cls.target = (
+            models.ConsumablePool.objects.create(
+                name=f"Transfer {name} Pool",
+                consumable=consumable,
+                location=location,
+                quantity=quantity,
+            )
+            for name, location, quantity in [
+                ("Source", locations[0], 5),
+                ("Target", locations[1], 1),
+            ]
+        )
+        cls.location = locations[2]
+
+    def setUp(self):
+        """Grant the permissions used by the transfer API."""
+        super().setUp()
+        self.add_permissions(
+            "nautobot_consumables.add_consumablepool",
+            "nautobot_consumables.change_consumablepool",
+            "nautobot_consumables.view_consumablepool",
+            "dcim.view_location",
+        )
+
+    def test_transfer(self):
+        """Test transferring into an existing pool and a new one in one request."""
+        data = [
+            {"source": self.source.pk, "quantity": 1, "target": self.target.pk},
+            {"source": self.source.pk, "quantity": 1, "location": self.location.pk, "name": "New"},
+        ]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 200)
+        new_pool = models.ConsumablePool.objects.get(location=self.location, name="New")
+        self.assertEqual(
+            [row["id"] for row in response.data], [str(self.target.pk), str(new_pool.pk)]
+        )
+        self.assertEqual(response.data[0]["quantity"], 2)
+        self.source.refresh_from_db()
+        self.assertEqual(self.source.quantity, 3)
+        self.assertTrue(
+            ObjectChange.objects.filter(
+                changed_object_id=new_pool.pk, action=ObjectChangeActionChoices.ACTION_CREATE
+            ).exists()
+        )
+        self.assertTrue(
+            ObjectChange.objects.filter(
+                changed_object_id=self.source.pk, action=ObjectChangeActionChoices.ACTION_UPDATE
+            ).exists()
+        )
+
+    def test_transfer_row_errors(self):
+        """Test that errors are reported for the invalid rows only, and nothing is changed."""
+        data = [
+            {"source": self.source.pk, "quantity": 1, "target": self.target.pk},
+            {"source": self.source.pk, "quantity": 1, "target": self.source.pk},
+        ]
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("to itself", str(response.data[1]["non_field_errors"][0]))
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.quantity, 1)
+
+        response = self.client.post(
+            self.url, [{"source": self.source.pk, "quantity": 1}], format="json", **self.header
+        )
+        self.assertHttpStatus(response, 400)
+
+    def test_transfer_without_permission(self):
+        """Test that new pools can't be created without the add permission."""
+        self.user.object_permissions.all().delete()
+        self.add_permissions(
+            "nautobot_consumables.change_consumablepool",
+            "nautobot_consumables.view_consumablepool",
+            "dcim.view_location",
+        )
+        response = self.client.post(
+            self.url,
+            [{"source": self.source.pk, "quantity": 1, "location": self.location.pk}],
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, 403)
+        self.assertFalse(models.ConsumablePool.objects.filter(location=self.location).exists())
+
+
 class ConsumableTypeAPITestCase(APIViewTestCases.APIViewTestCase):
     """Test the ConsumableType API."""
 
@@ -202,3 +421,279 @@ class ConsumableTypeAPITestCase(APIViewTestCases.APIViewTestCase):
         models.ConsumableType.objects.create(name="Test Consumable Type 1", schema={})
         models.ConsumableType.objects.create(name="Test Consumable Type 2", schema={})
         models.ConsumableType.objects.create(name="Test Consumable Type 3", schema={})
+
+
+@override_settings(PLUGINS_CONFIG={"nautobot_consumables": {"sync_lag_seconds": 0}})
+class DeltaSyncAPITestCase(APITestCase):
+    """Test the delta sync `changes/` endpoints."""
+
+    url = reverse("plugins-api:nautobot_consumables-api:consumabletype-changes")
+
+    def setUp(self):
+        """Grant the permissions used by the changes endpoint."""
+        super().setUp()
+        self.add_permissions("nautobot_consumables.view_consumabletype")
+
+    def _sync(self, **params) -> dict:
+        response = self.client.get(self.url, params, **self.header)
+        self.assertHttpStatus(response, 200)
+
+        return response.data
+
+    def test_changes(self):
+        """Test a full sync followed by a sync of the changes and deletions since."""
+        full_sync = self._sync()
+        self.assertEqual(len(full_sync["changed"]), models.ConsumableType.objects.count())
+        self.assertEqual(full_sync["deleted"], [])
+        self.assertFalse(full_sync["has_more"])
+
+        changed = models.ConsumableType.objects.create(name="Sync Changed")
+        deleted = models.ConsumableType.objects.create(name="Sync Deleted")
+        deleted_pk = deleted.pk
+        deleted.delete()
+        self.assertTrue(models.Tombstone.objects.filter(object_id=deleted_pk).exists())
+
+        delta = self._sync(cursor=full_sync["next_cursor"])
+        self.assertEqual([str(row["id"]) for row in delta["changed"]], [str(changed.pk)])
+        self.assertEqual([str(row["id"]) for row in delta["deleted"]], [str(deleted_pk)])
+
+        delta = self._sync(cursor=delta["next_cursor"])
+        self.assertEqual((delta["changed"], delta["deleted"]), ([], []))
+
+    def test_changes_pagination(self):
+        """Test that the changes are read in pages of `limit` objects."""
+        expected = {str(pk) for pk in models.ConsumableType.objects.values_list("pk", flat=True)}
+        pages, synced, params = 0, set(), {"limit": 1}
+        while True:
+            page = self._sync(**params)
+            synced.update(str(row["id"]) for row in page["changed"])
+            params["cursor"] = page["next_cursor"]
+            pages += 1
+            if not page["has_more"]:
+                break
+
+        self.assertEqual(synced, expected)
+        self.assertGreaterEqual(pages, len(expected))
+
+    def test_changes_since(self):
+        """Test the changed_since parameter and the errors for positions that can't be used."""
+        since = timezone.now()
+        changed = models.ConsumableType.objects.create(name="Sync Since")
+        delta = self._sync(changed_since=since.isoformat())
+        self.assertEqual([str(row["id"]) for row in delta["changed"]], [str(changed.pk)])
+
+        response = self.client.get(self.url, {"cursor": "not a cursor"}, **self.header)
+        self.assertHttpStatus(response, 400)
+
+        expired = (since - timedelta(days=31)).isoformat()
+        response = self.client.get(self.url, {"changed_since": expired}, **self.header)
+        self.assertHttpStatus(response, 410)
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_consumables": {"sync_lag_seconds": 60}})
+    def test_changes_late_commit(self):
+        """Test that a change committed after a sync read past its timestamp is still synced."""
+        now = timezone.now()
+        models.ConsumableType.objects.update(last_updated=now - timedelta(days=1))
+        full_sync = self._sync()
+        self.assertEqual(len(full_sync["changed"]), models.ConsumableType.objects.count())
+
+        visible = models.ConsumableType.objects.create(name="Sync Visible")
+        models.ConsumableType.objects.filter(pk=visible.pk).update(
+            last_updated=now - timedelta(seconds=10)
+        )
+        delta = self._sync(cursor=full_sync["next_cursor"])
+        self.assertEqual(delta["changed"], [])
+
+        # Committed after the last sync, with a timestamp from before the visible change
+        late = models.ConsumableType.objects.create(name="Sync Late")
+        models.ConsumableType.objects.filter(pk=late.pk).update(
+            last_updated=now - timedelta(seconds=20)
+        )
+        models.ConsumableType.objects.filter(pk__in=[visible.pk, late.pk]).update(
+            last_updated=F("last_updated") - timedelta(minutes=2)
+        )
+        delta = self._sync(cursor=delta["next_cursor"])
+        self.assertEqual(
+            [str(row["id"]) for row in delta["changed"]], [str(late.pk), str(visible.pk)]
+        )
+
+
+@skipIf(forecast.np is None, "numpy is not installed")
+class ConsumablePoolForecastAPITestCase(APITestCase):
+    """Test the consumption forecasts endpoint."""
+
+    def test_forecasts(self):
+        """Test that the pools that run out soonest are listed first, with the filters applied."""
+        self.add_permissions("nautobot_consumables.view_consumablepool")
+        pools = list(models.ConsumablePool.objects.order_by("pk")[:3])
+        for pool, quantity in zip(pools, [-1, -pools[1].quantity, -2], strict=True):
+            models.ConsumableTransaction.record(
+                [(ConsumableTransactionKindChoices.KIND_CHECKOUT, pool.pk, None, quantity)],
+                timezone.now() - timedelta(days=1),
+            )
+        models.ConsumablePoolForecast.refresh()
+
+        url = reverse("plugins-api:nautobot_consumables-api:consumablepool-forecasts")
+        response = self.client.get(url, {"limit": 2}, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], models.ConsumablePool.objects.count())
+        first = response.data["results"][0]
+        self.assertEqual(first["id"], str(pools[1].pk))
+        self.assertEqual(
+            first["days_until_empty"],
+            pools[1].forecast.days_until_empty,
+        )
+
+        response = self.client.get(url, {"location": pools[0].location.pk}, **self.header)
+        self.assertEqual(
+            {row["id"] for row in response.data["results"]},
+            {
+                str(pk)
+                for pk in models.ConsumablePool.objects.filter(
+                    location=pools[0].location
+                ).values_list("pk", flat=True)
+            },
+        )
+
+
+class KeysetPaginationAPITestCase(APITestCase):
+    """Test paginating the API list endpoints by cursor."""
+
+    def setUp(self):
+        """Grant the permissions used by the list endpoints."""
+        super().setUp()
+        self.add_permissions(
+            "nautobot_consumables.view_checkedoutconsumable",
+            "nautobot_consumables.view_consumable",
+            "nautobot_consumables.view_consumablepool",
+        )
+
+    def _crawl(self, model_name: str, **params) -> list[str]:
+        url = reverse(f"plugins-api:nautobot_consumables-api:{model_name}-list")
+        response = self.client.get(url, {"cursor": "", "limit": 2, **params}, **self.header)
+        crawled = []
+        while True:
+            self.assertHttpStatus(response, 200)
+            self.assertNotIn("count", response.data)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            crawled.extend(str(row["id"]) for row in response.data["results"])
+            if response.data["next"] is None:
+                return crawled
+            response = self.client.get(response.data["next"], **self.header)
+
+    def test_crawl(self):
+        """Test that a crawl returns every object once, in the keyset order."""
+        for model in (models.CheckedOutConsumable, models.Consumable, models.ConsumablePool):
+            with self.subTest(model=model._meta.model_name):
+                fields = keyset_fields(model)
+                expected = [
+                    str(pk) for pk in model.objects.order_by(*fields).values_list("pk", flat=True)
+                ]
+                self.assertGreater(len(expected), 2)
+                self.assertEqual(self._crawl(model._meta.model_name), expected)
+
+    def test_crawl_filtered(self):
+        """Test that the list filters apply to each page."""
+        consumable_type = models.ConsumableType.objects.get(name="Transceiver")
+        expected = models.Consumable.objects.filter(consumable_type=consumable_type)
+        self.assertEqual(
+            sorted(self._crawl("consumable", consumable_type=consumable_type.pk)),
+            sorted(str(pk) for pk in expected.values_list("pk", flat=True)),
+        )
+
+    def test_invalid_cursor(self):
+        """Test that an invalid cursor is rejected."""
+        url = reverse("plugins-api:nautobot_consumables-api:consumable-list")
+        response = self.client.get(url, {"cursor": "not a cursor"}, **self.header)
+        self.assertHttpStatus(response, 400)
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["count"], models.Consumable.objects.count())
+
+
+class APIListQueryCountTestCase(APITestCase):
+    """Test that the API list endpoints use a fixed number of queries."""
+
+    scale = 100
+
+    def setUp(self):
+        """Grant the permissions used by the list endpoints."""
+        super().setUp()
+        self.add_permissions(
+            "nautobot_consumables.view_checkedoutconsumable",
+            "nautobot_consumables.view_consumable",
+            "nautobot_consumables.view_consumablepool",
+            "nautobot_consumables.view_consumabletype",
+        )
+
+    def _list_query_count(self, model_name: str) -> int:
+        url = reverse(f"plugins-api:nautobot_consumables-api:{model_name}-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{url}?limit=1000", **self.header)
+        self.assertHttpStatus(response, 200)
+
+        return len(queries)
+
+    def _scale_up_fixtures(self):
+        """Add tagged copies of the create_env fixtures."""
+        tag = Tag.objects.create(name="Query Count")
+        tag.content_types.add(
+            *ContentType.objects.get_for_models(
+                models.CheckedOutConsumable,
+                models.Consumable,
+                models.ConsumablePool,
+                models.ConsumableType,
+            ).values()
+        )
+        tenant = Tenant.objects.first()
+        devices = list(Device.objects.all())
+        manufacturers = list(Manufacturer.objects.all())
+
+        for num in range(self.scale):
+            consumable_type = models.ConsumableType.objects.create(name=f"Query Count Type {num}")
+            consumable = models.Consumable.objects.create(
+                name=f"Query Count Consumable {num}",
+                consumable_type=consumable_type,
+                manufacturer=manufacturers[num % len(manufacturers)],
+                product_id=f"query_count_{num:03}",
+            )
+            template = devices[num % len(devices)]
+            pool = models.ConsumablePool.objects.create(
+                name=f"Query Count Pool {num}",
+                consumable=consumable,
+                location=template.location,
+                quantity=10,
+            )
+            device = Device.objects.create(
+                name=f"Query Count Device {num}",
+                device_type=template.device_type,
+                role=template.role,
+                location=template.location,
+                status=template.status,
+                tenant=tenant,
+            )
+            checked_out = models.CheckedOutConsumable.objects.create(
+                consumable_pool=pool,
+                device=device,
+                quantity=1,
+            )
+            for instance in [consumable_type, consumable, pool, checked_out]:
+                instance.tags.add(tag)
+
+    def test_list_query_count(self):
+        """Test that the list query counts do not grow with the number of objects."""
+        model_names = ["checkedoutconsumable", "consumable", "consumablepool", "consumabletype"]
+
+        # Warm up any per-process caches before taking the baseline counts
+        for model_name in model_names:
+            self._list_query_count(model_name)
+        baseline = {model_name: self._list_query_count(model_name) for model_name in model_names}
+
+        self._scale_up_fixtures()
+        # The new ConsumableTypes make the next request rebuild the data property filters, once
+        for model_name in model_names:
+            self._list_query_count(model_name)
+        for model_name in model_names:
+            with self.subTest(model_name=model_name):
+                self.assertEqual(self._list_query_count(model_name), baseline[model_name])
@@ -16,9 +16,21 @@
 
 """Tests for filters defined in the Nautobot Consumables app."""
 
-from nautobot.core.testing import FilterTestCases
+from io import StringIO
+from unittest import skipUnless
 
-from nautobot_consumables import filters, models
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.test import TestCase
+from nautobot.core.testing import FilterTestCases, TransactionTestCase
+
+from nautobot_consumables import filters, forms, models
+from nautobot_consumables.data_properties import (
+    DATA_INDEX_PREFIX,
+    data_index_name,
+    sync_data_indexes,
+)
 
 
 class CheckedOutConsumableFilterSetTestCase(FilterTestCases.FilterTestCase):
@@ -135,6 +147,141 @@ class ConsumableFilterSetTestCase(FilterTestCases.FilterTestCase):
         self.skipTest("Test data has no tags.")
 
 
+class ConsumableDataFilterTestCase(TestCase):
+    """Tests for the filters on indexed ConsumableType schema properties."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a ConsumableType with indexed properties."""
+        cls.consumable_type = models.ConsumableType.objects.create(
+            name="Optic",
+            schema={
+                "type": "object",
+                "properties": {
+                    "form_factor": {
+                        "type": "string",
+                        "enum": ["qsfp28", "sfp28"],
+                        "options": {"enum_titles": ["QSFP28", "SFP28"]},
+                        "indexed": True,
+                    },
+                    "reach_km": {"type": "integer", "indexed": True},
+                    "notes": {"type": "string"},
+                },
+            },
+        )
+        for num, (form_factor, reach) in enumerate(
+            [("qsfp28", 10), ("qsfp28", 2), ("sfp28", 10), ("sfp28", 40)]
+        ):
+            models.Consumable.objects.create(
+                name=f"Optic {num}",
+                consumable_type=cls.consumable_type,
+                product_id=f"optic_{num}",
+                data={"form_factor": form_factor, "reach_km": reach, "notes": f"Spare {reach}km"},
+            )
+        cls.queryset = models.Consumable.objects.filter(consumable_type=cls.consumable_type)
+
+    def test_filters(self):
+        """Test filtering on the schema properties."""
+        filterset = filters.ConsumableFilterSet
+        self.assertEqual(filterset({"data__form_factor": ["qsfp28"]}, self.queryset).qs.count(), 2)
+        self.assertEqual(filterset({"data__reach_km": [10, 40]}, self.queryset).qs.count(), 3)
+        self.assertEqual(
+            filterset({"data__form_factor": ["sfp28"], "data__reach_km": [10]}, self.queryset)
+            .qs.get()
+            .name,
+            "Optic 2",
+        )
+        self.assertIn("data__form_factor", forms.ConsumableFilterForm().fields)
+
+    def test_lookup_filters(self):
+        """Test the range, partial match and negated filters on the schema properties."""
+        filterset = filters.ConsumableFilterSet
+        self.assertEqual(filterset({"data__reach_km__gte": [10]}, self.queryset).qs.count(), 3)
+        self.assertEqual(filterset({"data__reach_km__lte": [2]}, self.queryset).qs.count(), 1)
+        self.assertEqual(filterset({"data__notes__ic": ["SPARE 10"]}, self.queryset).qs.count(), 2)
+        self.assertEqual(filterset({"data__notes__nic": ["10km"]}, self.queryset).qs.count(), 2)
+        self.assertEqual(
+            filterset({"data__form_factor__n": ["sfp28"]}, self.queryset).qs.count(), 2
+        )
+
+        fields = forms.ConsumableFilterForm().fields
+        for name in ["data__reach_km__gte", "data__reach_km__lte", "data__notes__ic"]:
+            self.assertIn(name, fields)
+
+    def test_filters_rebuilt(self):
+        """Test that the filters are rebuilt when a ConsumableType schema changes."""
+        self.assertNotIn("data__vendor_part", filters.ConsumableFilterSet().filters)
+
+        self.consumable_type.schema["properties"]["vendor_part"] = {"type": "string"}
+        self.consumable_type.save()
+        self.assertIn("data__vendor_part__ic", filters.ConsumableFilterSet().filters)
+
+
+@skipUnless(connection.vendor == "postgresql", "Data indexes are only created on PostgreSQL")
+class ConsumableDataIndexTestCase(TransactionTestCase):
+    """Tests for the indexes on the ConsumableType schema properties."""
+
+    def setUp(self):
+        """Set up a ConsumableType with indexed properties, and drop its indexes afterwards."""
+        super().setUp()
+        self.consumable_type = models.ConsumableType.objects.create(
+            name="Indexed Optic",
+            schema={
+                "type": "object",
+                "properties": {
+                    "form_factor": {"type": "string", "indexed": True},
+                    "reach_km": {"type": "integer", "indexed": True},
+                },
+            },
+        )
+        models.Consumable.objects.create(
+            name="Indexed Optic",
+            consumable_type=self.consumable_type,
+            product_id="indexed_optic",
+            data={"form_factor": "qsfp28", "reach_km": 10},
+        )
+        self.addCleanup(call_command, "sync_consumable_data_indexes", stdout=StringIO())
+        self.addCleanup(models.ConsumableType.objects.filter(pk=self.consumable_type.pk).delete)
+        self.addCleanup(models.Consumable.objects.filter(name="Indexed Optic").delete)
+
+    def _data_indexes(self) -> list[str]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE indexname LIKE %s ORDER BY indexname",
+                [f"{DATA_INDEX_PREFIX}%"],
+            )
+            return [name for (name,) in cursor.fetchall()]
+
+    def test_indexes(self):
+        """Test that the indexed properties are looked up with the indexes built by the command."""
+        self.assertEqual(self._data_indexes(), [])
+
+        out = StringIO()
+        call_command("sync_consumable_data_indexes", stdout=out)
+        self.assertIn("Created 2 and dropped 0 data indexes.", out.getvalue())
+        self.assertEqual(
+            self._data_indexes(),
+            sorted([data_index_name("form_factor"), data_index_name("reach_km")]),
+        )
+
+        queryset = filters.ConsumableFilterSet({"data__form_factor": ["qsfp28"]}).qs.order_by()
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            self.assertIn(data_index_name("form_factor"), queryset.explain())
+
+        self.consumable_type.schema["properties"]["form_factor"].pop("indexed")
+        self.consumable_type.save()
+        self.assertEqual(len(self._data_indexes()), 2)
+
+        call_command("sync_consumable_data_indexes", stdout=out)
+        self.assertEqual(self._data_indexes(), [data_index_name("reach_km")])
+
+    def test_transaction(self):
+        """Test that the indexes aren't built inside a transaction, which would block writes."""
+        with self.assertRaises(TransactionManagementError), transaction.atomic():
+            sync_data_indexes()
+
+
 class ConsumablePoolFilterSetTestCase(FilterTestCases.FilterTestCase):
     """Tests for the ConsumablePoolFilterSet."""
 
@@ -180,6 +327,19 @@ class ConsumablePoolFilterSetTestCase(FilterTestCases.FilterTestCase):
             params = {"quantity__gte": [130]}
             self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
 
+    def test_low_stock(self):
+        """Test filtering on whether the pools are below their reorder threshold."""
+        pool = models.ConsumablePool.objects.get(name="Cable 1 Pool 1")
+        pool.reorder_threshold = pool.quantity - pool.used_quantity + 1
+        pool.validated_save()
+
+        low_stock = self.filterset({"low_stock": True}, self.queryset).qs
+        self.assertEqual(list(low_stock), [pool])
+        self.assertEqual(
+            self.filterset({"low_stock": False}, self.queryset).qs.count(),
+            self.queryset.count() - 1,
+        )
+
     def test_search_filter(self):
         """Test the SearchFilter."""
         with self.subTest(filter="id"):
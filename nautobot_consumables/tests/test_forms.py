@@ -22,6 +22,7 @@ from nautobot.core.testing import TestCase
 from nautobot.dcim.models import Device, Location, Manufacturer
 
 from nautobot_consumables import forms, models
+from nautobot_consumables.choices import ReorderThresholdUnitChoices
 
 
 class CheckedOutConsumableFormsTestCase(TestCase):
@@ -84,6 +85,7 @@ class ConsumableFormsTestCase(TestCase):
                 "manufacturer": Manufacturer.objects.first().pk,
                 "product_id": "test0001",
                 "data": {"reach": "LR", "form_factor": "QSFP-DD (400GE)"},
+                "reorder_threshold_unit": ReorderThresholdUnitChoices.UNIT_ABSOLUTE,
             },
         )
 
@@ -124,6 +126,8 @@ class ConsumablePoolFormsTestCase(TestCase):
                 "consumable": models.Consumable.objects.first().pk,
                 "location": Location.objects.first().pk,
                 "quantity": 50,
+                "reorder_threshold": 5,
+                "reorder_threshold_unit": ReorderThresholdUnitChoices.UNIT_ABSOLUTE,
             },
         )
 
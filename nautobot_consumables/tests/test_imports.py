@@ -0,0 +1,248 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Tests for the bulk import of the Consumables inventory."""
+
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from nautobot.core.testing import TransactionTestCase, run_job_for_testing
+from nautobot.dcim.models import Device, Manufacturer
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import FileProxy, Job
+
+from nautobot_consumables import models
+from nautobot_consumables.imports import import_file
+
+
+class ImportConsumablesTestCase(TestCase):
+    """Tests for the import_consumables management command and the importers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up the base test data."""
+        cls.manufacturer = Manufacturer.objects.create(name="Import Manufacturer")
+        cls.device = Device.objects.filter(name__isnull=False).first()
+        cls.location = cls.device.location
+
+    def setUp(self):
+        """Write the import files to a temporary directory."""
+        super().setUp()
+        tempdir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tempdir.cleanup)
+        self.path = Path(tempdir.name)
+
+    def _import(self, model: str, filename: str, content: str, *args: str) -> str:
+        path = self.path / filename
+        path.write_text(content, encoding="utf-8")
+        out = StringIO()
+        call_command("import_consumables", model, str(path), *args, stdout=out, stderr=out)
+
+        return out.getvalue()
+
+    def _import_inventory(self):
+        self._import(
+            "consumabletype",
+            "types.jsonl",
+            '{"name": "Import Optic", "schema": {"type": "object", "properties": '
+            '{"reach_km": {"type": "integer"}, "form_factor": {"type": "string"}}}}\n',
+        )
+        self._import(
+            "consumable",
+            "consumables.csv",
+            "name,consumable_type,manufacturer,product_id,data.reach_km,data.form_factor\n"
+            f"Import LR4,Import Optic,{self.manufacturer.name},lr4,10,QSFP28\n"
+            f"Import SR4,Import Optic,{self.manufacturer.pk},sr4,,QSFP28\n",
+        )
+        self._import(
+            "consumablepool",
+            "pools.csv",
+            "name,consumable,location,quantity\n"
+            f"Import Pool,Import LR4,{self.location.name},10\n",
+        )
+
+    def test_import(self):
+        """Test importing each model, with the data columns of the exports."""
+        self._import_inventory()
+        output = self._import(
+            "checkedoutconsumable",
+            "checkouts.csv",
+            "consumable_pool,location,device,quantity\n"
+            f"Import Pool,{self.location.name},{self.device.pk},3\n",
+        )
+        self.assertIn("Created 1 and updated 0 checkedoutconsumable objects", output)
+
+        consumable_type = models.ConsumableType.objects.get(name="Import Optic")
+        lr4 = models.Consumable.objects.get(name="Import LR4")
+        self.assertEqual(lr4.data, {"reach_km": 10, "form_factor": "QSFP28"})
+        self.assertEqual(lr4.schema, consumable_type.schema)
+        self.assertEqual(lr4.manufacturer, self.manufacturer)
+        self.assertEqual(
+            models.Consumable.objects.get(name="Import SR4").data["form_factor"], "QSFP28"
+        )
+
+        pool = models.ConsumablePool.objects.get(name="Import Pool")
+        self.assertEqual(pool.used_quantity, 3)
+        self.assertEqual(pool.checked_out.get().device, self.device)
+
+        summary = models.LocationConsumableSummary.objects.get(
+            location=self.location, consumable=lr4
+        )
+        self.assertEqual((summary.pool_count, summary.quantity, summary.used_quantity), (1, 10, 3))
+
+    def test_update(self):
+        """Test that existing objects are updated, keeping the pool counters in sync."""
+        self._import_inventory()
+        checkouts = f"consumable_pool,device,quantity\nImport Pool,{self.device.pk},"
+        self._import("checkedoutconsumable", "checkouts.csv", f"{checkouts}3\n")
+        output = self._import("checkedoutconsumable", "checkouts.csv", f"{checkouts}5\n")
+        self.assertIn("Created 0 and updated 1", output)
+        # Importing the same quantity again doesn't add to the ledger
+        self._import("checkedoutconsumable", "checkouts.csv", f"{checkouts}5\n")
+
+        pool = models.ConsumablePool.objects.get(name="Import Pool")
+        self.assertEqual(pool.used_quantity, 5)
+        self.assertEqual(pool.checked_out.get().quantity, 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._import(
+                "consumablepool",
+                "pools.csv",
+                f"name,consumable,location,quantity\nImport Pool,Import LR4,{self.location.pk},8\n",
+            )
+        # The pools are locked before their used quantity is checked
+        self.assertTrue(
+            any(
+                'FROM "nautobot_consumables_consumablepool"' in query["sql"]
+                and query["sql"].endswith("FOR UPDATE")
+                for query in queries.captured_queries
+            )
+        )
+        summary = models.LocationConsumableSummary.objects.get(
+            location=self.location, consumable=pool.consumable
+        )
+        self.assertEqual((summary.pool_count, summary.quantity, summary.used_quantity), (1, 8, 5))
+        self.assertEqual(
+            list(pool.transactions.order_by("timestamp").values_list("quantity", flat=True)),
+            [10, -3, -2, -2],
+        )
+
+        output = self._import(
+            "consumablepool",
+            "pools.csv",
+            f"name,consumable,location,quantity\nImport Pool,Import LR4,{self.location.pk},4\n",
+        )
+        self.assertIn("quantity: 4 is less than the 5 checked out.", output)
+
+    def test_errors(self):
+        """Test that invalid rows are reported and skipped, and the valid rows are imported."""
+        self._import_inventory()
+        report = self.path / "errors.csv"
+        output = self._import(
+            "consumable",
+            "consumables.jsonl",
+            '{"name": "Import ER4", "consumable_type": "Import Optic", "product_id": "er4"}\n'
+            '{"name": "Import ZR4", "consumable_type": "Missing Type", "product_id": "zr4"}\n'
+            '{"name": "Import LR4 Copy", "consumable_type": "Import Optic", '
+            f'"manufacturer": "{self.manufacturer.name}", "product_id": "lr4"}}\n'
+            '{"name": "Import FR4", "consumable_type": "Import Optic", "product_id": "fr4", '
+            '"data": {"reach_km": "far"}}\n'
+            "not json\n",
+            "--error-report",
+            str(report),
+        )
+        self.assertIn("Created 1 and updated 0 consumable objects, 4 rows had errors.", output)
+        self.assertTrue(models.Consumable.objects.filter(name="Import ER4").exists())
+
+        errors = report.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(errors[0], "row,errors")
+        self.assertEqual(errors[1], "2,Consumable type Missing Type does not exist.")
+        self.assertEqual(errors[2], "3,product_id: lr4 is already used by Import LR4.")
+        self.assertIn("4,data: 'far' is not of type 'integer'", errors[3])
+        self.assertIn("5,Invalid JSON", errors[4])
+
+        output = self._import(
+            "checkedoutconsumable",
+            "checkouts.csv",
+            f"consumable_pool,device,quantity\nImport Pool,{self.device.pk},11\n",
+        )
+        self.assertIn("requesting 11, only 10 available.", output)
+
+    def test_dry_run(self):
+        """Test that a dry run checks the rows without saving anything."""
+        output = self._import(
+            "consumabletype",
+            "types.csv",
+            'name,schema\nImport Dry Run,"{""type"": ""object""}"\n',
+            "--dry-run",
+        )
+        self.assertIn("Dry run: would have created 1 and updated 0", output)
+        self.assertFalse(models.ConsumableType.objects.filter(name="Import Dry Run").exists())
+
+    def test_batch_queries(self):
+        """Test that the number of queries depends on the number of batches, not rows."""
+        self._import_inventory()
+        consumable_type = models.ConsumableType.objects.get(name="Import Optic")
+
+        def import_consumables(count: int) -> int:
+            lines = ["name,consumable_type,product_id,data.reach_km\n"]
+            lines.extend(
+                f"Import Batch {count} {num},{consumable_type.pk},batch_{count}_{num},{num}\n"
+                for num in range(count)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                result = import_file("consumable", lines, "csv", batch_size=1000)
+            self.assertEqual(result.created, count)
+
+            return len(queries)
+
+        self.assertEqual(import_consumables(10), import_consumables(500))
+
+
+class ImportConsumablesJobTestCase(TransactionTestCase):
+    """Tests for the Import Consumables Job."""
+
+    def test_job(self):
+        """Test importing a file with the Import Consumables Job."""
+        job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="ImportConsumables"
+        )
+        uploaded = FileProxy.objects.create(
+            name="types.csv",
+            file=SimpleUploadedFile(
+                "types.csv", b'name,schema\nImport Job Type,"{}"\nImport Job Type,\n'
+            ),
+        )
+
+        job_result = run_job_for_testing(
+            job,
+            model="consumabletype",
+            inventory_file=uploaded.pk,
+            file_format="csv",
+            batch_size=100,
+            dry_run=False,
+        )
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        self.assertTrue(models.ConsumableType.objects.filter(name="Import Job Type").exists())
+        self.assertTrue(job_result.files.filter(name="import_errors.csv").exists())
@@ -0,0 +1,303 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Tests for the Nautobot Consumables Jobs."""
+
+from datetime import timedelta
+import json
+from unittest import mock, skipIf, skipUnless
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.utils import timezone
+from nautobot.core.testing import TransactionTestCase, run_job_for_testing
+from nautobot.dcim.models import Location, LocationType
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import FileProxy, Job, Status, Webhook
+
+from nautobot_consumables import forecast, models
+from nautobot_consumables.choices import (
+    ConsumableTransactionKindChoices,
+    ReorderThresholdUnitChoices,
+)
+from nautobot_consumables.data_properties import data_index_name, sync_data_indexes
+
+
+class CheckLowStockJobTestCase(TransactionTestCase):
+    """Tests for the Check Low Stock Job."""
+
+    def setUp(self):
+        """Set a reorder threshold that one of the pools is below."""
+        super().setUp()
+        self.job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="CheckLowStock"
+        )
+        location_type = LocationType.objects.create(name="Low Stock Location Type")
+        location = Location.objects.create(
+            name="Low Stock Location",
+            location_type=location_type,
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        consumable = models.Consumable.objects.create(
+            name="Low Stock Consumable",
+            consumable_type=models.ConsumableType.objects.create(name="Low Stock Type"),
+            product_id="low_stock",
+            reorder_threshold=20,
+            reorder_threshold_unit=ReorderThresholdUnitChoices.UNIT_PERCENT,
+        )
+        self.pool = models.ConsumablePool.objects.create(
+            name="Low Stock Pool", consumable=consumable, location=location, quantity=4
+        )
+        models.ConsumablePool.objects.create(
+            name="Stocked Pool", consumable=consumable, location=location, quantity=10
+        )
+        models.ConsumablePool.adjust_used_quantity({self.pool.pk: 4})
+
+    def test_job(self):
+        """Test that the low stock pools are logged and reported."""
+        job_result = run_job_for_testing(self.job)
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        self.assertTrue(job_result.files.filter(name="low_stock.csv").exists())
+        messages = list(job_result.job_log_entries.values_list("message", flat=True))
+        self.assertIn(
+            "Low Stock Pool (Low Stock Consumable) at Low Stock Location: 0 available, reorder "
+            "below 1.",
+            messages,
+        )
+        self.assertIn(
+            "1 consumable pools are below their reorder threshold, see low_stock.csv.", messages
+        )
+
+    def test_job_without_files(self):
+        """Test that the low stock pools are only logged where Jobs can't create files."""
+        with mock.patch("nautobot_consumables.jobs.can_create_files", return_value=False):
+            job_result = run_job_for_testing(self.job)
+
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        self.assertFalse(job_result.files.exists())
+        messages = list(job_result.job_log_entries.values_list("message", flat=True))
+        self.assertIn("1 consumable pools are below their reorder threshold.", messages)
+
+    def test_webhook(self):
+        """Test sending the low stock pools to a Webhook through the Nautobot webhook task."""
+        webhook = Webhook.objects.create(
+            name="Low Stock", payload_url="http://localhost/low-stock", secret="secret"
+        )
+        response = mock.Mock(status_code=200)
+        with mock.patch("requests.Session.send", return_value=response) as send:
+            job_result = run_job_for_testing(self.job, webhook=webhook.pk)
+
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        request = send.call_args.args[0]
+        self.assertIn("X-Hook-Signature", request.headers)
+        body = json.loads(request.body)
+        self.assertEqual(body["event"], "updated")
+        self.assertEqual(body["model"], "consumablepool")
+        self.assertEqual([row["id"] for row in body["data"]], [str(self.pool.pk)])
+
+
+class SnapshotConsumableBalancesJobTestCase(TransactionTestCase):
+    """Tests for the Snapshot Consumable Balances Job."""
+
+    def test_job(self):
+        """Test snapshotting the balance of a pool from its ledger."""
+        job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="SnapshotConsumableBalances"
+        )
+        location = Location.objects.create(
+            name="Snapshot Location",
+            location_type=LocationType.objects.create(name="Snapshot Location Type"),
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        pool = models.ConsumablePool.objects.create(
+            name="Snapshot Pool",
+            consumable=models.Consumable.objects.create(
+                name="Snapshot Consumable",
+                consumable_type=models.ConsumableType.objects.create(name="Snapshot Type"),
+                product_id="snapshot",
+            ),
+            location=location,
+            quantity=7,
+        )
+        # The Job leaves out the most recent transactions, which may not be committed yet
+        pool.transactions.update(timestamp=timezone.now() - timedelta(days=1))
+
+        job_result = run_job_for_testing(job)
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        self.assertEqual(pool.balance_snapshots.get().balance, 7)
+
+
+@skipUnless(connection.vendor == "postgresql", "Data indexes are only created on PostgreSQL")
+class SyncDataIndexesJobTestCase(TransactionTestCase):
+    """Tests for the Sync Data Indexes Job."""
+
+    def test_job(self):
+        """Test building the index of an indexed schema property, outside of a transaction."""
+        job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="SyncDataIndexes"
+        )
+        consumable_type = models.ConsumableType.objects.create(
+            name="Sync Index Type",
+            schema={
+                "type": "object",
+                "properties": {"sync_part": {"type": "string", "indexed": True}},
+            },
+        )
+        self.addCleanup(sync_data_indexes)
+        self.addCleanup(consumable_type.delete)
+
+        job_result = run_job_for_testing(job)
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM pg_indexes WHERE indexname = %s",
+                [data_index_name("sync_part")],
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+@skipIf(forecast.np is None, "numpy is not installed")
+class ForecastConsumptionJobTestCase(TransactionTestCase):
+    """Tests for the Forecast Consumption Job."""
+
+    def test_job(self):
+        """Test forecasting the consumption of a pool."""
+        job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="ForecastConsumption"
+        )
+        location = Location.objects.create(
+            name="Forecast Location",
+            location_type=LocationType.objects.create(name="Forecast Location Type"),
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        pool = models.ConsumablePool.objects.create(
+            name="Forecast Pool",
+            consumable=models.Consumable.objects.create(
+                name="Forecast Consumable",
+                consumable_type=models.ConsumableType.objects.create(name="Forecast Type"),
+                product_id="forecast",
+            ),
+            location=location,
+            quantity=12,
+        )
+        for day in range(1, 8):
+            models.ConsumableTransaction.record(
+                [(ConsumableTransactionKindChoices.KIND_CHECKOUT, pool.pk, None, -3)],
+                timezone.now() - timedelta(days=day),
+            )
+
+        job_result = run_job_for_testing(job, window_days=7, half_life_days=7)
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+        self.assertAlmostEqual(pool.forecast.days_until_empty, 4)
+
+
+class TransferConsumablesJobTestCase(TransactionTestCase):
+    """Tests for the Transfer Consumables Job."""
+
+    def setUp(self):
+        """Set up a pool to transfer from, and the Locations to transfer to."""
+        super().setUp()
+        self.job = Job.objects.get(
+            module_name="nautobot_consumables.jobs", job_class_name="TransferConsumables"
+        )
+        location_type = LocationType.objects.create(name="Transfer Location Type")
+        self.locations = [
+            Location.objects.create(
+                name=f"Transfer Location {num}",
+                location_type=location_type,
+                status=Status.objects.get_for_model(Location).first(),
+            )
+            for num in range(2)
+        ]
+        self.pool = models.ConsumablePool.objects.create(
+            name="Transfer Pool",
+            consumable=models.Consumable.objects.create(
+                name="Transfer Consumable",
+                consumable_type=models.ConsumableType.objects.create(name="Transfer Type"),
+                product_id="transfer",
+            ),
+            location=self.locations[0],
+            quantity=10,
+        )
+
+    def _run(self, content: str, dry_run: bool = False):
+        uploaded = FileProxy.objects.create(
+            name="transfers.csv",
+            file=SimpleUploadedFile("transfers.csv", content.encode("utf-8")),
+        )
+        job_result = run_job_for_testing(
+            self.job, transfers_file=uploaded.pk, file_format="csv", dry_run=dry_run
+        )
+        self.assertEqual(
+            job_result.status, JobResultStatusChoices.STATUS_SUCCESS, job_result.traceback
+        )
+
+        return job_result
+
+    def test_job(self):
+        """Test transferring into a new pool, then back into the source pool."""
+        self._run(
+            "source,source_location,quantity,location,name\n"
+            "Transfer Pool,Transfer Location 0,4,Transfer Location 1,\n"
+        )
+        new_pool = models.ConsumablePool.objects.get(location=self.locations[1])
+        self.assertEqual((new_pool.name, new_pool.quantity), ("Transfer Pool", 4))
+
+        self._run(
+            "source,source_location,quantity,target,location\n"
+            f"{new_pool.pk},,1,Transfer Pool,Transfer Location 0\n"
+        )
+        self.pool.refresh_from_db()
+        new_pool.refresh_from_db()
+        self.assertEqual((self.pool.quantity, new_pool.quantity), (7, 3))
+
+    def test_errors(self):
+        """Test that nothing is transferred if a row has errors, or on a dry run."""
+        job_result = self._run(
+            "source,source_location,quantity,location\n"
+            "Transfer Pool,Transfer Location 0,4,Transfer Location 1\n"
+            "Transfer Pool,Transfer Location 0,4,Missing Location\n"
+        )
+        self.assertTrue(job_result.files.filter(name="transfer_errors.csv").exists())
+        self.assertIn(
+            "Row 3: Location Missing Location does not exist.",
+            job_result.job_log_entries.values_list("message", flat=True),
+        )
+
+        job_result = self._run(
+            "source,source_location,quantity,location\n"
+            "Transfer Pool,Transfer Location 0,4,Transfer Location 1\n",
+            dry_run=True,
+        )
+        self.assertIn(
+            "Would have made 1 transfers into 1 consumable pools.",
+            job_result.job_log_entries.values_list("message", flat=True),
+        )
+        self.assertFalse(models.ConsumablePool.objects.filter(location=self.locations[1]).exists())
+        self.pool.refresh_from_db()
+        self.assertEqual(self.pool.quantity, 10)
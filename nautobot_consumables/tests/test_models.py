@@ -16,13 +16,29 @@
 
 """Tests for models defined by the Consumables app."""
 
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from datetime import timedelta
+from io import StringIO
+from unittest import skipIf
+
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from nautobot.core.testing import TransactionTestCase
 from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer
-from nautobot.extras.models import Role, Status
+from nautobot.extras.models import Role, Status, Tag
 
-from nautobot_consumables import models
+from nautobot_consumables import forecast, models, utils
+from nautobot_consumables.choices import (
+    ConsumableTransactionKindChoices,
+    ReorderThresholdUnitChoices,
+)
 
 
 class ConsumableTypeTestCase(TestCase):
@@ -111,6 +127,50 @@ class ConsumableTestCase(TestCase):
         self.assertEqual(len(self.consumable.template_details), 4)
         self.assertEqual(self.consumable.template_details[-1][-1]["value"], "Orange")
 
+    def test_template_details_render_plan(self):
+        """Test that the template details are rendered from a plan cached for the schema."""
+        self.consumable.clean()
+        self.assertIs(
+            utils.get_render_plan(self.consumable.schema),
+            utils.get_render_plan(copy.deepcopy(self.consumable.schema)),
+        )
+        self.assertIs(
+            utils.get_render_plan(self.consumable.schema),
+            utils.get_render_plan(dict(reversed(self.consumable.schema.items()))),
+        )
+        self.assertEqual(
+            [key for key, _ in self.consumable.template_details],
+            ["cable_type", "connector", "length", "color"],
+        )
+        self.assertEqual(dict(self.consumable.template_details)["length"]["value"], "5m")
+
+        consumable = models.Consumable(
+            schema={
+                "type": "object",
+                "properties": {
+                    "input": {"type": "integer"},
+                    "input_unit": {
+                        "type": "string",
+                        "enum": ["w", "kw"],
+                        "options": {"enum_titles": ["Watts", "Kilowatts"]},
+                    },
+                    "grade": {
+                        "type": "string",
+                        "enum": ["a", "b"],
+                        "options": {"enum_titles": ["Grade A", "Grade B"]},
+                    },
+                },
+            },
+            data={"input": 3, "input_unit": "kw"},
+        )
+        self.assertEqual(
+            consumable.template_details,
+            [
+                ("input", {"title": "input", "value": "3kw"}),
+                ("grade", {"title": "grade", "value": None}),
+            ],
+        )
+
     def test_schema_validation(self):
         """Test that schema validation works."""
         self.consumable.clean()
@@ -134,6 +194,83 @@ class ConsumableTestCase(TestCase):
                 "Data validation against schema schema failed: 'color' is a required property",
             )
 
+    def test_schema_validator_cache(self):
+        """Test that Consumables sharing a schema reuse the same checked validator."""
+        utils.clear_schema_validator_cache()
+        self.consumable.clean()
+        self.consumable.clean()
+        reordered_schema = dict(reversed(self.consumable.schema.items()))
+        self.assertIs(
+            utils.get_schema_validator(reordered_schema),
+            utils.get_schema_validator(self.consumable.schema),
+        )
+
+        cache_info = utils.schema_validator_cache_info()
+        self.assertEqual(cache_info["misses"], 1)
+        self.assertEqual(cache_info["hits"], 3)
+        self.assertEqual(cache_info["currsize"], 1)
+
+
+@skipIf(utils.fastjsonschema is None, "fastjsonschema is not installed")
+class SchemaEngineConformanceTestCase(TestCase):
+    """Check that the schema engines agree on the default ConsumableType schemas."""
+
+    @staticmethod
+    def _cases(schema):
+        """Build valid data for a schema, and invalid variations of it."""
+        valid = {
+            key: prop["enum"][0] if "enum" in prop else 1
+            for key, prop in schema["properties"].items()
+        }
+        yield "valid", valid
+        yield "not an object", "data"
+        for key, prop in schema["properties"].items():
+            yield f"missing {key}", {name: value for name, value in valid.items() if name != key}
+            yield f"{key} wrong type", {**valid, key: {}}
+            if "enum" in prop:
+                yield f"{key} not a choice", {**valid, key: "not a choice"}
+
+    def test_default_schemas(self):
+        """Test that both engines accept and reject the same data with the same errors."""
+        for name in ["Cable", "Transceiver"]:
+            schema = models.ConsumableType.objects.get(name=name).schema
+            validators = {
+                engine: utils.get_schema_validator(schema, engine)
+                for engine in utils.SCHEMA_ENGINES
+            }
+            for case, data in self._cases(schema):
+                with self.subTest(consumable_type=name, case=case):
+                    results = {}
+                    for engine, validator in validators.items():
+                        try:
+                            validator.validate(data)
+                            results[engine] = None
+                        except utils.SchemaDataError as error:
+                            results[engine] = (error.message, error.path)
+
+                    self.assertEqual(results["fastjsonschema"], results["jsonschema"])
+                    self.assertEqual(results["jsonschema"] is None, case == "valid")
+
+    @override_settings(PLUGINS_CONFIG={"nautobot_consumables": {"schema_engine": "fastjsonschema"}})
+    def test_clean_with_fastjsonschema(self):
+        """Test validating a Consumable with the fastjsonschema engine."""
+        consumable = models.Consumable(
+            name="Test Consumable",
+            consumable_type=models.ConsumableType.objects.get(name="Transceiver"),
+            product_id="C3PO",
+            data={"form_factor": "QSFP28 (100GE)", "reach": "LR"},
+        )
+        consumable.clean()
+
+        consumable.data["reach"] = "XR"
+        with self.assertRaises(ValidationError) as context:
+            consumable.clean()
+        self.assertEqual(
+            context.exception.message,
+            "Data validation against schema schema failed: 'XR' is not one of "
+            "['LR', 'SR', 'ER'] on ['reach']",
+        )
+
 
 class ConsumablePoolTestCase(TestCase):
     """Tests for the ConsumablePool model."""
@@ -193,6 +330,624 @@ class ConsumablePoolTestCase(TestCase):
         self.assertEqual(self.consumable_pool.used_quantity, 6)
         self.assertEqual(self.consumable_pool.available_quantity, 7)
 
+    def test_used_quantity_counter(self):
+        """Test that used_quantity follows CheckedOutConsumable changes."""
+        self.consumable_pool.validated_save()
+        checked_out = models.CheckedOutConsumable.objects.create(
+            consumable_pool=self.consumable_pool,
+            device=Device.objects.first(),
+            quantity=4,
+        )
+
+        with self.subTest(change="create"):
+            self.assertEqual(self._stored_used_quantity(), 4)
+
+        with self.subTest(change="update"):
+            checked_out.quantity = 9
+            checked_out.save()
+            self.assertEqual(self._stored_used_quantity(), 9)
+
+        with self.subTest(change="pool_save"):
+            stale_pool = models.ConsumablePool.objects.get(pk=self.consumable_pool.pk)
+            stale_pool.used_quantity = 0
+            stale_pool.quantity = 20
+            stale_pool.validated_save()
+            self.assertEqual(self._stored_used_quantity(), 9)
+
+        with self.subTest(change="delete"):
+            checked_out.delete()
+            self.assertEqual(self._stored_used_quantity(), 0)
+            self.assertEqual(self.consumable_pool.used_quantity, 0)
+
+    def test_reconcile_counters(self):
+        """Test the reconcile_consumable_counters management command."""
+        self.consumable_pool.validated_save()
+        models.CheckedOutConsumable.objects.create(
+            consumable_pool=self.consumable_pool,
+            device=Device.objects.first(),
+            quantity=3,
+        )
+        models.ConsumablePool.objects.filter(pk=self.consumable_pool.pk).update(used_quantity=1)
+
+        out = StringIO()
+        call_command("reconcile_consumable_counters", stdout=out)
+        self.assertIn("Found 1 drifted", out.getvalue())
+        self.assertEqual(self._stored_used_quantity(), 1)
+
+        call_command("reconcile_consumable_counters", "--fix", stdout=out)
+        self.assertEqual(self._stored_used_quantity(), 3)
+
+    def test_with_usage(self):
+        """Test the available_quantity annotation on ConsumablePool querysets."""
+        self.consumable_pool.validated_save()
+        models.CheckedOutConsumable.objects.create(
+            consumable_pool=self.consumable_pool,
+            device=Device.objects.first(),
+            quantity=5,
+        )
+
+        pools = models.ConsumablePool.objects.with_usage()
+        pool = pools.get(pk=self.consumable_pool.pk)
+        self.assertEqual(pool.available_quantity, 8)
+        expected = [p.pk for p in models.ConsumablePool.objects.all() if p.available_quantity <= 8]  # noqa: PLR2004
+        self.assertEqual(pools.filter(available_quantity__lte=8).count(), len(expected))
+
+        available = list(pools.order_by("available_quantity").values_list("available_quantity"))
+        self.assertEqual(available, sorted(available))
+
+        with self.subTest(check="checked_out_total"):
+            pool = models.ConsumablePool.objects.with_checked_out_total().get(pk=pool.pk)
+            self.assertEqual(pool.checked_out_total, 5)
+
+    def test_low_stock(self):
+        """Test evaluating the reorder thresholds of the pools and their Consumables."""
+        self.consumable_pool.validated_save()
+        models.CheckedOutConsumable.objects.create(
+            consumable_pool=self.consumable_pool,
+            device=Device.objects.first(),
+            quantity=9,
+        )
+        consumable = self.consumable_pool.consumable
+        pools = models.ConsumablePool.objects.filter(pk=self.consumable_pool.pk)
+        self.assertFalse(pools.low_stock().exists())
+
+        with self.subTest(threshold="consumable"):
+            consumable.reorder_threshold = 5
+            consumable.validated_save()
+            self.assertEqual(pools.low_stock().get().reorder_quantity, 5)
+
+        with self.subTest(threshold="pool"):
+            self.consumable_pool.reorder_threshold = 4
+            self.consumable_pool.validated_save()
+            self.assertFalse(pools.low_stock().exists())
+
+        with self.subTest(threshold="percent"):
+            # 31% of 13 is 4.03, which is rounded up
+            self.consumable_pool.reorder_threshold = 31
+            self.consumable_pool.reorder_threshold_unit = ReorderThresholdUnitChoices.UNIT_PERCENT
+            self.consumable_pool.validated_save()
+            self.assertEqual(pools.low_stock().get().reorder_quantity, 5)
+            self.assertEqual(self.consumable_pool.reorder_threshold_display, "31%")
+
+    def _stored_used_quantity(self) -> int:
+        return models.ConsumablePool.objects.get(pk=self.consumable_pool.pk).used_quantity
+
+
+class LocationConsumableSummaryTestCase(TestCase):
+    """Tests for the LocationConsumableSummary rollups."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a region with two sites."""
+        status = Status.objects.get_for_model(Location).first()
+        region_type = LocationType.objects.create(name="Summary Region Type")
+        site_type = LocationType.objects.create(name="Summary Site Type", parent=region_type)
+        site_type.content_types.add(ContentType.objects.get_for_model(Device))
+        cls.region = Location.objects.create(
+            name="Summary Region", location_type=region_type, status=status
+        )
+        cls.sites = [
+            Location.objects.create(
+                name=f"Summary Site {num}",
+                location_type=site_type,
+                parent=cls.region,
+                status=status,
+            )
+            for num in range(2)
+        ]
+        template = Device.objects.first()
+        cls.device = Device.objects.create(
+            name="Summary Device",
+            device_type=template.device_type,
+            role=template.role,
+            location=cls.sites[0],
+            status=template.status,
+        )
+        cls.consumable = models.Consumable.objects.create(
+            name="Summary Consumable",
+            consumable_type=models.ConsumableType.objects.get(name="Generic"),
+            product_id="summary",
+        )
+
+    def _summaries(self) -> dict[str, tuple[int, int, int]]:
+        return {
+            summary.location.name: (summary.pool_count, summary.quantity, summary.used_quantity)
+            for summary in models.LocationConsumableSummary.objects.filter(
+                consumable=self.consumable
+            ).select_related("location")
+        }
+
+    def assertSummaries(self, expected: dict[str, tuple[int, int, int]]):  # pylint: disable=invalid-name
+        """Assert the summaries, and that they match those rebuilt from the pools."""
+        self.assertEqual(self._summaries(), expected)
+        models.LocationConsumableSummary.rebuild()
+        self.assertEqual(self._summaries(), expected)
+
+    def test_summaries(self):
+        """Test that the summaries follow the changes to the pools and checkouts."""
+        pool = models.ConsumablePool.objects.create(
+            name="Summary Pool", consumable=self.consumable, location=self.sites[0], quantity=10
+        )
+        other_pool = models.ConsumablePool.objects.create(
+            name="Summary Pool", consumable=self.consumable, location=self.sites[1], quantity=5
+        )
+        self.assertSummaries(
+            {
+                "Summary Region": (2, 15, 0),
+                "Summary Site 0": (1, 10, 0),
+                "Summary Site 1": (1, 5, 0),
+            }
+        )
+
+        checked_out = models.CheckedOutConsumable.objects.create(
+            consumable_pool=pool, device=self.device, quantity=3
+        )
+        pool.refresh_from_db()
+        pool.quantity = 12
+        pool.validated_save()
+        self.assertSummaries(
+            {
+                "Summary Region": (2, 17, 3),
+                "Summary Site 0": (1, 12, 3),
+                "Summary Site 1": (1, 5, 0),
+            }
+        )
+
+        other_pool.name = "Moved Pool"
+        other_pool.location = self.sites[0]
+        other_pool.validated_save()
+        checked_out.delete()
+        self.assertSummaries({"Summary Region": (2, 17, 0), "Summary Site 0": (2, 17, 0)})
+
+        other_pool.delete()
+        pool.delete()
+        self.assertSummaries({})
+
+    def test_reparent_location(self):
+        """Test that the summaries follow a Location moved to another parent."""
+        for num in range(2):
+            models.ConsumablePool.objects.create(
+                name="Summary Pool",
+                consumable=self.consumable,
+                location=self.sites[num],
+                quantity=4,
+            )
+        other_region = Location.objects.create(
+            name="Summary Other Region",
+            location_type=self.region.location_type,
+            status=self.region.status,
+        )
+
+        self.sites[1].parent = other_region
+        self.sites[1].validated_save()
+        self.assertSummaries(
+            {
+                "Summary Region": (1, 4, 0),
+                "Summary Other Region": (1, 4, 0),
+                "Summary Site 0": (1, 4, 0),
+                "Summary Site 1": (1, 4, 0),
+            }
+        )
+
+        self.sites[1].parent = self.region
+        self.sites[1].validated_save()
+        self.assertSummaries(
+            {
+                "Summary Region": (2, 8, 0),
+                "Summary Site 0": (1, 4, 0),
+                "Summary Site 1": (1, 4, 0),
+            }
+        )
+
+    def test_bulk_edit(self):
+        """Test that the summaries and ledgers follow a bulk edit moving pools with checkouts."""
+        pools = [
+            models.ConsumablePool.objects.create(
+                name=f"Summary Pool {num}",
+                consumable=self.consumable,
+                location=self.sites[num],
+                quantity=10,
+            )
+            for num in range(2)
+        ]
+        checked_out = pools[0].allocate(self.device, 3)
+        tag = Tag.objects.create(name="Summary Tag")
+        tag.content_types.add(ContentType.objects.get_for_model(models.ConsumablePool))
+
+        updated, checked_in = models.ConsumablePool.bulk_edit(
+            [pool.pk for pool in pools], location=self.sites[1], quantity=8, add_tags=[tag]
+        )
+
+        self.assertEqual(checked_in, 3)
+        self.assertEqual(
+            {(pool.location, pool.quantity, pool.used_quantity) for pool in updated},
+            {(self.sites[1], 8, 0)},
+        )
+        self.assertFalse(models.CheckedOutConsumable.objects.filter(device=self.device).exists())
+        self.assertTrue(models.Tombstone.objects.filter(object_id=checked_out.pk).exists())
+        self.assertSummaries({"Summary Region": (2, 16, 0), "Summary Site 1": (2, 16, 0)})
+        for pool in updated:
+            self.assertEqual(
+                pool.transactions.aggregate(total=Sum("quantity"))["total"],
+                pool.available_quantity,
+            )
+            self.assertEqual(list(pool.tags.all()), [tag])
+
+        other_pool = models.ConsumablePool.objects.create(
+            name="Summary Pool 0", consumable=self.consumable, location=self.sites[0], quantity=6
+        )
+        with self.assertRaises(ValidationError):
+            models.ConsumablePool.bulk_edit([pools[0].pk], location=self.sites[0])
+        other_pool.allocate(self.device, 5)
+        with self.assertRaises(ValidationError):
+            models.ConsumablePool.bulk_edit([other_pool.pk, pools[1].pk], quantity=4)
+        other_pool.refresh_from_db()
+        self.assertEqual((other_pool.quantity, other_pool.used_quantity), (6, 5))
+        models.ConsumablePool.bulk_edit([other_pool.pk, pools[1].pk], remove_tags=[tag])
+        self.assertFalse(pools[1].tags.exists())
+
+    def test_bulk_edit_queries(self):
+        """Test that a bulk edit runs the same queries however many pools and checkouts it has."""
+
+        def bulk_edit(count: int) -> int:
+            pools = [
+                models.ConsumablePool.objects.create(
+                    name=f"Summary Batch {count} {num}",
+                    consumable=self.consumable,
+                    location=self.sites[0],
+                    quantity=5,
+                )
+                for num in range(count)
+            ]
+            models.CheckedOutConsumable.bulk_allocate(
+                [(pool.pk, self.device.pk, 1) for pool in pools]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                models.ConsumablePool.bulk_edit(
+                    [pool.pk for pool in pools], location=self.sites[1], quantity=7
+                )
+
+            return len(queries)
+
+        self.assertEqual(bulk_edit(2), bulk_edit(50))
+
+
+@skipIf(forecast.np is None, "numpy is not installed")
+class ConsumablePoolForecastTestCase(TestCase):
+    """Tests for the consumption forecasts of the pools."""
+
+    def test_burn_rates(self):
+        """Test the burn rates and days until empty of a few pools at once."""
+        consumption = forecast.np.array([[2, 2, 2, 2], [0, 0, 0, 0], [0, 0, 0, 8], [0, 0, 4, -6]])
+        rates = forecast.burn_rates(consumption, half_life_days=1)
+        self.assertEqual(rates.round(6).tolist(), [2, 0, round(8 * 8 / 15, 6), 0])
+
+        remaining = forecast.days_until_empty(forecast.np.array([10.0, 10, 0, 10]), rates)
+        self.assertEqual(remaining[0], 5)
+        self.assertTrue(forecast.np.isnan(remaining[1]))
+        self.assertEqual(remaining[2], 0)
+        self.assertTrue(forecast.np.isnan(remaining[3]))
+
+    def test_refresh(self):
+        """Test forecasting every pool from its ledger."""
+        location = Device.objects.filter(name__isnull=False).first().location
+        consumable = models.Consumable.objects.create(
+            name="Forecast Consumable",
+            consumable_type=models.ConsumableType.objects.get(name="Generic"),
+            product_id="forecast",
+        )
+        pools = [
+            models.ConsumablePool.objects.create(
+                name=f"Forecast Pool {num}", consumable=consumable, location=location, quantity=20
+            )
+            for num in range(2)
+        ]
+
+        # Today isn't a full day yet, so it's left out of the forecast
+        today = timezone.now()
+        for day in range(forecast.FORECAST_WINDOW_DAYS + 1):
+            models.ConsumableTransaction.record(
+                [(ConsumableTransactionKindChoices.KIND_CHECKOUT, pools[0].pk, None, -2)],
+                today - timedelta(days=day),
+            )
+
+        self.assertEqual(
+            models.ConsumablePoolForecast.refresh(), models.ConsumablePool.objects.count()
+        )
+        busy, idle = (
+            models.ConsumablePoolForecast.objects.get(consumable_pool=pool) for pool in pools
+        )
+        self.assertAlmostEqual(busy.burn_rate, 2)
+        self.assertAlmostEqual(busy.days_until_empty, 10)
+        self.assertEqual(idle.burn_rate, 0)
+        self.assertIsNone(idle.days_until_empty)
+
+
+class ConsumableTransactionTestCase(TestCase):
+    """Tests for the ConsumableTransaction ledger and its balance snapshots."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a pool and a Device to check out to."""
+        cls.device = Device.objects.filter(name__isnull=False).first()
+        cls.consumable = models.Consumable.objects.create(
+            name="Ledger Consumable",
+            consumable_type=models.ConsumableType.objects.get(name="Generic"),
+            product_id="ledger",
+        )
+
+    def setUp(self):
+        """Create the pool in the test, so its ledger starts with it."""
+        super().setUp()
+        self.pool = models.ConsumablePool.objects.create(
+            name="Ledger Pool",
+            consumable=self.consumable,
+            location=self.device.location,
+            quantity=10,
+        )
+
+    def _ledger(self) -> list[tuple[str, int]]:
+        return list(
+            self.pool.transactions.order_by("timestamp", "quantity").values_list("kind", "quantity")
+        )
+
+    def test_ledger(self):
+        """Test that the changes to the pool and its checkouts are appended to the ledger."""
+        kinds = ConsumableTransactionKindChoices
+        checked_out = self.pool.allocate(self.device, 3)
+        checked_out.quantity = 1
+        checked_out.validated_save()
+        checked_out.delete()
+        self.pool.quantity = 12
+        self.pool.validated_save()
+        models.CheckedOutConsumable.bulk_allocate([(self.pool.pk, self.device.pk, 4)])
+
+        self.assertEqual(
+            self._ledger(),
+            [
+                (kinds.KIND_ADJUST, 10),
+                (kinds.KIND_CHECKOUT, -3),
+                (kinds.KIND_RETURN, 2),
+                (kinds.KIND_RETURN, 1),
+                (kinds.KIND_ADJUST, 2),
+                (kinds.KIND_CHECKOUT, -4),
+            ],
+        )
+
+        self.pool.refresh_from_db()
+        balances = list(
+            models.ConsumableTransaction.objects.filter(consumable_pool=self.pool)
+            .with_balance()
+            .order_by("timestamp", "id")
+            .values_list("balance", flat=True)
+        )
+        self.assertEqual(balances, [10, 7, 9, 10, 12, 8])
+        self.assertEqual(balances[-1], self.pool.available_quantity)
+
+    def test_append_only(self):
+        """Test that recorded transactions can't be changed or deleted."""
+        transaction = self.pool.transactions.get()
+        transaction.quantity = 100
+        with self.assertRaises(ValidationError):
+            transaction.save()
+        with self.assertRaises(ValidationError):
+            transaction.delete()
+
+    def test_balance_at(self):
+        """Test reading past balances from the snapshots and the transactions after them."""
+        start = self.pool.transactions.get().timestamp
+        times = [start + timedelta(days=day) for day in range(1, 5)]
+        for at, quantity in zip(times, [-4, 2, -1, -5], strict=True):
+            models.ConsumableTransaction.record(
+                [(ConsumableTransactionKindChoices.KIND_ADJUST, self.pool.pk, None, quantity)], at
+            )
+
+        models.ConsumableBalanceSnapshot.take(times[1])
+        self.assertEqual(models.ConsumableBalanceSnapshot.take(times[1]), 0)
+        self.assertEqual(self.pool.balance_snapshots.get().balance, 8)
+
+        pools = models.ConsumablePool.objects.filter(pk=self.pool.pk)
+        for at, balance in [(start, 10), (times[0], 6), (times[1], 8), (times[2], 7), (None, 10)]:
+            with self.subTest(at=at):
+                self.assertEqual(pools.with_ledger_balance(at).get().ledger_balance, balance)
+
+        models.ConsumableBalanceSnapshot.take(times[3])
+        self.assertEqual(pools.with_ledger_balance(times[3]).get().ledger_balance, 2)
+        self.assertEqual(self.pool.balance_snapshots.count(), 2)
+
+
+class ConsumablePoolTransferTestCase(TestCase):
+    """Tests for the bulk transfers between ConsumablePools."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a region with three sites, and a pool at the first site."""
+        status = Status.objects.get_for_model(Location).first()
+        region_type = LocationType.objects.create(name="Transfer Region Type")
+        site_type = LocationType.objects.create(name="Transfer Site Type", parent=region_type)
+        site_type.content_types.add(ContentType.objects.get_for_model(Device))
+        cls.region = Location.objects.create(
+            name="Transfer Region", location_type=region_type, status=status
+        )
+        cls.sites = [
+            Location.objects.create(
+                name=f"Transfer Site {num}",
+                location_type=site_type,
+                parent=cls.region,
+                status=status,
+            )
+            for num in range(3)
+        ]
+        template = Device.objects.first()
+        cls.device = Device.objects.create(
+            name="Transfer Device",
+            device_type=template.device_type,
+            role=template.role,
+            location=cls.sites[0],
+            status=template.status,
+        )
+        cls.consumable = models.Consumable.objects.create(
+            name="Transfer Consumable",
+            consumable_type=models.ConsumableType.objects.get(name="Generic"),
+            product_id="transfer",
+        )
+
+    def setUp(self):
+        """Create the pools in the test, so their ledgers start with them."""
+        super().setUp()
+        self.source = models.ConsumablePool.objects.create(
+            name="Transfer Pool", consumable=self.consumable, location=self.sites[0], quantity=10
+        )
+        self.target = models.ConsumablePool.objects.create(
+            name="Transfer Pool", consumable=self.consumable, location=self.sites[1], quantity=2
+        )
+        self.source.allocate(self.device, 3)
+
+    def _pools(self) -> dict[tuple[str, str], tuple[int, int]]:
+        return {
+            (pool.location.name, pool.name): (pool.quantity, pool.used_quantity)
+            for pool in models.ConsumablePool.objects.filter(
+                consumable=self.consumable
+            ).select_related("location")
+        }
+
+    def test_transfer(self):
+        """Test moving stock into existing and new pools, keeping the ledger and summaries."""
+        transfers = [
+            models.PoolTransfer(self.source.pk, 2, target=self.target.pk),
+            models.PoolTransfer(self.source.pk, 3, location=self.sites[1].pk, name="Spares"),
+            models.PoolTransfer(self.source.pk, 1, location=self.sites[2].pk),
+            models.PoolTransfer(self.target.pk, 1, location=self.sites[2].pk),
+        ]
+        targets = models.ConsumablePool.bulk_transfer(transfers)
+
+        self.assertEqual(
+            [(target.location.name, target.name) for target in targets],
+            [
+                ("Transfer Site 1", "Transfer Pool"),
+                ("Transfer Site 1", "Spares"),
+                ("Transfer Site 2", "Transfer Pool"),
+                ("Transfer Site 2", "Transfer Pool"),
+            ],
+        )
+        self.assertEqual(targets[2].pk, targets[3].pk)
+        self.assertEqual(
+            self._pools(),
+            {
+                ("Transfer Site 0", "Transfer Pool"): (4, 3),
+                ("Transfer Site 1", "Transfer Pool"): (3, 0),
+                ("Transfer Site 1", "Spares"): (3, 0),
+                ("Transfer Site 2", "Transfer Pool"): (2, 0),
+            },
+        )
+
+        for pool in models.ConsumablePool.objects.filter(consumable=self.consumable):
+            self.assertEqual(
+                pool.transactions.aggregate(total=Sum("quantity"))["total"],
+                pool.available_quantity,
+            )
+        self.assertEqual(
+            models.ConsumableTransaction.objects.filter(
+                kind=ConsumableTransactionKindChoices.KIND_TRANSFER,
+                consumable_pool__consumable=self.consumable,
+            ).count(),
+            8,
+        )
+
+        summaries = {
+            summary.location.name: (summary.pool_count, summary.quantity, summary.used_quantity)
+            for summary in models.LocationConsumableSummary.objects.filter(
+                consumable=self.consumable
+            ).select_related("location")
+        }
+        self.assertEqual(
+            summaries,
+            {
+                "Transfer Region": (4, 12, 3),
+                "Transfer Site 0": (1, 4, 3),
+                "Transfer Site 1": (2, 6, 0),
+                "Transfer Site 2": (1, 2, 0),
+            },
+        )
+
+    def test_transfer_errors(self):
+        """Test that nothing is moved if any transfer is invalid."""
+        other_pool = models.ConsumablePool.objects.create(
+            name="Transfer Pool",
+            consumable=models.Consumable.objects.exclude(pk=self.consumable.pk).first(),
+            location=self.sites[1],
+            quantity=5,
+        )
+        before = self._pools()
+        transfers = [
+            models.PoolTransfer(self.target.pk, 1, location=self.sites[2].pk),
+            models.PoolTransfer(self.source.pk, 8, target=self.target.pk),
+            models.PoolTransfer(self.source.pk, 1, location=self.sites[0].pk),
+            models.PoolTransfer(self.source.pk, 1, target=other_pool.pk),
+            models.PoolTransfer(
+                self.source.pk, 1, target=self.target.pk, location=self.sites[2].pk
+            ),
+            models.PoolTransfer(self.source.pk, 0, location=self.region.pk),
+            models.PoolTransfer(self.target.pk, 1, location=self.consumable.pk),
+        ]
+        with self.assertRaises(ValidationError) as context:
+            models.ConsumablePool.bulk_transfer(transfers)
+
+        errors = context.exception.message_dict
+        self.assertEqual(list(errors), ["1", "2", "3", "4", "5", "6"])
+        self.assertIn("only 7 can be moved", errors["1"][0])
+        self.assertIn("to itself", errors["2"][0])
+        self.assertIn("different consumable", errors["3"][0])
+        self.assertIn("either a target pool or a target location", errors["4"][0])
+        self.assertIn("at least 1", errors["5"][0])
+        self.assertIn("does not exist", errors["6"][0])
+        self.assertEqual(self._pools(), before)
+
+    def test_transfer_queries(self):
+        """Test that the number of queries doesn't depend on the number of transfers."""
+
+        def transfer(count: int) -> int:
+            pools = models.ConsumablePool.objects.bulk_create(
+                models.ConsumablePool(
+                    name=f"Transfer Batch {count} {num}",
+                    consumable=self.consumable,
+                    location=self.sites[2],
+                    quantity=5,
+                )
+                for num in range(count)
+            )
+            models.LocationConsumableSummary.rebuild()
+            transfers = [
+                *(models.PoolTransfer(pool.pk, 1, location=self.sites[1].pk) for pool in pools),
+                *(models.PoolTransfer(pool.pk, 1, target=self.target.pk) for pool in pools),
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                models.ConsumablePool.bulk_transfer(transfers)
+
+            return len(queries)
+
+        self.assertEqual(transfer(2), transfer(200))
+
 
 class CheckedOutConsumableTestCase(TestCase):
     """Tests for the CheckedOutConsumable model."""
@@ -291,3 +1046,106 @@ class CheckedOutConsumableTestCase(TestCase):
             f"Consumable pool does not have enough available capacity, requesting "
             f"{checked_out_consumable.quantity}, only {pool.available_quantity + 5} available.",
         )
+
+
+class ConsumablePoolAllocationTestCase(TransactionTestCase):
+    """Tests for allocating Consumables from a pool with concurrent requests."""
+
+    pool_quantity = 10
+    device_count = 25
+
+    def setUp(self):
+        super().setUp()
+        location_type = LocationType.objects.create(name="Allocation Location Type")
+        location_type.content_types.add(ContentType.objects.get_for_model(Device))
+        location = Location.objects.create(
+            name="Allocation Location",
+            location_type=location_type,
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        manufacturer = Manufacturer.objects.create(name="Allocation Manufacturer")
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model="Allocation")
+        role = Role.objects.create(name="Allocation Role")
+        role.content_types.add(ContentType.objects.get_for_model(Device))
+
+        consumable = models.Consumable.objects.create(
+            name="Allocation Consumable",
+            consumable_type=models.ConsumableType.objects.create(name="Allocation Type"),
+            product_id="allocation_001",
+        )
+        self.pool = models.ConsumablePool.objects.create(
+            consumable=consumable,
+            name="Allocation Pool",
+            location=location,
+            quantity=self.pool_quantity,
+        )
+        self.devices = [
+            Device.objects.create(
+                name=f"Allocation Device {num}",
+                device_type=device_type,
+                role=role,
+                location=location,
+                status=Status.objects.get_for_model(Device).first(),
+            )
+            for num in range(self.device_count)
+        ]
+
+    def _allocate(self, device: Device) -> bool:
+        try:
+            models.ConsumablePool.objects.get(pk=self.pool.pk).allocate(device, 1)
+            return True
+        except ValidationError:
+            return False
+        finally:
+            connection.close()
+
+    def _set_quantity(self, pk, quantity: int):
+        try:
+            checked_out = models.CheckedOutConsumable.objects.get(pk=pk)
+            checked_out.quantity = quantity
+            checked_out.save()
+        finally:
+            connection.close()
+
+    def test_allocate(self):
+        """Test allocating to new and existing checkouts."""
+        checked_out = self.pool.allocate(self.devices[0], 3)
+        self.assertEqual(checked_out.quantity, 3)
+        self.assertEqual(self.pool.available_quantity, self.pool_quantity - 3)
+
+        checked_out = self.pool.allocate(self.devices[0], 2)
+        self.assertEqual(checked_out.quantity, 5)
+        self.assertEqual(self.pool.checked_out.count(), 1)
+
+        with self.assertRaises(ValidationError):
+            self.pool.allocate(self.devices[1], self.pool_quantity)
+
+        with self.assertRaises(ValidationError):
+            self.pool.allocate(self.devices[1], 0)
+
+    def test_concurrent_allocation(self):
+        """Test that parallel checkouts never oversubscribe the pool."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self._allocate, self.devices))
+
+        self.pool.refresh_from_db()
+        self.assertEqual(results.count(True), self.pool_quantity)
+        self.assertEqual(self.pool.used_quantity, self.pool_quantity)
+        self.assertEqual(
+            sum(self.pool.checked_out.values_list("quantity", flat=True)), self.pool_quantity
+        )
+
+    def test_concurrent_checkout_edits(self):
+        """Test that parallel edits of the same checkout keep the pool counter in sync."""
+        checked_out = self.pool.allocate(self.devices[0], 1)
+        quantities = list(range(1, self.pool_quantity + 1)) * 2
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(self._set_quantity, [checked_out.pk] * len(quantities), quantities))
+
+        checked_out.refresh_from_db()
+        self.pool.refresh_from_db()
+        self.assertEqual(self.pool.used_quantity, checked_out.quantity)
+        self.assertEqual(
+            self.pool.transactions.aggregate(total=Sum("quantity"))["total"],
+            self.pool_quantity - checked_out.quantity,
+        )
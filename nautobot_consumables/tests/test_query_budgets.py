@@ -0,0 +1,249 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Check the number of database queries run by the Nautobot Consumables UI views."""
+
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Device
+
+from nautobot_consumables import models
+
+# The maximum number of queries each view may run, no matter how many rows it lists. See the
+# "Query Budgets" section of the developer documentation before raising any of these.
+QUERY_BUDGETS = {
+    "checkedoutconsumable_list": 10,
+    "checkedoutconsumable": 30,
+    "consumable_list": 10,
+    "consumable": 25,
+    "consumablepool_list": 10,
+    "consumablepool": 25,
+    "consumabletype_list": 10,
+    "consumabletype": 25,
+    "device_consumables_tab": 35,
+    "location_consumables_tab": 20,
+}
+
+
+class QueryBudgetTestMixin:
+    """Fill the database with a growing number of rows and check the view query counts."""
+
+    scales: tuple[int, ...] = ()
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Use a superuser so that the counts don't depend on permission constraints."""
+        super().setUp()
+        self.user.is_superuser = True
+        self.user.save()
+
+        template = Device.objects.first()
+        self.device_template = template
+        self.location = template.location
+        self.consumable_type = models.ConsumableType.objects.create(name="Budget Type", schema={})
+        self.consumable = models.Consumable.objects.create(
+            name="Budget Consumable",
+            consumable_type=self.consumable_type,
+            schema={},
+            product_id="budget",
+        )
+        self.pool = models.ConsumablePool.objects.create(
+            name="Budget Pool",
+            consumable=self.consumable,
+            location=self.location,
+            quantity=32767,
+        )
+        self.rows = 0
+
+    def _add_rows(self, count: int):
+        """Add rows to every table shown by the views, using bulk inserts to keep this fast."""
+        start, self.rows = self.rows, self.rows + count
+        numbers = range(start, self.rows)
+
+        consumables = models.Consumable.objects.bulk_create(
+            models.Consumable(
+                name=f"Budget Consumable {num}",
+                consumable_type=self.consumable_type,
+                product_id=f"budget_{num}",
+                schema={},
+            )
+            for num in numbers
+        )
+        models.ConsumablePool.objects.bulk_create(
+            models.ConsumablePool(
+                name=f"Budget Pool {num}",
+                consumable=consumable if num % 2 else self.consumable,
+                location=self.location,
+                quantity=10,
+            )
+            for num, consumable in zip(numbers, consumables, strict=True)
+        )
+        models.ConsumableType.objects.bulk_create(
+            models.ConsumableType(name=f"Budget Type {num}", schema={}) for num in numbers
+        )
+        devices = Device.objects.bulk_create(
+            Device(
+                name=f"Budget Device {num}",
+                device_type=self.device_template.device_type,
+                role=self.device_template.role,
+                location=self.location,
+                status=self.device_template.status,
+            )
+            for num in numbers
+        )
+        models.CheckedOutConsumable.objects.bulk_create(
+            models.CheckedOutConsumable(consumable_pool=self.pool, device=device, quantity=1)
+            for device in devices
+        )
+        models.ConsumablePool.adjust_used_quantity({self.pool.pk: count})
+
+    def _view_urls(self) -> dict[str, str]:
+        checked_out = models.CheckedOutConsumable.objects.filter(consumable_pool=self.pool).first()
+        device_tab_url = reverse(
+            "plugins:nautobot_consumables:device_consumables_tab",
+            kwargs={"pk": checked_out.device.pk},
+        )
+        location_tab_url = reverse(
+            "plugins:nautobot_consumables:location_consumables_tab",
+            kwargs={"pk": self.location.pk},
+        )
+
+        urls = {
+            "checkedoutconsumable": checked_out.get_absolute_url(),
+            "consumable": self.consumable.get_absolute_url(),
+            "consumablepool": self.pool.get_absolute_url(),
+            "consumabletype": self.consumable_type.get_absolute_url(),
+            "device_consumables_tab": f"{device_tab_url}?tab=nautobot_consumables:1",
+            "location_consumables_tab": f"{location_tab_url}?tab=nautobot_consumables:1",
+        }
+        for model_name in [
+            "checkedoutconsumable",
+            "consumable",
+            "consumablepool",
+            "consumabletype",
+        ]:
+            urls[f"{model_name}_list"] = reverse(f"plugins:nautobot_consumables:{model_name}_list")
+
+        return urls
+
+    def _query_count(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertHttpStatus(response, 200)
+
+        return len(queries)
+
+    def test_query_budgets(self):
+        """Test that no view runs more queries than its budget as the row counts grow."""
+        for scale in self.scales:
+            self._add_rows(scale - self.rows)
+            urls = self._view_urls()
+            if scale == self.scales[0]:
+                # Warm up the caches that are filled by the first request to each view
+                for url in urls.values():
+                    self._query_count(url)
+
+            for view_name, url in urls.items():
+                with self.subTest(view=view_name, rows=scale):
+                    self.assertLessEqual(self._query_count(url), QUERY_BUDGETS[view_name])
+
+
+class ViewQueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    """Check the view query budgets with small tables."""
+
+    scales = (10, 100)
+
+
+@tag("scale")
+class LargeViewQueryBudgetTestCase(QueryBudgetTestMixin, TestCase):
+    """Check the view query budgets with up to 10,000 rows, run with `--tag scale`."""
+
+    scales = (10, 1000, 10000)
+
+
+class BulkConfirmationQueryTestMixin:
+    """Select a growing number of pools for a bulk edit or delete and check the query counts."""
+
+    scales: tuple[int, ...] = ()
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Use a superuser so that the counts don't depend on permission constraints."""
+        super().setUp()
+        self.user.is_superuser = True
+        self.user.save()
+
+        self.location = Device.objects.first().location
+        self.consumable = models.Consumable.objects.create(
+            name="Bulk Consumable",
+            consumable_type=models.ConsumableType.objects.create(name="Bulk Type", schema={}),
+            schema={},
+            product_id="bulk",
+        )
+
+    def _pool_query_count(self, view_name: str, pks: list) -> tuple[int, bool]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse(f"plugins:nautobot_consumables:{view_name}"), {"pk": pks}
+            )
+        self.assertHttpStatus(response, 200)
+        pool_queries = [
+            query
+            for query in queries.captured_queries
+            if f'FROM "{models.ConsumablePool._meta.db_table}"' in query["sql"]
+        ]
+
+        return len(pool_queries), response.context["display_warning"]
+
+    def test_bulk_confirmation_queries(self):
+        """Test that the pools are queried the same number of times, however many are selected."""
+        pools = models.ConsumablePool.objects.bulk_create(
+            models.ConsumablePool(
+                name=f"Bulk Pool {num}",
+                consumable=self.consumable,
+                location=self.location,
+                quantity=10,
+            )
+            for num in range(max(self.scales))
+        )
+        models.ConsumablePool.adjust_used_quantity({pools[-1].pk: 1})
+
+        for view_name in ["consumablepool_bulk_edit", "consumablepool_bulk_delete"]:
+            counts = []
+            for scale in self.scales:
+                with self.subTest(view=view_name, pools=scale):
+                    count, display_warning = self._pool_query_count(
+                        view_name, [pool.pk for pool in pools[:scale]]
+                    )
+                    self.assertEqual(display_warning, scale == max(self.scales))
+                    counts.append(count)
+
+            with self.subTest(view=view_name):
+                self.assertEqual(len(set(counts)), 1, counts)
+
+
+class BulkConfirmationQueryTestCase(BulkConfirmationQueryTestMixin, TestCase):
+    """Check the bulk confirmation query counts with a few selected pools."""
+
+    scales = (10, 100)
+
+
+@tag("scale")
+class LargeBulkConfirmationQueryTestCase(BulkConfirmationQueryTestMixin, TestCase):
+    """Check the bulk confirmation query counts with up to 10,000 selected pools."""
+
+    scales = (10, 1000, 10000)
@@ -0,0 +1,170 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Check the PostgreSQL query plans of the main Nautobot Consumables list and tab queries."""
+
+from collections.abc import Iterator
+from typing import Any
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import QuerySet
+from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Device, Location
+
+from nautobot_consumables import models
+from nautobot_consumables.api.pagination import keyset_fields
+
+
+@skipUnless(connection.vendor == "postgresql", "The query plans are checked on PostgreSQL.")
+class QueryPlanTestCase(TestCase):
+    """Check that the list and tab queries use the indexes instead of scanning or sorting tables."""
+
+    scale = 5000
+
+    @classmethod
+    def setUpTestData(cls):
+        """Fill the tables with enough rows that the planner prefers the indexes where it can."""
+        template = Device.objects.first()
+        locations = Location.objects.bulk_create(
+            Location(
+                name=f"Plan Location {num}",
+                location_type=template.location.location_type,
+                parent=template.location.parent,
+                status=template.location.status,
+            )
+            for num in range(cls.scale // 10)
+        )
+        types = models.ConsumableType.objects.bulk_create(
+            models.ConsumableType(name=f"Plan Type {num}", schema={}) for num in range(10)
+        )
+        consumables = models.Consumable.objects.bulk_create(
+            models.Consumable(
+                name=f"Plan Consumable {num}",
+                consumable_type=types[num % len(types)],
+                product_id=f"plan_{num}",
+                schema={},
+            )
+            for num in range(cls.scale)
+        )
+        pools = models.ConsumablePool.objects.bulk_create(
+            models.ConsumablePool(
+                name=f"Plan Pool {num}",
+                consumable=consumable,
+                location=locations[num % len(locations)],
+                quantity=10,
+                used_quantity=1,
+            )
+            for num, consumable in enumerate(consumables)
+        )
+        devices = Device.objects.bulk_create(
+            Device(
+                name=f"Plan Device {num}",
+                device_type=template.device_type,
+                role=template.role,
+                location=pool.location,
+                status=template.status,
+            )
+            for num, pool in enumerate(pools)
+        )
+        models.CheckedOutConsumable.objects.bulk_create(
+            models.CheckedOutConsumable(consumable_pool=pool, device=device, quantity=1)
+            for pool, device in zip(pools, devices, strict=True)
+        )
+
+        with connection.cursor() as cursor:
+            for model in (
+                models.CheckedOutConsumable,
+                models.Consumable,
+                models.ConsumablePool,
+                models.ConsumableType,
+                Device,
+                Location,
+            ):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        cls.pool = pools[0]
+        cls.device = devices[0]
+
+    @staticmethod
+    def _plan_nodes(queryset: QuerySet) -> Iterator[dict[str, Any]]:
+        """Yield every node of the plan of a query."""
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            nodes = [cursor.fetchone()[0][0]["Plan"]]
+
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get("Plans", []))
+            yield node
+
+    def assertIndexedPlan(self, queryset: QuerySet, sorted_rows: bool = False):  # pylint: disable=invalid-name
+        """Assert that a query doesn't scan any app table, and optionally doesn't sort."""
+        for node in self._plan_nodes(queryset):
+            relation = node.get("Relation Name", "")
+            if relation.startswith("nautobot_consumables_"):
+                self.assertNotEqual(node["Node Type"], "Seq Scan", f"{relation} is scanned")
+            if sorted_rows:
+                self.assertNotEqual(node["Node Type"], "Sort", "the rows are sorted")
+
+    def test_list_plans(self):
+        """Test that the first page of a list is read in order from an index, without a full sort."""
+        queries = {
+            "checkouts": models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__consumable", "consumable_pool__location", "device"
+            ),
+            "consumables": models.Consumable.objects.select_related(
+                "consumable_type", "manufacturer"
+            ),
+            "pools": models.ConsumablePool.objects.with_usage().select_related(
+                "consumable", "location"
+            ),
+        }
+        for name, queryset in queries.items():
+            with self.subTest(query=name):
+                self.assertIndexedPlan(queryset[:50], sorted_rows=True)
+            with self.subTest(query=f"{name} by cursor"):
+                fields = keyset_fields(queryset.model)
+                self.assertIndexedPlan(queryset.order_by(*fields)[:50], sorted_rows=True)
+
+    def test_tab_plans(self):
+        """Test that the detail page and tab tables only read the rows they show."""
+        location = self.pool.location
+        queries = {
+            "consumable pools": models.ConsumablePool.objects.with_usage()
+            .select_related("location")
+            .filter(consumable=self.pool.consumable_id),
+            "pool checkouts": models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__location", "device"
+            ).filter(consumable_pool=self.pool),
+            "device checkouts": models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__location"
+            ).filter(device__pk=self.device.pk),
+            "device pools": models.ConsumablePool.objects.with_usage()
+            .select_related("consumable")
+            .filter(location__pk=location.pk)
+            .exclude(checked_out__device__pk=self.device.pk),
+            "location pools": models.ConsumablePool.objects.with_usage()
+            .select_related("consumable")
+            .filter(location=location.pk),
+            "location checkouts": models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__location", "device"
+            ).filter(consumable_pool__location=location.pk),
+        }
+        for name, queryset in queries.items():
+            with self.subTest(query=name):
+                self.assertIndexedPlan(queryset)
@@ -1,6 +1,7 @@
 """Tests for template extensions defined in the Consumables app."""
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.test.utils import override_settings
 from nautobot.core.testing import extract_page_body
 from nautobot.core.testing.views import ModelViewTestCase
@@ -8,6 +9,13 @@ from nautobot.dcim.models import Device, DeviceType, Location, LocationType
 from nautobot.extras.models import Role, Status
 from nautobot.users.models import ObjectPermission
 
+from nautobot_consumables.models import (
+    CheckedOutConsumable,
+    ConsumablePool,
+    LocationConsumableSummary,
+)
+from nautobot_consumables.utils import tab_count_cache_key
+
 
 class DeviceViewTemplateExtensionsTestCase(ModelViewTestCase):
     """Test the template extensions on a device detail view."""
@@ -61,6 +69,44 @@ class DeviceViewTemplateExtensionsTestCase(ModelViewTestCase):
 
         self.assertNotIn("consumables?tab=nautobot_consumables:1", response_body, msg=response_body)
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_consumables_count_is_cached(self):
+        """Test that the tab count is cached until a change to the Device's checkouts commits."""
+        checked_out = CheckedOutConsumable.objects.first()
+        instance = checked_out.device
+        count = CheckedOutConsumable.objects.filter(device=instance).count()
+        cache_key = tab_count_cache_key("device", instance.pk)
+        self.add_permissions("dcim.view_device")
+
+        response = self.client.get(instance.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(cache.get(cache_key), count)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            checked_out.delete()
+            self.assertEqual(cache.get(cache_key), count)
+        self.assertIsNone(cache.get(cache_key))
+
+        response = self.client.get(instance.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(cache.get(cache_key), count - 1)
+
+    @override_settings(
+        EXEMPT_VIEW_PERMISSIONS=["*"],
+        PLUGINS_CONFIG={"nautobot_consumables": {"tab_badge_counts": False}},
+    )
+    def test_get_instance_without_badge_counts(self):
+        """Test that the tab is shown without counting the checkouts when the badge is disabled."""
+        instance = self._get_queryset().filter(consumables__isnull=False).first()
+        self.add_permissions("dcim.view_device")
+
+        response = self.client.get(instance.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        response_body = extract_page_body(response.content.decode(response.charset))
+
+        self.assertIn("consumables?tab=nautobot_consumables:1", response_body, msg=response_body)
+        self.assertIsNone(cache.get(tab_count_cache_key("device", instance.pk)))
+
 
 class LocationViewTemplateExtensionsTestCase(ModelViewTestCase):
     """Test the template extensions on a device detail view."""
@@ -87,7 +133,11 @@ class LocationViewTemplateExtensionsTestCase(ModelViewTestCase):
     @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
     def test_get_instance_without_consumable_pools(self):
         """Test that the Consumables tab does not appear in the detail view."""
-        instance = self._get_queryset().filter(consumable_pools__isnull=True).first()
+        instance = (
+            self._get_queryset()
+            .exclude(pk__in=LocationConsumableSummary.objects.values("location"))
+            .first()
+        )
 
         obj_perm = ObjectPermission(name="Test Permission", actions=["view"])
         obj_perm.save()
@@ -100,3 +150,56 @@ class LocationViewTemplateExtensionsTestCase(ModelViewTestCase):
         response_body = extract_page_body(response.content.decode(response.charset))
 
         self.assertNotIn("consumables?tab=nautobot_consumables:1", response_body, msg=response_body)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_pools_count_includes_descendants(self):
+        """Test that the tab of a Location counts the pools of its descendants too."""
+        parent = Location.objects.create(
+            name="Tab Parent",
+            location_type=LocationType.objects.create(name="Tab Region"),
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        child = Location.objects.create(
+            name="Tab Child",
+            location_type=LocationType.objects.create(name="Tab Site", parent=parent.location_type),
+            parent=parent,
+            status=parent.status,
+        )
+        pool = ConsumablePool.objects.create(
+            name="Tab Pool",
+            consumable=ConsumablePool.objects.first().consumable,
+            location=child,
+            quantity=1,
+        )
+        self.add_permissions("dcim.view_location")
+
+        response = self.client.get(parent.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        response_body = extract_page_body(response.content.decode(response.charset))
+
+        self.assertIn("consumables?tab=nautobot_consumables:1", response_body, msg=response_body)
+        self.assertEqual(cache.get(tab_count_cache_key("location", parent.pk)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pool.delete()
+        self.assertIsNone(cache.get(tab_count_cache_key("location", parent.pk)))
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
+    def test_pools_count_is_invalidated_on_move(self):
+        """Test that moving a pool drops the cached counts of both Locations."""
+        pool = ConsumablePool.objects.filter(checked_out__isnull=True).first()
+        old_location = pool.location
+        new_location = self._get_queryset().exclude(pk=old_location.pk).first()
+        self.add_permissions("dcim.view_location")
+
+        for location in (old_location, new_location):
+            response = self.client.get(location.get_absolute_url())
+            self.assertHttpStatus(response, 200)
+            self.assertIsNotNone(cache.get(tab_count_cache_key("location", location.pk)))
+
+        pool.location = new_location
+        with self.captureOnCommitCallbacks(execute=True):
+            pool.save()
+
+        for location in (old_location, new_location):
+            self.assertIsNone(cache.get(tab_count_cache_key("location", location.pk)))
@@ -17,15 +17,21 @@
 """Tests for views defined in the Nautobot Consumables app."""
 
 from copy import copy
+import csv
 import json
 
 from django.contrib.contenttypes.models import ContentType
 from django.test.utils import override_settings
+from django.urls import reverse
 from nautobot.core.testing import ViewTestCases, extract_page_body
 from nautobot.dcim.models import Device, Location, Manufacturer
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import ObjectChange
 from nautobot.users.models import ObjectPermission
 
 from nautobot_consumables import models
+from nautobot_consumables.choices import ReorderThresholdUnitChoices
+from nautobot_consumables.views import PAGE_SIZE
 
 
 class CheckedOutConsumableViewTestCase(
@@ -105,6 +111,7 @@ class ConsumableViewTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             "manufacturer": manufacturer.pk,
             "product_id": "test04",
             "consumable_type": generic.pk,
+            "reorder_threshold_unit": ReorderThresholdUnitChoices.UNIT_ABSOLUTE,
         }
 
         cls.bulk_edit_data = {"manufacturer": Manufacturer.objects.last().pk}
@@ -174,6 +181,48 @@ class ConsumableViewTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             msg=response_body,
         )
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_streaming_export(self):
+        """Test streaming the filtered Consumables with their data flattened into columns."""
+        consumable_type = models.ConsumableType.objects.create(
+            name="Export Type",
+            schema={
+                "type": "object",
+                "properties": {"color": {"type": "string"}, "length": {"type": "integer"}},
+            },
+        )
+        models.Consumable.objects.create(
+            name="Export Consumable",
+            consumable_type=consumable_type,
+            product_id="export01",
+            data={"color": "Blue", "length": 3},
+        )
+        url = reverse("plugins:nautobot_consumables:consumable_export")
+        querystring = f"consumable_type={consumable_type.pk}&page=2"
+
+        response = self.client.get(f"{url}?{querystring}")
+        self.assertHttpStatus(response, 403)
+
+        self.add_permissions("nautobot_consumables.view_consumable")
+        response = self.client.get(f"{url}?{querystring}")
+        self.assertHttpStatus(response, 200)
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["name"], "Export Consumable")
+        self.assertEqual(rows[0]["consumable_type"], "Export Type")
+        self.assertEqual(rows[0]["data.color"], "Blue")
+        self.assertEqual(rows[0]["data.length"], "3")
+
+        response = self.client.get(f"{url}?{querystring}&export_format=jsonl")
+        self.assertHttpStatus(response, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["data.length"], 3)
+
+        response = self.client.get(f"{url}?{querystring}&export_format=xlsx")
+        self.assertHttpStatus(response, 400)
+
     @override_settings(EXEMPT_VIEW_PERMISSIONS=["*"])
     def test_edit_object_with_permission(self):
         """Handle the form idiosyncracies."""
@@ -213,6 +262,8 @@ class ConsumablePoolViewTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             "consumable": consumable.pk,
             "location": location.pk,
             "quantity": 42,
+            "reorder_threshold": 10,
+            "reorder_threshold_unit": ReorderThresholdUnitChoices.UNIT_PERCENT,
         }
         cls.bulk_edit_data = {
             "location": location.pk,
@@ -264,6 +315,101 @@ class ConsumablePoolViewTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             msg=response_body,
         )
 
+    def test_bulk_edit_change_log(self):
+        """Test that a bulk edit records a change for each pool and each checkout checked in."""
+        self.add_permissions(
+            "nautobot_consumables.change_consumablepool",
+            "nautobot_consumables.view_consumablepool",
+            "dcim.view_location",
+        )
+        # Top level Locations, whose display names are plain ASCII
+        locations = Location.objects.filter(parent__isnull=True)[:2]
+        pools = [
+            models.ConsumablePool.objects.create(
+                name=f"Bulk Edit Pool {num}",
+                consumable=models.Consumable.objects.first(),
+                location=locations[0],
+                quantity=5,
+            )
+            for num in range(3)
+        ]
+        data = {
+            "pk": [pool.pk for pool in pools],
+            "location": locations[1].pk,
+            "quantity": 7,
+            "_apply": True,
+        }
+        response = self.client.post(
+            reverse("plugins:nautobot_consumables:consumablepool_bulk_edit"), data
+        )
+
+        self.assertHttpStatus(response, 302)
+        self.assertEqual(
+            set(
+                models.ConsumablePool.objects.filter(pk__in=data["pk"]).values_list(
+                    "location", "quantity"
+                )
+            ),
+            {(locations[1].pk, 7)},
+        )
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_id__in=data["pk"],
+                action=ObjectChangeActionChoices.ACTION_UPDATE,
+            ).count(),
+            3,
+        )
+
+    def test_get_object_paginates_checked_out_consumables(self):
+        """Test that the detail view only renders one page of the Checked Out Consumables table."""
+        self.add_permissions("nautobot_consumables.view_consumablepool")
+        template = Device.objects.first()
+        pool = models.ConsumablePool.objects.create(
+            name="Paginated Pool",
+            consumable=models.Consumable.objects.first(),
+            location=template.location,
+            quantity=100,
+        )
+        devices = Device.objects.bulk_create(
+            Device(
+                name=f"Paginated Device {num}",
+                device_type=template.device_type,
+                role=template.role,
+                location=template.location,
+                status=template.status,
+            )
+            for num in range(PAGE_SIZE + 5)
+        )
+        models.CheckedOutConsumable.objects.bulk_create(
+            models.CheckedOutConsumable(consumable_pool=pool, device=device, quantity=1)
+            for device in devices
+        )
+        models.ConsumablePool.adjust_used_quantity({pool.pk: len(devices)})
+
+        response = self.client.get(pool.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        table = response.context["table_checkedoutconsumables"]
+        self.assertFalse(response.context["disable_pagination"])
+        self.assertEqual(table.paginator.count, PAGE_SIZE + 5)
+        self.assertEqual(len(table.page.object_list), PAGE_SIZE)
+
+        response = self.client.get(f"{pool.get_absolute_url()}?checkedout_page=2")
+        self.assertHttpStatus(response, 200)
+        table = response.context["table_checkedoutconsumables"]
+        self.assertEqual(table.page.number, 2)
+        self.assertEqual(len(table.page.object_list), 5)
+        self.assertIn("checkedout_page=1", extract_page_body(response.content.decode()))
+
+        # A page size below the default, with fewer rows than the default, still paginates
+        models.CheckedOutConsumable.objects.filter(device__in=devices[20:]).delete()
+        response = self.client.get(f"{pool.get_absolute_url()}?checkedout_per_page=10")
+        self.assertHttpStatus(response, 200)
+        table = response.context["table_checkedoutconsumables"]
+        self.assertFalse(response.context["disable_pagination"])
+        self.assertEqual(table.paginator.count, 20)
+        self.assertEqual(len(table.page.object_list), 10)
+        self.assertIn("checkedout_page=2", extract_page_body(response.content.decode()))
+
 
 class ConsumableTypeViewTestCase(
     ViewTestCases.GetObjectViewTestCase,
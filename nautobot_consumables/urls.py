@@ -31,6 +31,21 @@ router.register("consumable-pools", views.ConsumablePoolUIViewSet)
 router.register("consumable-types", views.ConsumableTypeUIViewSet)
 
 urlpatterns = [
+    path(
+        "checked-out-consumables/export/",
+        views.CheckedOutConsumableExportView.as_view(),
+        name="checkedoutconsumable_export",
+    ),
+    path(
+        "consumables/export/",
+        views.ConsumableExportView.as_view(),
+        name="consumable_export",
+    ),
+    path(
+        "consumable-pools/export/",
+        views.ConsumablePoolExportView.as_view(),
+        name="consumablepool_export",
+    ),
     path(
         "devices/<uuid:pk>/consumables",
         views.DeviceConsumablesViewTab.as_view(),
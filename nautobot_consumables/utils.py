@@ -0,0 +1,430 @@
+#  SPDX-FileCopyrightText: Copyright (c) "2024" NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+#  SPDX-License-Identifier: Apache-2.0
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""Utility functions for Nautobot Consumables."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable, Iterable
+from functools import lru_cache
+import json
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
+from jsonschema import draft4_format_checker  # pylint: disable=no-name-in-module
+from jsonschema.exceptions import ValidationError as JSONSchemaValidationError
+from jsonschema.validators import Draft4Validator
+from nautobot.dcim.models import Location
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.constants import CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
+from nautobot.extras.models import Note, ObjectChange, TaggedItem
+from nautobot.extras.signals import change_context_state
+
+from nautobot_consumables.summaries import location_ancestors
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None  # type: ignore[assignment]
+
+SCHEMA_VALIDATOR_CACHE_SIZE = 256
+
+
+def bulk_record_object_changes(
+    instances: Iterable[models.Model],
+    action: str = ObjectChangeActionChoices.ACTION_CREATE,
+    batch_size: int = 1000,
+) -> None:
+    """
+    Record ObjectChanges for objects written with a set-based query.
+
+    Methods like `bulk_create()` and `update()` do not send the signals that create change log
+    entries, so the entries are built here from the active change context and inserted in bulk.
+    Nothing is recorded when change logging is not enabled, matching the signal handlers.
+    """
+    change_context = change_context_state.get()
+    if change_context is None:
+        return
+
+    user = change_context.get_user()
+    object_changes = []
+    for instance in instances:
+        object_change = instance.to_objectchange(action)
+        object_change.user = user
+        object_change.user_name = getattr(user, "username", "")
+        object_change.request_id = change_context.change_id
+        object_change.change_context = change_context.context
+        object_change.change_context_detail = change_context.context_detail[
+            :CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
+        ]
+        object_changes.append(object_change)
+
+    ObjectChange.objects.bulk_create(object_changes, batch_size=batch_size)
+
+
+def raw_delete(queryset: models.QuerySet) -> int:
+    """
+    Delete the objects in a queryset with a single query, returning how many were deleted.
+
+    Unlike `delete()`, the objects aren't loaded, nothing is cascaded and no signals are sent, so
+    the caller has to do anything the signal handlers would, and delete any dependent objects.
+    """
+    return queryset._raw_delete(queryset.db)  # pylint: disable=protected-access
+
+
+def delete_related_objects(model: type[models.Model], pks: Iterable[Any]) -> None:
+    """
+    Delete the tags, notes and other generic relations of objects deleted with `raw_delete()`.
+
+    The tags are deleted with a single query. The relationship and contact associations and the
+    notes are deleted with `delete()`, so they're change logged, at one query each when there are
+    none.
+    """
+    pks = list(pks)
+    content_type = ContentType.objects.get_for_model(model)
+    raw_delete(TaggedItem.objects.filter(content_type=content_type, object_id__in=pks))
+    for field in model._meta.private_fields:
+        if isinstance(field, GenericRelation) and field.related_model is not TaggedItem:
+            field.related_model.objects.filter(
+                **{
+                    field.content_type_field_name: content_type,
+                    f"{field.object_id_field_name}__in": pks,
+                }
+            ).delete()
+    Note.objects.filter(assigned_object_type=content_type, assigned_object_id__in=pks).delete()
+
+
+def natural_key_related_lookups(model: type[models.Model]) -> list[str]:
+    """
+    Get the `select_related()` lookups needed to build the natural keys of a model's instances.
+
+    Natural keys can span several related objects, e.g. a Location's natural key includes all of
+    its ancestors, so serializing the `natural_slug` of a list of objects would otherwise run extra
+    queries for each object.
+    """
+    return sorted(
+        {lookup.rsplit("__", 1)[0] for lookup in model.natural_key_field_lookups if "__" in lookup}
+    )
+
+
+def tab_count_cache_key(model_name: str, pk: Any) -> str:
+    """
+    Get the cache key for a Device or Location Consumables tab count.
+
+    The `device` counts are the checkouts of a Device, the `location` counts the pools of a
+    Location and its descendants, and the `location_pools` counts the pools of the Location only.
+    """
+    return f"nautobot_consumables.tab_count.{model_name}.{pk}"
+
+
+def cached_tab_count(model_name: str, pk: Any, count: Callable[[], int]) -> int:
+    """
+    Get a count of objects, caching it for a Device or Location detail page tab.
+
+    The cached counts are dropped by `invalidate_tab_counts()` whenever the CheckedOutConsumables
+    or ConsumablePools they count are changed, so the `count` queries only run again after a
+    change or once the `tab_count_cache_timeout` has passed.
+    """
+    key = tab_count_cache_key(model_name, pk)
+    cached = cache.get(key)
+    if cached is None:
+        cached = count()
+        config = settings.PLUGINS_CONFIG.get("nautobot_consumables", {})
+        cache.set(key, cached, config.get("tab_count_cache_timeout", 3600))
+
+    return int(cached)
+
+
+def invalidate_tab_counts(
+    device_pks: Iterable[Any] = (),
+    location_pks: Iterable[Any] = (),
+) -> None:
+    """
+    Drop the cached Consumables tab counts for the given Devices and Locations.
+
+    The Location counts include the pools of the descendants, so those of the ancestors of the
+    Locations are dropped as well. The counts are dropped once the transaction commits, so that
+    a concurrent request can't cache the count from before the change again.
+    """
+    device_pks = {pk for pk in device_pks if pk is not None}
+    location_pks = {pk for pk in location_pks if pk is not None}
+    if device_pks or location_pks:
+        transaction.on_commit(lambda: _delete_tab_counts(device_pks, location_pks))
+
+
+def _delete_tab_counts(device_pks: set[Any], location_pks: set[Any]) -> None:
+    keys = [tab_count_cache_key("device", pk) for pk in device_pks]
+    keys.extend(tab_count_cache_key("location_pools", pk) for pk in location_pks)
+    if location_pks:
+        keys.extend(
+            tab_count_cache_key("location", ancestor_pk)
+            for ancestor_pk in set().union(*location_ancestors(Location, location_pks).values())
+        )
+    cache.delete_many(keys)
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+class SchemaDataError(ValueError):
+    """Data failed validation against a JSON schema, raised the same way by every schema engine."""
+
+    def __init__(self, message: str, path: Iterable[Any] = ()) -> None:
+        """Store the message and the path to the invalid value in the data."""
+        super().__init__(message)
+        self.message = message
+        self.path = [str(item) for item in path]
+
+
+class SchemaValidator(ABC):  # pylint: disable=too-few-public-methods
+    """Validate data against a JSON schema that has been checked against the Draft 4 metaschema."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        """
+        Check the schema and prepare the validator.
+
+        Raises:
+            SchemaError: If the schema is not a valid Draft 4 JSON schema.
+        """
+        Draft4Validator.check_schema(schema)
+        self.schema = schema
+
+    @abstractmethod
+    def validate(self, data: Any) -> None:
+        """
+        Validate data against the schema.
+
+        Raises:
+            SchemaDataError: If the data is not valid.
+        """
+
+
+class JSONSchemaValidator(SchemaValidator):  # pylint: disable=too-few-public-methods
+    """Validate data with the `jsonschema` package."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        """Check the schema and build a Draft4Validator for it."""
+        super().__init__(schema)
+        self.validator = Draft4Validator(schema, format_checker=draft4_format_checker)
+
+    def validate(self, data: Any) -> None:
+        """Validate data against the schema."""
+        try:
+            self.validator.validate(data)
+        except JSONSchemaValidationError as error:
+            raise SchemaDataError(error.message, error.path) from error
+
+
+class FastJSONSchemaValidator(SchemaValidator):  # pylint: disable=too-few-public-methods
+    """
+    Validate data with the optional `fastjsonschema` package.
+
+    The schema is compiled to a Python function, which validates much faster than `jsonschema`.
+    Error messages for the common keywords are reworded to match the `jsonschema` ones, but when
+    the data has several errors the two engines may report different ones.
+    """
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        """Check the schema and compile it to a validation function."""
+        if fastjsonschema is None:
+            raise ImproperlyConfigured(
+                'The "fastjsonschema" schema engine requires the fastjsonschema package.'
+            )
+
+        super().__init__(schema)
+        self.validator = fastjsonschema.compile(
+            {**schema, "$schema": "http://json-schema.org/draft-04/schema#"},
+            use_default=False,
+        )
+
+    def validate(self, data: Any) -> None:
+        """Validate data against the schema."""
+        try:
+            self.validator(data)
+        except fastjsonschema.JsonSchemaValueException as error:
+            # The first path item is the name of the validated variable, i.e. "data"
+            raise SchemaDataError(self._message(error), error.path[1:]) from error
+
+    @staticmethod
+    def _message(error) -> str:
+        """Reword a fastjsonschema error message to match the jsonschema one."""
+        value, rule_definition = error.value, error.rule_definition
+        if error.rule == "required":
+            missing = [key for key in rule_definition if key not in value]
+            return f"{missing[0]!r} is a required property"
+        if error.rule == "additionalProperties":
+            extras = sorted(set(value) - set(error.definition.get("properties", {})))
+            verb = "was" if len(extras) == 1 else "were"
+            extra_list = ", ".join(repr(extra) for extra in extras)
+            return f"Additional properties are not allowed ({extra_list} {verb} unexpected)"
+        if error.rule == "type" and value not in error.definition.get("enum", [value]):
+            # jsonschema reports the enum, rather than the type, when a value fails both
+            return f"{value!r} is not one of {error.definition['enum']!r}"
+        if error.rule == "type":
+            types = rule_definition if isinstance(rule_definition, list) else [rule_definition]
+            return f"{value!r} is not of type {', '.join(repr(item) for item in types)}"
+
+        messages = {
+            "enum": f"{value!r} is not one of {rule_definition!r}",
+            "minimum": f"{value!r} is less than the minimum of {rule_definition!r}",
+            "maximum": f"{value!r} is greater than the maximum of {rule_definition!r}",
+            "minLength": f"{value!r} is too short",
+            "maxLength": f"{value!r} is too long",
+            "pattern": f"{value!r} does not match {rule_definition!r}",
+        }
+        return messages.get(error.rule, error.message)
+
+
+SCHEMA_ENGINES: dict[str, type[SchemaValidator]] = {
+    "jsonschema": JSONSchemaValidator,
+    "fastjsonschema": FastJSONSchemaValidator,
+}
+
+
+def get_schema_validator(schema: dict[str, Any], engine: str | None = None) -> SchemaValidator:
+    """
+    Get a checked validator for a JSON schema, reusing it for every object with the same schema.
+
+    Checking a schema and building its validator is much slower than validating data against it,
+    and a bulk import usually validates many objects against the schema of a single
+    ConsumableType. The validators are kept in a per-process LRU cache keyed by the engine and the
+    canonical JSON of the schema, with its keys sorted, so schemas that only differ in key order
+    share a validator. See `schema_validator_cache_info()` for its statistics.
+
+    The validator uses the `engine` from `SCHEMA_ENGINES` given, defaulting to the app's
+    `schema_engine` setting.
+
+    Raises:
+        ImproperlyConfigured: If the schema engine is unknown or its package isn't installed.
+        SchemaError: If the schema is not a valid Draft 4 JSON schema.
+    """
+    if engine is None:
+        config = settings.PLUGINS_CONFIG.get("nautobot_consumables", {})
+        engine = config.get("schema_engine", "jsonschema")
+    if engine not in SCHEMA_ENGINES:
+        raise ImproperlyConfigured(
+            f'Unknown schema engine "{engine}", choose one of: {", ".join(SCHEMA_ENGINES)}'
+        )
+
+    return _schema_validator(engine, _canonical_json(schema))
+
+
+@lru_cache(maxsize=SCHEMA_VALIDATOR_CACHE_SIZE)
+def _schema_validator(engine: str, canonical: str) -> SchemaValidator:
+    return SCHEMA_ENGINES[engine](json.loads(canonical))
+
+
+def schema_validator_cache_info() -> dict[str, int]:
+    """Get the hits, misses, current size and maximum size of the schema validator cache."""
+    # pylint mistakes the lru_cache statistics method for a call of the cached function
+    return _schema_validator.cache_info()._asdict()  # pylint: disable=no-value-for-parameter
+
+
+def clear_schema_validator_cache() -> None:
+    """Empty the schema validator cache and reset its statistics."""
+    _schema_validator.cache_clear()
+
+
+class RenderPlanItem(NamedTuple):
+    """How to show one JSON schema property in `JSONModel.template_details`."""
+
+    key: str
+    details: dict[str, Any]
+    is_color: bool
+    enum_titles: dict[Any, str] | None
+    unit_key: str | None
+
+    def render(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Get the details for this property from an object's data."""
+        details = dict(self.details)
+        value = data.get(self.key)
+        if self.is_color:
+            details["background_color"] = value
+
+        if self.unit_key is not None:
+            value = f"{value}{data.get(self.unit_key)}"
+        elif self.enum_titles is not None:
+            try:
+                value = self.enum_titles.get(value, value)
+            except TypeError:  # Unhashable values, e.g. lists, can't have a title
+                pass
+
+        details["value"] = value
+        return details
+
+
+def get_render_plan(schema: dict[str, Any]) -> tuple[RenderPlanItem, ...]:
+    """
+    Get the precomputed steps to show data for a JSON schema, reusing them for identical schemas.
+
+    The plan holds the properties to show in display order, with their titles, enum value titles
+    and `*_unit` pairings, so rendering an object's data is a single pass over the plan. Plans are
+    kept in a per-process LRU cache keyed by the canonical JSON of the schema, with its keys
+    sorted, and the order of its properties, which breaks ties in the `propertyOrder` sort.
+    """
+    return _render_plan(_canonical_json(schema), tuple(schema.get("properties", {})))
+
+
+@lru_cache(maxsize=SCHEMA_VALIDATOR_CACHE_SIZE)
+def _render_plan(canonical: str, property_keys: tuple[str, ...]) -> tuple[RenderPlanItem, ...]:
+    # The canonical JSON has its keys sorted, so put the properties back in the schema order
+    schema_properties = json.loads(canonical).get("properties", {})
+    properties: dict[str, Any] = {key: schema_properties[key] for key in property_keys}
+
+    # Properties named "*_unit" are shown combined with the corresponding property value, e.g.
+    # `length = 1` and `length_unit = "ft"` combine to `1ft`
+    unit_keys = {}
+    for key in properties:
+        if key.endswith("unit") and properties.get(prop := key.removesuffix("unit").rstrip("_")):
+            unit_keys[prop] = key
+
+    plan = []
+    for key, prop_schema in properties.items():
+        if key in unit_keys.values():
+            continue
+
+        details: dict[str, Any] = {"title": prop_schema.get("title") or key}
+        if prop_schema.get("type") == "array":
+            details["array"] = True
+        if property_order := prop_schema.get("propertyOrder"):
+            details["propertyOrder"] = property_order
+
+        enum_titles = None
+        if prop_schema.get("enum") and (
+            titles := prop_schema.get("options", {}).get("enum_titles")
+        ):
+            enum_titles = {
+                value: title
+                for value, title in zip(prop_schema["enum"], titles, strict=False)
+                if isinstance(value, Hashable)
+            }
+
+        plan.append(
+            RenderPlanItem(
+                key=key,
+                details=details,
+                is_color=str(prop_schema.get("title", "")).lower() == "color",
+                enum_titles=enum_titles,
+                unit_key=unit_keys.get(key),
+            )
+        )
+
+    return tuple(sorted(plan, key=lambda item: item.details.get("propertyOrder", 1000)))
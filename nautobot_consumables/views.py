@@ -19,21 +19,52 @@
 from typing import Type
 
 from django.contrib import messages
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.http import HttpResponseBadRequest
 from django.urls import reverse
+from django.views.generic import View
+from django_tables2 import RequestConfig
+from nautobot.apps.filters import NautobotFilterSet
 from nautobot.apps.tables import BaseTable
-from nautobot.apps.views import NautobotUIViewSet
+from nautobot.apps.utils import get_permission_for_model
+from nautobot.apps.views import EnhancedPaginator, NautobotUIViewSet, ObjectPermissionRequiredMixin
 from nautobot.core.views import generic
 from nautobot.dcim.models import Device, Location
-from nautobot.extras.models import CustomField
+from nautobot.extras.models import CustomField, Note
 
 from nautobot_consumables import filters, forms, models, tables
 from nautobot_consumables.api import serializers
+from nautobot_consumables.exports import (
+    EXPORT_FORMATS,
+    NON_FILTER_PARAMS,
+    streaming_export_response,
+)
+from nautobot_consumables.utils import bulk_record_object_changes
 
 PAGE_SIZE = 25
 
 
+def paginate_table(request, table: BaseTable) -> bool:
+    """
+    Paginate a table embedded in a detail view or tab.
+
+    Each embedded table needs its own `prefix` so that its page, page size and sort order can be
+    set from the query string independently of the other tables on the page. Only the rows of
+    the visible page are fetched from the database.
+
+    Returns:
+        bool: True if the whole table fits on a single page, i.e. the paginator can be hidden.
+    """
+    RequestConfig(
+        request,
+        paginate={"paginator_class": EnhancedPaginator, "per_page": PAGE_SIZE},
+    ).configure(table)
+
+    return table.paginator.num_pages <= 1
+
+
 class CheckedOutConsumableUIViewSet(NautobotUIViewSet):
     """UI view set for CheckedOutConsumables."""
 
@@ -43,7 +74,10 @@ class CheckedOutConsumableUIViewSet(NautobotUIViewSet):
     filterset_form_class = forms.CheckedOutConsumableFilterForm
     form_class = forms.CheckedOutConsumableForm
     lookup_field = "pk"
-    queryset = models.CheckedOutConsumable.objects.all()
+    queryset = models.CheckedOutConsumable.objects.select_related(
+        "consumable_pool__location",
+        "device",
+    ).prefetch_related("tags")
     serializer_class = serializers.CheckedOutConsumableSerializer
     table_class = tables.CheckedOutConsumableTable
     bulk_table_class = tables.CheckedOutConsumableBulkEditTable
@@ -75,7 +109,7 @@ class ConsumableUIViewSet(NautobotUIViewSet):
     filterset_form_class = forms.ConsumableFilterForm
     form_class = forms.ConsumableForm
     lookup_field = "pk"
-    queryset = models.Consumable.objects.all()
+    queryset = models.Consumable.objects.select_related("consumable_type", "manufacturer")
     serializer_class = serializers.ConsumableSerializer
     table_class = tables.ConsumableTable
     bulk_table_class = tables.ConsumableBulkEditTable
@@ -89,13 +123,17 @@ class ConsumableUIViewSet(NautobotUIViewSet):
 
         if self.action == "retrieve":
             context["table_consumablepools"] = tables.ConsumablePoolDetailConsumableTable(
-                models.ConsumablePool.objects.filter(consumable=instance.pk)
+                models.ConsumablePool.objects.with_usage()
+                .select_related("location")
+                .filter(consumable=instance.pk),
+                prefix="pools_",
             )
             if request.user.has_perm("nautobot_consumables.change_consumablepool"):
                 context["table_consumablepools"].columns.show("pk")
 
-            row_count = len(context["table_consumablepools"].rows)
-            context["disable_pagination"] = row_count <= PAGE_SIZE
+            context["disable_pagination"] = paginate_table(
+                request, context["table_consumablepools"]
+            )
 
         return context
 
@@ -123,7 +161,9 @@ class ConsumablePoolUIViewSet(NautobotUIViewSet):
     filterset_form_class = forms.ConsumablePoolFilterForm
     form_class = forms.ConsumablePoolForm
     lookup_field = "pk"
-    queryset = models.ConsumablePool.objects.all()
+    queryset = models.ConsumablePool.objects.with_usage().select_related(
+        "consumable", "location", "forecast"
+    )
     serializer_class = serializers.ConsumablePoolSerializer
     table_class = tables.ConsumablePoolTable
     bulk_table_class = tables.ConsumablePoolBulkEditTable
@@ -135,31 +175,36 @@ class ConsumablePoolUIViewSet(NautobotUIViewSet):
         context = super().get_extra_context(request, instance)
 
         if self.action == "retrieve":
-            checked_out_consumables = models.CheckedOutConsumable.objects.filter(
-                consumable_pool=instance,
-            )
+            checked_out_consumables = models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__location",
+                "device",
+            ).filter(consumable_pool=instance)
             context["table_checkedoutconsumables"] = tables.CheckedOutConsumableTable(
-                checked_out_consumables
+                checked_out_consumables,
+                prefix="checkedout_",
             )
             if request.user.has_perm("nautobot_consumables.change_checkedoutconsumable"):
                 context["table_checkedoutconsumables"].columns.show("pk")
 
-            row_count = len(context["table_checkedoutconsumables"].rows)
-            context["disable_pagination"] = row_count <= PAGE_SIZE
+            context["disable_pagination"] = paginate_table(
+                request, context["table_checkedoutconsumables"]
+            )
 
         if self.action == "update":
             if instance is None:
-                instance = self.get_object()
+                checked_out = models.ConsumablePool.objects.filter(
+                    pk=self.kwargs[self.lookup_field]
+                ).used_quantity_total()
+            else:
+                checked_out = instance.used_quantity
 
-            context["display_warning"] = instance.used_quantity > 0
-            context["checked_out"] = instance.used_quantity
+            context["display_warning"] = checked_out > 0
+            context["checked_out"] = checked_out
 
         if self.action in ["bulk_update", "bulk_destroy"]:
-            pools = self.queryset.filter(pk__in=request.data.getlist("pk"))
-            checked_out = 0
-            for pool in pools:
-                checked_out += pool.used_quantity
-            context["display_warning"] = checked_out > 0
+            context["display_warning"] = models.ConsumablePool.objects.filter(
+                pk__in=request.data.getlist("pk"), used_quantity__gt=0
+            ).exists()
 
         return context
 
@@ -171,54 +216,51 @@ class ConsumablePoolUIViewSet(NautobotUIViewSet):
         table_class: Type[BaseTable] = super().get_table_class()
         return table_class
 
-    def _process_bulk_update_form(self, form) -> None:  # noqa: PLR0912
-        # pylint: disable=too-many-branches
+    def _process_bulk_update_form(self, form) -> None:
         """Perform the actual work on a bulk update if the form is valid."""
         request = self.request
         queryset = self.get_queryset()
-        new_location: Location | None = form.cleaned_data.get("location", None)
-        new_quantity: int | None = form.cleaned_data.get("quantity", None)
         nullified_fields = request.POST.getlist("_nullify")
-        form_cf_to_key = {
-            f"cf_{cf.key}": cf.name for cf in CustomField.objects.get_for_model(queryset.model)
-        }
+        custom_fields = {}
+        for cf in CustomField.objects.get_for_model(queryset.model):
+            field_name = f"cf_{cf.key}"
+            if field_name not in getattr(form, "custom_fields", []):
+                continue
+            if field_name in form.nullable_fields and field_name in nullified_fields:
+                custom_fields[cf.key] = None
+            elif form.cleaned_data.get(field_name) not in (None, "", []):
+                custom_fields[cf.key] = form.cleaned_data[field_name]
 
         with transaction.atomic():
-            updated_objs = []
-            checked_in = 0
-            for instance in queryset.filter(pk__in=form.cleaned_data["pk"]):
-                self.obj = instance
-                if new_location is not None and instance.location != new_location:
-                    instance.location = new_location
-                    self.logger.debug("Pool %s is moving to %s", instance, new_location)
-                    for checked_out in instance.checked_out.all():
-                        checked_in += checked_out.quantity
-                        checked_out.delete()
-
-                if new_quantity is not None and instance.quantity != new_quantity:
-                    instance.quantity = new_quantity
-
-                # Handle any assigned custom fields
-                for field_name in getattr(form, "custom_fields", []):
-                    if field_name in form.nullable_fields and field_name in nullified_fields:
-                        instance.cf[form_cf_to_key[field_name]] = None
-                    elif form.cleaned_data.get(field_name) not in (None, "", []):
-                        instance.cf[form_cf_to_key[field_name]] = form.cleaned_data[field_name]
-
-                instance.validated_save()
-                updated_objs.append(instance)
-                self.logger.debug("Saved %s (PK %s)", instance, instance.pk)
-
-                if form.cleaned_data.get("add_tags", []):
-                    instance.tags.add(*form.cleaned_data["add_tags"])
-                if form.cleaned_data.get("remove_tags", []):
-                    instance.tags.remove(*form.cleaned_data["remove_tags"])
-
-                if hasattr(form, "save_relationships") and callable(form.save_relationships):
+            updated_objs, checked_in = models.ConsumablePool.bulk_edit(
+                queryset.filter(pk__in=form.cleaned_data["pk"]).values_list("pk", flat=True),
+                location=form.cleaned_data.get("location"),
+                quantity=form.cleaned_data.get("quantity"),
+                custom_fields=custom_fields,
+                add_tags=form.cleaned_data.get("add_tags") or [],
+                remove_tags=form.cleaned_data.get("remove_tags") or [],
+            )
+
+            # Relationships are saved for each pool, as they can apply to some of them only
+            if self._relationships_changed(form, nullified_fields):
+                for instance in updated_objs:
                     form.save_relationships(instance=instance, nullified_fields=nullified_fields)
 
-                if hasattr(form, "save_note") and callable(form.save_note):
-                    form.save_note(instance=instance, user=self.request.user)
+            if note := form.cleaned_data.get("object_note", "").strip():
+                content_type = ContentType.objects.get_for_model(queryset.model)
+                notes = Note.objects.bulk_create(
+                    [
+                        Note(
+                            note=note,
+                            assigned_object_type=content_type,
+                            assigned_object_id=instance.pk,
+                            user=request.user,
+                            user_name=request.user.username,
+                        )
+                        for instance in updated_objs
+                    ]
+                )
+                bulk_record_object_changes(notes)
 
             if queryset.filter(pk__in=[i.pk for i in updated_objs]).count() != len(updated_objs):
                 raise ObjectDoesNotExist
@@ -232,6 +274,18 @@ class ConsumablePoolUIViewSet(NautobotUIViewSet):
 
         self.success_url = self.get_return_url(request)
 
+    @staticmethod
+    def _relationships_changed(form, nullified_fields: list[str]) -> bool:
+        """Check whether a bulk edit form sets, adds, removes or clears any relationships."""
+        for field_name in getattr(form, "relationships", []):
+            if field_name in nullified_fields or form.cleaned_data.get(field_name):
+                return True
+            for prefix in ("add_", "remove_"):
+                if form.cleaned_data.get(f"{prefix}{field_name}"):
+                    return True
+
+        return False
+
 
 class ConsumableTypeUIViewSet(NautobotUIViewSet):
     """UI view set for ConsumableTypes."""
@@ -251,13 +305,15 @@ class ConsumableTypeUIViewSet(NautobotUIViewSet):
 
         if self.action == "retrieve":
             context["table_consumables"] = tables.ConsumableTable(
-                models.Consumable.objects.filter(consumable_type=instance.pk)
+                models.Consumable.objects.select_related("consumable_type", "manufacturer").filter(
+                    consumable_type=instance.pk
+                ),
+                prefix="consumables_",
             )
             if request.user.has_perm("nautobot_consumables.change_consumable"):
                 context["table_consumables"].columns.show("pk")
 
-            row_count = len(context["table_consumables"].rows)
-            context["disable_pagination"] = row_count <= PAGE_SIZE
+            context["disable_pagination"] = paginate_table(request, context["table_consumables"])
 
         return context
 
@@ -269,6 +325,62 @@ class ConsumableTypeUIViewSet(NautobotUIViewSet):
         return str(super().get_template_name())
 
 
+class StreamingExportView(ObjectPermissionRequiredMixin, View):
+    """
+    Stream an export of the filtered objects as CSV or JSON Lines.
+
+    The list filters are applied from the query string, and `export_format` chooses the format.
+    Unlike the table export, the rows are written as they're read from the database, so exports
+    of any size don't time out or load the whole inventory into memory.
+    """
+
+    queryset = None
+    filterset_class: Type[NautobotFilterSet]
+
+    def get_required_permission(self) -> str:
+        """Exporting the objects requires permission to view them."""
+        return get_permission_for_model(self.queryset.model, "view")
+
+    def get(self, request):
+        """Build the streaming response for the filtered objects."""
+        filter_params = request.GET.copy()
+        export_format = filter_params.pop("export_format", ["csv"])[-1]
+        for param in NON_FILTER_PARAMS:
+            filter_params.pop(param, None)
+
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest(
+                f"Unsupported export format {export_format!r}, use one of {', '.join(EXPORT_FORMATS)}"
+            )
+
+        filterset = self.filterset_class(filter_params, self.queryset)
+        if not filterset.is_valid():
+            return HttpResponseBadRequest(filterset.errors.as_text())
+
+        return streaming_export_response(filterset.qs, export_format)
+
+
+class CheckedOutConsumableExportView(StreamingExportView):
+    """Stream an export of CheckedOutConsumables."""
+
+    queryset = models.CheckedOutConsumable.objects.all()
+    filterset_class = filters.CheckedOutConsumableFilterSet
+
+
+class ConsumableExportView(StreamingExportView):
+    """Stream an export of Consumables."""
+
+    queryset = models.Consumable.objects.all()
+    filterset_class = filters.ConsumableFilterSet
+
+
+class ConsumablePoolExportView(StreamingExportView):
+    """Stream an export of ConsumablePools."""
+
+    queryset = models.ConsumablePool.objects.all()
+    filterset_class = filters.ConsumablePoolFilterSet
+
+
 class DeviceConsumablesViewTab(generic.ObjectView):
     """View for adding a Consumables tab to Device details."""
 
@@ -280,20 +392,25 @@ class DeviceConsumablesViewTab(generic.ObjectView):
         context = super().get_extra_context(request, instance)
 
         context["table_checkedoutconsumables"] = tables.CheckedOutConsumableDetailDeviceTabTable(
-            models.CheckedOutConsumable.objects.filter(device__pk=instance.pk)
+            models.CheckedOutConsumable.objects.select_related("consumable_pool__location")
+            .prefetch_related("tags")
+            .filter(device__pk=instance.pk),
+            prefix="checkedout_",
+        )
+        context["disable_pagination_checkedout"] = paginate_table(
+            request, context["table_checkedoutconsumables"]
         )
-
-        row_count = len(context["table_checkedoutconsumables"].rows)
-        context["disable_pagination_checkedout"] = row_count <= PAGE_SIZE
 
         context["table_consumablepools"] = tables.ConsumablePoolDetailLocationTabTable(
-            models.ConsumablePool.objects.filter(location__pk=instance.location.pk).exclude(
-                checked_out__device__pk=instance.pk
-            )
+            models.ConsumablePool.objects.with_usage()
+            .select_related("consumable")
+            .filter(location__pk=instance.location.pk)
+            .exclude(checked_out__device__pk=instance.pk),
+            prefix="pools_",
+        )
+        context["disable_pagination_pools"] = paginate_table(
+            request, context["table_consumablepools"]
         )
-
-        row_count = len(context["table_consumablepools"].rows)
-        context["disable_pagination_pools"] = row_count <= PAGE_SIZE
 
         context["add_querystring"] = f"location={instance.location.pk}"
 
@@ -319,21 +436,42 @@ class LocationConsumablesViewTab(generic.ObjectView):
         """Gather extra context for the views."""
         context = super().get_extra_context(request, instance)
 
-        location_pools = models.ConsumablePool.objects.filter(location=instance.pk)
+        location_pools = (
+            models.ConsumablePool.objects.with_usage()
+            .select_related("consumable")
+            .filter(location=instance.pk)
+        )
         context["table_consumablepools"] = tables.ConsumablePoolDetailLocationTabTable(
-            location_pools
+            location_pools,
+            prefix="pools_",
         )
         context["table_checkedoutconsumables"] = tables.CheckedOutConsumableDetailLocationTabTable(
-            models.CheckedOutConsumable.objects.filter(consumable_pool__in=location_pools)
+            models.CheckedOutConsumable.objects.select_related(
+                "consumable_pool__location", "device"
+            )
+            .prefetch_related("tags")
+            .filter(consumable_pool__location=instance.pk),
+            prefix="checkedout_",
         )
 
-        context["add_querystring"] = f"location={instance.pk}"
+        context["table_consumablesummaries"] = tables.LocationConsumableSummaryTable(
+            models.LocationConsumableSummary.objects.select_related(
+                "consumable__consumable_type"
+            ).filter(location=instance.pk),
+            prefix="summary_",
+        )
 
-        row_count = len(context["table_consumablepools"].rows)
-        context["disable_pagination_pools"] = row_count <= PAGE_SIZE
+        context["add_querystring"] = f"location={instance.pk}"
 
-        checkedout_row_count = len(context["table_checkedoutconsumables"].rows)
-        context["disable_pagination_checkedout"] = checkedout_row_count <= PAGE_SIZE
+        context["disable_pagination_summaries"] = paginate_table(
+            request, context["table_consumablesummaries"]
+        )
+        context["disable_pagination_pools"] = paginate_table(
+            request, context["table_consumablepools"]
+        )
+        context["disable_pagination_checkedout"] = paginate_table(
+            request, context["table_checkedoutconsumables"]
+        )
 
         return_url = [
             reverse(
@@ -193,11 +193,13 @@ def bandit(context: Context) -> None:
         "verbose": "Enable verbose test output.",
         "append": "Append coverage data to .coverage, otherwise it starts clean each time.",
         "report-file": "Filename to save the XML test report to, default is 'rspec.xml'.",
+        "tag": "Also run the tests with this tag that are skipped by default, e.g. 'scale'.",
     }
 )
 def unittests(context: Context, keepdb: bool = False, seed: str | None = None, flush: bool = False,
               label: str = "nautobot_consumables", failfast: bool = False, buffer: bool = True,
-              verbose: bool = False, append: bool = False, report_file: str | None = None) -> None:
+              verbose: bool = False, append: bool = False, report_file: str | None = None,
+              tag: str | None = None) -> None:
     """Run the plugin tests with coverage."""
     command = ["coverage run"]
     if append:
@@ -219,6 +221,8 @@ def unittests(context: Context, keepdb: bool = False, seed: str | None = None, f
         command.append("--verbosity 2")
     if report_file is not None:
         command.append(f"--report-file {report_file}")
+    if tag is not None:
+        command.append(f"--tag {tag}")
 
     helpers.run_command(context, " ".join(command))
 